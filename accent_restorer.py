@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Accent Restorer for Vietnamese Spell Checker
+Khôi phục dấu cho văn bản không dấu ('kinh te viet nam dang dung truoc'): ứng viên từ chỉ mục
+không dấu, chọn cả câu bằng mô hình n-gram; xử lý theo lô (nhiều tiến trình) cho backfill lớn
+"""
+
+import argparse
+import heapq
+import os
+import re
+import time
+import unicodedata
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import edit_distance
+from config import Config
+from lattice_decoder import match_case
+from ngram_model import NUMBER_TOKEN, SENTENCE_END, SENTENCE_START, NgramLanguageModel, language_model
+from syllable_validator import syllable_validator
+from vietnamese_dictionary import vietnamese_dict
+
+SYLLABLE_PATTERN = re.compile(r'\w+')
+SENTENCE_BREAK = re.compile(r'[.!?;:…]')
+MAX_SCORE_CACHE = 1 << 18
+
+
+class _Hypothesis(NamedTuple):
+    score: float
+    state: Tuple[int, int]
+    previous: Optional['_Hypothesis']
+    syllable: Optional[str]
+
+
+class AccentRestorer:
+    """
+    Khôi phục dấu cho cả câu
+
+    Mỗi âm tiết không dấu được thay bằng tập ứng viên cùng dạng không dấu (lấy
+    từ từ vựng của mô hình n-gram và từ điển, chỉ giữ âm tiết hợp lệ, xếp theo
+    unigram, tối đa max_candidates). Viterbi với beam trên trạng thái 2 âm tiết
+    cuối chọn chuỗi có điểm trigram cao nhất. Âm tiết đã có dấu, số và token
+    không phải chữ được giữ nguyên (chỉ làm ngữ cảnh). Chỉ mục ứng viên và điểm
+    trigram được cache trong restorer nên xử lý theo lô nhanh hơn nhiều so với
+    từng câu riêng lẻ.
+    """
+
+    def __init__(self, model: NgramLanguageModel, dictionary=None,
+                 beam_width: int = 8, max_candidates: int = 12):
+        self.model = model
+        self.dictionary = dictionary
+        self.beam_width = beam_width
+        self.max_candidates = max_candidates
+        self._candidates: Optional[Dict[str, List[Tuple[str, int]]]] = None
+        self._scores: Dict[Tuple[int, int, int], float] = {}
+
+    def restore(self, text: str) -> str:
+        """Khôi phục dấu cho một văn bản (giữ nguyên khoảng trắng, dấu câu và kiểu viết hoa)"""
+        text = unicodedata.normalize('NFC', text)
+        pieces, cursor = [], 0
+        for sentence in self._sentences(text):
+            chosen = self.decode([match.group() for match in sentence])
+            for match, syllable in zip(sentence, chosen):
+                pieces.append(text[cursor:match.start()])
+                pieces.append(match_case(match.group(), syllable) if syllable else match.group())
+                cursor = match.end()
+        pieces.append(text[cursor:])
+        return ''.join(pieces)
+
+    def restore_batch(self, texts: Iterable[str]) -> List[str]:
+        """Khôi phục dấu cho một lô văn bản (dùng chung cache ứng viên và điểm n-gram)"""
+        return [self.restore(text) for text in texts]
+
+    def decode(self, tokens: List[str]) -> List[Optional[str]]:
+        """
+        Chọn âm tiết có dấu cho một câu
+
+        Returns:
+            Âm tiết (chữ thường) cho mỗi token, None nếu token được giữ nguyên
+        """
+        start = (-1, self.model.token_id(SENTENCE_START))
+        beams: Dict[Tuple[int, int], _Hypothesis] = {start: _Hypothesis(0.0, start, None, None)}
+        for token in tokens:
+            candidates = self.candidates(token)
+            next_beams: Dict[Tuple[int, int], _Hypothesis] = {}
+            for hypothesis in heapq.nlargest(self.beam_width, beams.values()):
+                u, v = hypothesis.state
+                for syllable, token_id in candidates:
+                    state = (v, token_id)
+                    score = hypothesis.score + self._logprob(u, v, token_id)
+                    best = next_beams.get(state)
+                    if best is None or score > best.score:
+                        next_beams[state] = _Hypothesis(score, state, hypothesis, syllable)
+            beams = next_beams
+
+        end = self.model.token_id(SENTENCE_END)
+        final = max(beams.values(), key=lambda h: h.score + self._logprob(h.state[0], h.state[1], end))
+        chosen = []
+        while final.previous is not None:
+            chosen.append(final.syllable)
+            final = final.previous
+        chosen.reverse()
+        return chosen
+
+    def candidates(self, token: str) -> List[Tuple[Optional[str], int]]:
+        """Các ứng viên (âm tiết, ID trong mô hình) cho một token; None = giữ nguyên token"""
+        if token.isdigit():
+            return [(None, self.model.token_id(NUMBER_TOKEN))]
+        lower = token.lower()
+        if not lower.isascii() or not lower.isalpha():
+            return [(None, self.model.token_id(lower))]
+        return self._candidate_index().get(lower) or [(None, self.model.token_id(lower))]
+
+    def _candidate_index(self) -> Dict[str, List[Tuple[str, int]]]:
+        """Chỉ mục dạng không dấu -> ứng viên (dựng lười một lần từ từ vựng mô hình và từ điển)"""
+        if self._candidates is None:
+            syllables = {token for token in self.model.vocabulary if token.isalpha()}
+            if self.dictionary is not None:
+                syllables.update(syllable for word in self.dictionary.words for syllable in word.split(' '))
+            index: Dict[str, List[Tuple[float, str, int]]] = {}
+            for syllable in syllables:
+                if not syllable_validator.is_valid(syllable):
+                    continue
+                token_id = self.model.token_id(syllable)
+                score = self.model.logprob_ids(-1, -1, token_id)
+                index.setdefault(edit_distance.strip_diacritics(syllable), []).append((-score, syllable, token_id))
+            self._candidates = {skeleton: [(syllable, token_id) for _, syllable, token_id
+                                           in sorted(entries)[:self.max_candidates]]
+                                for skeleton, entries in index.items()}
+        return self._candidates
+
+    def _logprob(self, u: int, v: int, w: int) -> float:
+        key = (u, v, w)
+        score = self._scores.get(key)
+        if score is None:
+            score = self.model.logprob_ids(u, v, w)
+            if len(self._scores) >= MAX_SCORE_CACHE:
+                self._scores.clear()
+            self._scores[key] = score
+        return score
+
+    @staticmethod
+    def _sentences(text: str) -> List[List['re.Match']]:
+        """Nhóm các âm tiết thành câu (ngắt ở . ! ? ; : … như lúc huấn luyện mô hình)"""
+        sentences, current, cursor = [], [], 0
+        for match in SYLLABLE_PATTERN.finditer(text):
+            if current and SENTENCE_BREAK.search(text, cursor, match.start()):
+                sentences.append(current)
+                current = []
+            current.append(match)
+            cursor = match.end()
+        if current:
+            sentences.append(current)
+        return sentences
+
+
+_worker_restorer: Optional[AccentRestorer] = None
+
+
+def _init_worker(model_path: str, beam_width: int) -> None:
+    """Mỗi tiến trình mở mô hình qua mmap (dùng chung page cache) và giữ cache riêng"""
+    global _worker_restorer
+    _worker_restorer = AccentRestorer(NgramLanguageModel.load(model_path), vietnamese_dict, beam_width=beam_width)
+
+
+def _restore_lines(lines: List[str]) -> List[str]:
+    return _worker_restorer.restore_batch(lines)
+
+
+def restore_file(input_path: str, output_path: str, model_path: str, workers: int = os.cpu_count() or 1,
+                 batch_size: int = 512, beam_width: int = 8, verbose: bool = True) -> int:
+    """
+    Khôi phục dấu cho file lớn (mỗi dòng một văn bản), giữ thứ tự dòng
+
+    Các lô batch_size dòng được chia cho workers tiến trình; trả về số dòng đã xử lý.
+    """
+    def batches():
+        with open(input_path, encoding='utf-8') as f:
+            batch = []
+            for line in f:
+                batch.append(line.rstrip('\n'))
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+    count = 0
+    start_time = time.time()
+    with Pool(processes=workers, initializer=_init_worker, initargs=(model_path, beam_width)) as pool, \
+            open(output_path, 'w', encoding='utf-8') as output:
+        for restored in pool.imap(_restore_lines, batches()):
+            output.write('\n'.join(restored) + '\n')
+            count += len(restored)
+            if verbose:
+                elapsed = time.time() - start_time
+                print(f"📊 {count:,} dòng, {elapsed:.1f}s ({count / max(elapsed, 1e-9):,.0f} dòng/s)")
+    return count
+
+
+# Tạo instance global (None nếu chưa cấu hình LANGUAGE_MODEL_PATH)
+accent_restorer: Optional[AccentRestorer] = (
+    AccentRestorer(language_model, vietnamese_dict, beam_width=Config.ACCENT_BEAM_WIDTH)
+    if language_model is not None else None
+)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Restore diacritics for unaccented Vietnamese text')
+    parser.add_argument('input', help='File văn bản không dấu (UTF-8, mỗi dòng một văn bản)')
+    parser.add_argument('--output', type=str, required=True, help='File kết quả')
+    parser.add_argument('--model', type=str, default=Config.LANGUAGE_MODEL_PATH,
+                        help='File mô hình n-gram (ngram_model.py)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Số tiến trình')
+    parser.add_argument('--batch-size', type=int, default=512, help='Số dòng mỗi lô')
+    parser.add_argument('--beam-width', type=int, default=Config.ACCENT_BEAM_WIDTH, help='Beam của Viterbi')
+    args = parser.parse_args()
+    if not args.model:
+        parser.error('Cần --model hoặc LANGUAGE_MODEL_PATH')
+
+    restore_file(args.input, args.output, args.model, workers=args.workers,
+                 batch_size=args.batch_size, beam_width=args.beam_width)
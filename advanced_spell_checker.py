@@ -10,6 +10,8 @@ import re
 import time
 from typing import List, Dict, Tuple
 from vietnamese_dictionary import vietnamese_dict
+from ngram_model import language_model
+from syllable_validator import syllable_validator
 from pyvi import ViTokenizer, ViPosTagger
 
 class AdvancedVietnameseSpellChecker:
@@ -17,6 +19,7 @@ class AdvancedVietnameseSpellChecker:
     
     def __init__(self):
         self.vietnamese_dict = vietnamese_dict
+        self.language_model = language_model
         self.error_patterns = self._load_error_patterns()
     
     def _load_error_patterns(self) -> Dict[str, str]:
@@ -112,7 +115,7 @@ class AdvancedVietnameseSpellChecker:
             errors = []
             corrected_text = normalized_text
             
-            for word in words:
+            for i, word in enumerate(words):
                 # Loại bỏ dấu câu
                 clean_word = re.sub(r'[^\w\s]', '', word)
                 if not clean_word:
@@ -121,6 +124,8 @@ class AdvancedVietnameseSpellChecker:
                 # Kiểm tra chính tả
                 if not self._is_correct_word(clean_word):
                     suggestions = self._get_suggestions(clean_word)
+                    if self.language_model is not None and len(suggestions) > 1:
+                        suggestions = self.language_model.rank(suggestions, words[max(0, i - 2):i], words[i + 1:i + 3])
                     errors.append({
                         'word': word,
                         'position': normalized_text.find(word),
@@ -161,12 +166,21 @@ class AdvancedVietnameseSpellChecker:
     
     def _is_correct_word(self, word: str) -> bool:
         """Kiểm tra từ có đúng chính tả không"""
+        # Bloom filter: từ chắc chắn không có trong từ điển/common_errors
+        # thì bỏ qua các bước tra cứu và fallback (pyvi, LLM), chuyển thẳng sang gợi ý
+        if not self.vietnamese_dict.might_contain(word):
+            return False
+        
         # Kiểm tra trong từ điển mở rộng
         if self.vietnamese_dict.is_correct_word(word):
             return True
         
         # Kiểm tra trong common errors
-        if word.lower() in self.vietnamese_dict.common_errors:
+        if self.vietnamese_dict.is_common_error(word):
+            return False
+        
+        # Không thể là âm tiết tiếng Việt ('trogn', 'divt'): không cần hỏi pyvi/LLM
+        if syllable_validator.is_impossible(word):
             return False
         
         # Kiểm tra bằng pyvi
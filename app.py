@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import os
+import atexit
 import json
 import requests
 import subprocess
@@ -25,6 +26,8 @@ from performance_monitor import PerformanceMonitor
 import categorized_spell_checker
 importlib.reload(categorized_spell_checker)
 from categorized_spell_checker import categorized_spell_checker
+from accent_restorer import accent_restorer
+from vietnamese_dictionary import load_tenant_dictionaries
 
 # Cấu hình logging
 logging.basicConfig(
@@ -56,6 +59,13 @@ performance_monitor = PerformanceMonitor(max_history=1000)
 # Sử dụng categorized spell checker
 spell_checker = categorized_spell_checker
 
+# Checker riêng cho từng tenant: lớp từ điển nhỏ phủ lên từ điển dùng chung
+tenant_checkers = {
+    name: spell_checker.for_dictionary(dictionary)
+    for name, dictionary in load_tenant_dictionaries(spell_checker.vietnamese_dict,
+                                                     Config.TENANT_DICTIONARY_DIR).items()
+} if Config.TENANT_DICTIONARY_DIR else {}
+
 # Performance monitoring
 performance_stats = {
     'total_requests': 0,
@@ -69,11 +79,29 @@ def initialize_spell_checker():
     global spell_checker
     try:
         logging.info("🔄 Đang khởi tạo Categorized Vietnamese Spell Checker...")
-        # Spell checker đã được khởi tạo sẵn
-        logging.info("✅ Categorized spell checker đã sẵn sàng!")
+        # Spell checker đã được khởi tạo sẵn, chỉ cần làm ấm bảng gợi ý
+        table_size = spell_checker.warm_suggestion_table(path=Config.SUGGESTION_TABLE_PATH or None)
+        logging.info(f"✅ Categorized spell checker đã sẵn sàng! ({table_size} gợi ý tính sẵn)")
     except Exception as e:
         logging.error(f"❌ Lỗi khởi tạo spell checker: {e}")
 
+def save_suggestion_table():
+    """Lưu bảng gợi ý (kèm thống kê từ hay bị miss) để lần khởi động sau tính sẵn"""
+    if Config.SUGGESTION_TABLE_PATH and spell_checker:
+        try:
+            spell_checker.suggestion_table.save(Config.SUGGESTION_TABLE_PATH)
+        except Exception as e:
+            logging.error(f"❌ Lỗi lưu suggestion table: {e}")
+
+atexit.register(save_suggestion_table)
+
+def select_spell_checker(data: dict):
+    """Chọn checker theo tenant của request (trường 'tenant' hoặc header X-Tenant), None nếu không có tenant đó"""
+    tenant = data.get('tenant') or request.headers.get('X-Tenant')
+    if not tenant:
+        return spell_checker
+    return tenant_checkers.get(tenant)
+
 def update_performance_stats(processing_time: float):
     """Update performance statistics"""
     performance_stats['total_requests'] += 1
@@ -111,8 +139,21 @@ def check_spelling():
         if not spell_checker:
             return jsonify({'error': 'Spell checker chưa sẵn sàng'}), 500
         
+        checker = select_spell_checker(data)
+        if not checker:
+            return jsonify({'error': 'Tenant không tồn tại'}), 400
+        namespace = checker.vietnamese_dict.cache_namespace
+        
+        # Beam của lattice decoder: request tương tác dùng beam hẹp, batch dùng beam rộng
+        beam_width = data.get('beam_width', Config.DECODER_BEAM_WIDTH)
+        if not isinstance(beam_width, int) or isinstance(beam_width, bool) or \
+                not 0 <= beam_width <= Config.DECODER_MAX_BEAM_WIDTH:
+            return jsonify({'error': f'beam_width phải là số nguyên từ 0 tới {Config.DECODER_MAX_BEAM_WIDTH}'}), 400
+        if beam_width:
+            namespace = f"{namespace}|beam:{beam_width}"
+        
         # Check cache first
-        cached_result = cache_manager.get(text, 'check_spelling')
+        cached_result = cache_manager.get(text, 'check_spelling', namespace)
         if cached_result:
             logging.info(f"📝 Cache HIT for text: {text[:50]}...")
             cached = True
@@ -124,7 +165,7 @@ def check_spelling():
         logging.info(f"📝 Kiểm tra chính tả: {text[:50]}...")
         
         # Kiểm tra chính tả với timeout
-        result = spell_checker.check_text(text)
+        result = checker.check_text(text, beam_width=beam_width)
         processing_time = (time.time() - start_time) * 1000  # Convert to milliseconds
         
         # Update performance stats
@@ -137,7 +178,7 @@ def check_spelling():
         result['cached'] = False
         
         # Cache the result
-        cache_manager.set(text, result, 'check_spelling')
+        cache_manager.set(text, result, 'check_spelling', namespace)
         
         success = True
         logging.info(f"✅ Hoàn thành kiểm tra: {result.get('error_count', 0)} lỗi, {processing_time:.2f}ms")
@@ -151,6 +192,48 @@ def check_spelling():
         # Record performance metrics
         performance_monitor.record_request('/api/check_spelling', time.time() - start_time, success, cached)
 
+@app.route('/api/restore_accents', methods=['POST'])
+def restore_accents():
+    """API khôi phục dấu cho văn bản không dấu (một văn bản hoặc một lô 'texts')"""
+    start_time = time.time()
+    success = False
+    
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Dữ liệu JSON không hợp lệ'}), 400
+        
+        texts = data.get('texts')
+        single = texts is None
+        if single:
+            texts = [data.get('text', '')]
+        if not isinstance(texts, list) or not texts or not all(isinstance(t, str) and t for t in texts):
+            return jsonify({'error': 'Vui lòng nhập văn bản'}), 400
+        if len(texts) > Config.ACCENT_MAX_BATCH:
+            return jsonify({'error': f'Tối đa {Config.ACCENT_MAX_BATCH} văn bản mỗi request'}), 400
+        if any(len(t) > Config.MAX_TEXT_LENGTH for t in texts):
+            return jsonify({'error': f'Văn bản quá dài. Tối đa {Config.MAX_TEXT_LENGTH} ký tự'}), 400
+        
+        if not accent_restorer:
+            return jsonify({'error': 'Chưa cấu hình mô hình ngôn ngữ (LANGUAGE_MODEL_PATH)'}), 500
+        
+        restored = accent_restorer.restore_batch(texts)
+        processing_time = (time.time() - start_time) * 1000
+        result = {'restored_text': restored[0]} if single else {'restored_texts': restored}
+        result['processing_time_ms'] = round(processing_time, 2)
+        result['timestamp'] = datetime.now().isoformat()
+        
+        success = True
+        logging.info(f"✅ Khôi phục dấu {len(texts)} văn bản, {processing_time:.2f}ms")
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        logging.error(f"❌ Lỗi khôi phục dấu: {str(e)}")
+        return jsonify({'error': f'Lỗi: {str(e)}'}), 500
+    finally:
+        performance_monitor.record_request('/api/restore_accents', time.time() - start_time, success, False)
+
 @app.route('/api/health')
 def health_check():
     """Kiểm tra trạng thái hệ thống"""
@@ -192,8 +275,13 @@ def get_suggestions():
         if not spell_checker:
             return jsonify({'error': 'Spell checker chưa sẵn sàng'}), 500
         
+        checker = select_spell_checker(data)
+        if not checker:
+            return jsonify({'error': 'Tenant không tồn tại'}), 400
+        namespace = checker.vietnamese_dict.cache_namespace
+        
         # Check cache first
-        cached_result = cache_manager.get(word, 'suggestions')
+        cached_result = cache_manager.get(word, 'suggestions', namespace)
         if cached_result:
             cached = True
             success = True
@@ -201,7 +289,7 @@ def get_suggestions():
             return jsonify(cached_result)
         
         # Lấy gợi ý
-        suggestions = spell_checker.get_suggestions(word)
+        suggestions = checker.get_suggestions(word)
         
         result = {
             'word': word,
@@ -211,7 +299,7 @@ def get_suggestions():
         }
         
         # Cache the result
-        cache_manager.set(word, result, 'suggestions')
+        cache_manager.set(word, result, 'suggestions', namespace)
         
         success = True
         return jsonify(result)
@@ -272,6 +360,73 @@ def clear_cache():
         logging.error(f"❌ Lỗi xóa cache: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/dictionary/words', methods=['POST', 'DELETE'])
+def update_dictionary_words():
+    """API thêm (POST) hoặc xóa (DELETE) từ trong từ điển lúc chạy"""
+    try:
+        data = request.get_json()
+        if not data or not data.get('word'):
+            return jsonify({'error': 'Vui lòng nhập từ'}), 400
+
+        checker = select_spell_checker(data)
+        if not checker:
+            return jsonify({'error': 'Tenant không tồn tại'}), 400
+        word = data['word']
+        dictionary = checker.vietnamese_dict
+        if request.method == 'POST':
+            changed = dictionary.add_word(word, frequency=data.get('frequency'))
+        else:
+            changed = dictionary.remove_word(word)
+
+        # Kết quả đã cache có thể không còn đúng với từ điển mới
+        if changed:
+            cache_manager.clear()
+        logging.info(f"📚 {'Thêm' if request.method == 'POST' else 'Xóa'} từ '{word}': {changed}")
+        return jsonify({
+            'word': word,
+            'changed': changed,
+            'dictionary_size': len(dictionary.words),
+            'timestamp': datetime.now().isoformat()
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Lỗi: {str(e)}'}), 400
+    except Exception as e:
+        logging.error(f"❌ Lỗi cập nhật từ điển: {str(e)}")
+        return jsonify({'error': f'Lỗi: {str(e)}'}), 500
+
+@app.route('/api/dictionary/frequency', methods=['POST', 'DELETE'])
+def update_dictionary_frequency():
+    """API đặt (POST) hoặc xóa (DELETE) tần suất của từ lúc chạy"""
+    try:
+        data = request.get_json()
+        if not data or not data.get('word'):
+            return jsonify({'error': 'Vui lòng nhập từ'}), 400
+
+        checker = select_spell_checker(data)
+        if not checker:
+            return jsonify({'error': 'Tenant không tồn tại'}), 400
+        word = data['word']
+        dictionary = checker.vietnamese_dict
+        if request.method == 'POST':
+            if data.get('frequency') is None:
+                return jsonify({'error': 'Vui lòng nhập tần suất'}), 400
+            changed = dictionary.set_frequency(word, data['frequency'])
+        else:
+            changed = dictionary.remove_frequency(word)
+
+        if changed:
+            cache_manager.clear()
+        return jsonify({
+            'word': word,
+            'changed': changed,
+            'timestamp': datetime.now().isoformat()
+        })
+    except (ValueError, TypeError) as e:
+        return jsonify({'error': f'Lỗi: {str(e)}'}), 400
+    except Exception as e:
+        logging.error(f"❌ Lỗi cập nhật tần suất: {str(e)}")
+        return jsonify({'error': f'Lỗi: {str(e)}'}), 500
+
 @app.route('/api/performance', methods=['GET'])
 def get_performance():
     """API lấy thông tin performance chi tiết"""
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark accent restoration
+Độ chính xác và thông lượng khôi phục dấu (mô hình n-gram huấn luyện trên corpus sinh) so với
+checker sửa từng từ, và theo số tiến trình khi xử lý file
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+import edit_distance
+from accent_restorer import AccentRestorer, restore_file
+from benchmark_ngram import generate_corpus
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from ngram_model import train_language_model
+from vietnamese_dictionary import vietnamese_dict
+
+
+def accuracy(outputs, expected):
+    """(tỷ lệ câu đúng hoàn toàn, tỷ lệ âm tiết đúng)"""
+    exact = sum(output == sentence for output, sentence in zip(outputs, expected))
+    correct = total = 0
+    for output, sentence in zip(outputs, expected):
+        produced, wanted = output.split(), sentence.split()
+        correct += sum(p == w for p, w in zip(produced, wanted)) if len(produced) == len(wanted) else 0
+        total += len(wanted)
+    return exact / len(expected), correct / total
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark accent restoration')
+    parser.add_argument('--corpus', type=int, default=50000, help='Số câu huấn luyện mô hình n-gram')
+    parser.add_argument('--sentences', type=int, default=2000, help='Số câu kiểm tra (không có trong corpus)')
+    parser.add_argument('--backfill', type=int, default=50000, help='Số dòng của file backfill')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    corpus = generate_corpus(args.corpus, seed=7)
+    seen = set(corpus)
+    expected = [s for s in generate_corpus(args.sentences * 3, seed=99) if s not in seen][:args.sentences]
+    stripped = [edit_distance.strip_diacritics(sentence) for sentence in expected]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        corpus_path = os.path.join(tmpdir, 'corpus.txt')
+        with open(corpus_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(corpus))
+        model_path = os.path.join(tmpdir, 'lm.bin')
+        model = train_language_model([corpus_path], model_path, workers=1, min_count=1, verbose=False)
+        print(f"📊 {len(expected)} câu không dấu (không có trong corpus huấn luyện {args.corpus:,} câu)")
+
+        checker = CategorizedVietnameseSpellChecker()
+        start = time.perf_counter()
+        outputs = [checker.check_text(text)['corrected_text'] for text in stripped]
+        elapsed = time.perf_counter() - start
+        exact, syllables = accuracy(outputs, expected)
+        print(f"{'check_text':<22}{elapsed / len(stripped) * 1e3:>8.2f} ms/câu{exact:>9.1%} câu đúng{syllables:>9.1%} âm tiết đúng")
+
+        for beam_width in (1, 4, 8):
+            restorer = AccentRestorer(model, vietnamese_dict, beam_width=beam_width)
+            restorer.restore('khoi dong')  # Dựng chỉ mục ứng viên
+            start = time.perf_counter()
+            outputs = restorer.restore_batch(stripped)
+            elapsed = time.perf_counter() - start
+            exact, syllables = accuracy(outputs, expected)
+            print(f"{f'Khôi phục dấu, beam {beam_width}':<22}{elapsed / len(stripped) * 1e3:>8.2f} ms/câu"
+                  f"{exact:>9.1%} câu đúng{syllables:>9.1%} âm tiết đúng")
+
+        input_path = os.path.join(tmpdir, 'input.txt')
+        with open(input_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(stripped[i % len(stripped)] for i in range(args.backfill)))
+        for workers in sorted({1, 2, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            count = restore_file(input_path, os.path.join(tmpdir, 'output.txt'), model_path,
+                                 workers=workers, beam_width=8, verbose=False)
+            elapsed = time.perf_counter() - start
+            print(f"🗂️  Backfill {count:,} dòng, {workers} tiến trình: {count / elapsed:,.0f} dòng/s")
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark Bloom filter negative check
+So sánh _is_correct_word với từ không có trong lexicon lớn (mmap) khi có/không có Bloom filter
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmark_lexicon import generate_words
+from spell_checker import VietnameseSpellChecker
+from vietnamese_dictionary import VietnameseDictionary
+
+
+def time_lookups(checker, words, label: str) -> float:
+    """Thời gian trung bình (µs) mỗi lần _is_correct_word"""
+    start = time.perf_counter()
+    for word in words:
+        checker._is_correct_word(word)
+    latency = (time.perf_counter() - start) / len(words) * 1e6
+    print(f"{label:<28}{latency:>10.1f} µs/từ")
+    return latency
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark Bloom filter negative check')
+    parser.add_argument('--size', type=int, default=200000, help='Số từ trong lexicon')
+    parser.add_argument('--lookups', type=int, default=5000, help='Số từ tra cứu')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    lexicon = generate_words(args.size)
+    unknown = [word + 'q' for word in generate_words(args.lookups, seed=7)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        lexicon_path = os.path.join(tmpdir, 'lexicon.txt')
+        with open(lexicon_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lexicon))
+        path = os.path.join(tmpdir, 'dictionary.bin')
+        VietnameseDictionary(lexicon_path=lexicon_path).save(path)
+
+        checker = VietnameseSpellChecker()
+        checker.vietnamese_dict = VietnameseDictionary.from_file(path)
+        bloom = checker.vietnamese_dict.bloom_filter
+        print(f"📊 Lexicon {args.size:,} từ, Bloom filter {bloom.memory_usage() / 1024:.0f}KB, "
+              f"{bloom.num_hashes} hàm băm, {args.lookups:,} từ không có trong lexicon")
+
+        known = lexicon[:args.lookups]
+        checker.vietnamese_dict.bloom_filter = None
+        before = time_lookups(checker, unknown, 'Không Bloom: từ lạ')
+        time_lookups(checker, known, 'Không Bloom: từ có sẵn')
+        checker.vietnamese_dict.bloom_filter = bloom
+        after = time_lookups(checker, unknown, 'Bloom filter: từ lạ')
+        time_lookups(checker, known, 'Bloom filter: từ có sẵn')
+        print(f"⚡ Từ không có trong lexicon: {before / after:.0f}x")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark compound-word lookup
+Đếm số lần rơi xuống ViPosTagger/LLM khi tra từ ghép dạng 'giáo_viên' của pyvi
+"""
+
+import argparse
+import logging
+import random
+from contextlib import contextmanager
+
+from pyvi import ViPosTagger
+
+from advanced_spell_checker import advanced_spell_checker
+from hybrid_spell_checker import hybrid_spell_checker
+from smart_spell_checker import smart_spell_checker
+from spell_checker import VietnameseSpellChecker
+from test_data_generator import TestDataGenerator
+from test_real_data import REAL_TEST_CASES
+from vietnamese_dictionary import VietnameseDictionary
+
+
+def build_corpus(generated: int, seed: int = 0):
+    """Corpus test: dữ liệu thực tế từ user + câu sinh ngẫu nhiên"""
+    random.seed(seed)
+    cases = TestDataGenerator().generate_test_cases(generated)
+    return list(REAL_TEST_CASES) + [case['original'] for case in cases]
+
+
+@contextmanager
+def legacy_lookup():
+    """Tra cứu kiểu cũ: word.lower() trong tập từ (không hiểu dấu gạch dưới)"""
+    is_correct_word = VietnameseDictionary.is_correct_word
+    is_common_error = VietnameseDictionary.is_common_error
+    VietnameseDictionary.is_correct_word = lambda self, word: word.lower() in self.words
+    VietnameseDictionary.is_common_error = lambda self, word: word.lower() in self.common_errors
+    try:
+        yield
+    finally:
+        VietnameseDictionary.is_correct_word = is_correct_word
+        VietnameseDictionary.is_common_error = is_common_error
+
+
+def count_fallbacks(checker, corpus) -> int:
+    """
+    Số lần _is_correct_word phải gọi ViPosTagger.postagging trên corpus
+
+    VietnameseSpellChecker không dùng pyvi để kết luận: đếm số từ các tầng cục bộ
+    để lại cho tầng n-gram/LLM (_fallback_verdict khi không có llama-server).
+    """
+    postagging = ViPosTagger.postagging
+    calls = 0
+
+    def counting(function):
+        def wrapper(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return function(*args, **kwargs)
+        return wrapper
+
+    ViPosTagger.postagging = counting(postagging)
+    if isinstance(checker, VietnameseSpellChecker):
+        checker._fallback_verdict = counting(checker._fallback_verdict)
+    try:
+        for text in corpus:
+            checker.check_text(text)
+    finally:
+        ViPosTagger.postagging = postagging
+        checker.__dict__.pop('_fallback_verdict', None)
+    return calls
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark compound-word lookup fallbacks')
+    parser.add_argument('--generated', type=int, default=200, help='Số câu sinh thêm từ TestDataGenerator')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    corpus = build_corpus(args.generated)
+    checkers = {
+        'spell_checker': VietnameseSpellChecker(),
+        'advanced': advanced_spell_checker,
+        'smart': smart_spell_checker,
+        'hybrid': hybrid_spell_checker,
+    }
+
+    print(f"📊 {len(corpus)} câu ({len(REAL_TEST_CASES)} câu thực tế + {args.generated} câu sinh)")
+    print(f"{'Checker':<16}{'word.lower()':>14}{'compound_key':>14}{'Giảm':>8}")
+    total_before = total_after = 0
+    for name, checker in checkers.items():
+        with legacy_lookup():
+            before = count_fallbacks(checker, corpus)
+        after = count_fallbacks(checker, corpus)
+        total_before += before
+        total_after += after
+        print(f"{name:<16}{before:>14}{after:>14}{before - after:>8}")
+    print(f"{'Tổng':<16}{total_before:>14}{total_after:>14}{total_before - total_after:>8}")
+    print("ℹ️  Với spell_checker, mỗi lần fallback là một ứng viên gọi LLM khi llama-server đang chạy")
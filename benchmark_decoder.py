@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark lattice decoder beam width
+Độ trễ và độ chính xác theo beam_width (mô hình n-gram huấn luyện trên corpus sinh) so với sửa tuần tự
+"""
+
+import argparse
+import logging
+import random
+import re
+import time
+
+from benchmark_ngram import generate_corpus
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from ngram_model import NgramLanguageModel, sentence_tokens
+from test_data_generator import TestDataGenerator
+
+
+def words_of(text: str):
+    return re.findall(r'\w+', text.lower())
+
+
+def evaluate(checker, cases, correct, label: str) -> None:
+    """In độ trễ trung bình, tỷ lệ câu sửa đúng hoàn toàn và tỷ lệ âm tiết đúng"""
+    checker.decoder.clear_cache()
+    start = time.perf_counter()
+    outputs = [correct(case['original']) for case in cases]
+    latency = (time.perf_counter() - start) / len(cases) * 1e3
+    exact = syllables_ok = syllables_total = 0
+    for case, output in zip(cases, outputs):
+        expected, produced = words_of(case['correct_sentence']), words_of(output)
+        exact += expected == produced
+        syllables_ok += sum(1 for e, p in zip(expected, produced) if e == p) if len(expected) == len(produced) else 0
+        syllables_total += len(expected)
+    print(f"{label:<18}{latency:>8.2f} ms/câu{exact / len(cases):>10.1%} câu đúng"
+          f"{syllables_ok / syllables_total:>10.1%} âm tiết đúng")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark lattice decoder beam width')
+    parser.add_argument('--sentences', type=int, default=300, help='Số câu có lỗi')
+    parser.add_argument('--corpus', type=int, default=50000, help='Số câu huấn luyện mô hình n-gram')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    random.seed(42)
+    generator = TestDataGenerator()
+    categories = list(generator.natural_sentences)
+    cases = [generator.generate_natural_sentence(random.choice(categories), 0.3) for _ in range(args.sentences)]
+
+    checker = CategorizedVietnameseSpellChecker()
+    evaluate(checker, cases, lambda text: checker.check_text(text, beam_width=0)['corrected_text'], 'check_text tuần tự')
+    for beam_width in (1, 4, 16):
+        evaluate(checker, cases, lambda text: checker.decoder.decode(text, beam_width)['corrected_text'],
+                 f'Không LM, beam {beam_width}')
+
+    corpus = generate_corpus(args.corpus, seed=7)
+    checker.decoder.language_model = NgramLanguageModel.train(s for line in corpus for s in sentence_tokens(line))
+    for beam_width in (1, 2, 4, 8, 16):
+        evaluate(checker, cases, lambda text: checker.decoder.decode(text, beam_width)['corrected_text'],
+                 f'LM, beam {beam_width}')
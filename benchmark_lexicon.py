@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark CompactLexicon vs Python set
+So sánh bộ nhớ mỗi từ và độ trễ tra cứu
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+from lexicon_store import CompactLexicon
+
+ONSETS = ['', 'b', 'c', 'ch', 'd', 'đ', 'g', 'gi', 'h', 'k', 'kh', 'l', 'm', 'n', 'ng', 'nh',
+          'ph', 'qu', 's', 't', 'th', 'tr', 'v', 'x']
+RHYMES = ['a', 'à', 'á', 'ai', 'am', 'an', 'ang', 'anh', 'ao', 'ăn', 'âm', 'ân', 'ê', 'ên', 'ết',
+          'i', 'im', 'in', 'inh', 'o', 'ọc', 'ông', 'ơn', 'u', 'úc', 'ung', 'ư', 'ương', 'ước', 'yên']
+
+
+def generate_words(count: int, seed: int = 42) -> List[str]:
+    """Sinh lexicon giả lập gồm các từ 1-3 âm tiết"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        syllables = [rng.choice(ONSETS) + rng.choice(RHYMES) for _ in range(rng.choice((1, 2, 2, 3)))]
+        words.add(' '.join(syllables))
+    return sorted(words)
+
+
+def measure_memory(build: Callable[[], object]) -> (object, int):
+    """Đo bộ nhớ cấp phát khi dựng cấu trúc"""
+    tracemalloc.start()
+    structure = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return structure, current
+
+
+def measure_lookup(structure, queries: List[str], repeat: int = 3) -> float:
+    """Đo độ trễ tra cứu trung bình (micro giây)"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for word in queries:
+            word in structure
+        best = min(best, time.perf_counter() - start)
+    return best / len(queries) * 1e6
+
+
+def run_benchmark(words: List[str], num_queries: int = 20000):
+    """Chạy benchmark và in kết quả"""
+    rng = random.Random(0)
+    queries = [rng.choice(words) for _ in range(num_queries // 2)]
+    queries += [w + 'x' for w in rng.sample(words, num_queries // 2)]
+
+    # Copy chuỗi để bộ nhớ của set tính cả các đối tượng str
+    as_set, set_bytes = measure_memory(lambda: {w.encode('utf-8').decode('utf-8') for w in words})
+    compact, compact_bytes = measure_memory(lambda: CompactLexicon.from_words(words))
+
+    print(f"📚 Số từ: {len(words):,}")
+    print(f"{'Cấu trúc':<16}{'Bộ nhớ':>12}{'Bytes/từ':>12}{'Tra cứu (µs)':>16}")
+    for name, structure, size in (('set', as_set, set_bytes), ('CompactLexicon', compact, compact_bytes)):
+        latency = measure_lookup(structure, queries)
+        print(f"{name:<16}{size / 1024 / 1024:>10.2f}MB{size / len(words):>12.1f}{latency:>16.2f}")
+
+    prefix = words[len(words) // 2][:2]
+    start = time.perf_counter()
+    matches = compact.words_with_prefix(prefix)
+    print(f"🔍 Prefix '{prefix}': {len(matches)} từ trong {(time.perf_counter() - start) * 1000:.2f}ms")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark CompactLexicon vs set')
+    parser.add_argument('--lexicon', type=str, help='File lexicon (mỗi dòng một từ)')
+    parser.add_argument('--size', type=int, default=100000, help='Số từ giả lập nếu không có file')
+    args = parser.parse_args()
+
+    if args.lexicon:
+        lexicon_words = list(CompactLexicon.load(args.lexicon))
+    else:
+        lexicon_words = generate_words(args.size)
+    run_benchmark(lexicon_words)
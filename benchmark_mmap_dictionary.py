@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark mmap dictionary across workers
+Đo bộ nhớ mỗi worker khi nhiều tiến trình cùng tải từ điển: file nhị phân mmap vs set riêng từng tiến trình
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+import sys
+import tempfile
+
+from benchmark_lexicon import generate_words
+from vietnamese_dictionary import VietnameseDictionary
+
+
+def read_smaps_rollup() -> dict:
+    """Đọc RSS/PSS/private memory (kB) của tiến trình hiện tại"""
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values
+
+
+def private_kb(values: dict) -> int:
+    return values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+
+
+def worker(mode: str, path: str, barrier, queue):
+    """Tải từ điển trong worker, duyệt toàn bộ từ và báo cáo bộ nhớ"""
+    gc.collect()
+    before = read_smaps_rollup()
+    if mode == 'mmap':
+        dictionary = VietnameseDictionary.from_file(path)
+    else:
+        dictionary = VietnameseDictionary(lexicon_path=path)
+        dictionary.words = set(dictionary.words)
+    # Chạm vào toàn bộ trang dữ liệu
+    touched = sum(1 for word in dictionary.words if dictionary.is_correct_word(word))
+    # Đợi các worker khác để PSS phản ánh việc chia sẻ trang
+    barrier.wait()
+    after = read_smaps_rollup()
+    barrier.wait()
+    queue.put({
+        'touched': touched,
+        'rss_kb': after['Rss'] - before['Rss'],
+        'pss_kb': after['Pss'] - before['Pss'],
+        'private_kb': private_kb(after) - private_kb(before),
+    })
+
+
+def run_workers(mode: str, path: str, num_workers: int) -> list:
+    context = multiprocessing.get_context('fork')
+    barrier = context.Barrier(num_workers)
+    queue = context.Queue()
+    workers = [context.Process(target=worker, args=(mode, path, barrier, queue)) for _ in range(num_workers)]
+    for process in workers:
+        process.start()
+    results = [queue.get(timeout=120) for _ in workers]
+    for process in workers:
+        process.join()
+    return results
+
+
+def run_benchmark(words, num_workers: int):
+    """Tải từ điển ở num_workers tiến trình theo từng cách và in bộ nhớ trung bình mỗi worker"""
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'lexicon.txt')
+        binary_path = os.path.join(directory, 'lexicon.bin')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(words))
+        VietnameseDictionary(lexicon_path=text_path).save(binary_path)
+
+        print(f"📊 Bộ nhớ trung bình mỗi worker ({num_workers} workers, {len(words):,} từ):")
+        for name, path in (('set', text_path), ('mmap', binary_path)):
+            results = run_workers(name, path, num_workers)
+
+            def average(field):
+                return sum(r[field] for r in results) / len(results)
+
+            print(f"   {name:<5} RSS +{average('rss_kb'):,.0f}kB  PSS +{average('pss_kb'):,.0f}kB  "
+                  f"private +{average('private_kb'):,.0f}kB")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark mmap dictionary across workers')
+    parser.add_argument('--workers', type=int, default=8, help='Số tiến trình worker')
+    parser.add_argument('--size', type=int, default=100000, help='Số từ giả lập')
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        sys.exit('Cần /proc/self/smaps_rollup (Linux)')
+    run_benchmark(generate_words(args.size), args.workers)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark compact n-gram language model
+Huấn luyện trên corpus sinh từ TestDataGenerator, đo bộ nhớ, độ trễ và độ chính xác top-1 khi xếp hạng gợi ý
+"""
+
+import argparse
+import logging
+import os
+import random
+import tempfile
+import time
+
+from ngram_model import syllables, train_language_model
+from test_data_generator import TestDataGenerator
+from vietnamese_dictionary import vietnamese_dict
+
+
+def generate_corpus(num_sentences: int, seed: int = 0):
+    """Các câu đúng chính tả của TestDataGenerator"""
+    random.seed(seed)
+    generator = TestDataGenerator()
+    categories = list(generator.natural_sentences)
+    return [generator.generate_natural_sentence(random.choice(categories), error_rate=0)['correct_sentence']
+            for _ in range(num_sentences)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark compact n-gram language model')
+    parser.add_argument('--sentences', type=int, default=50000, help='Số câu corpus huấn luyện')
+    parser.add_argument('--queries', type=int, default=2000, help='Số lần xếp hạng')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    corpus = generate_corpus(args.sentences)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        corpus_path = os.path.join(tmpdir, 'corpus.txt')
+        with open(corpus_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(corpus))
+        model_path = os.path.join(tmpdir, 'lm.bin')
+        start = time.perf_counter()
+        model = train_language_model([corpus_path], model_path, workers=1, min_count=1, verbose=False)
+        print(f"📊 Corpus {args.sentences:,} câu ({os.path.getsize(corpus_path) / 1024 / 1024:.1f}MB), "
+              f"huấn luyện {time.perf_counter() - start:.1f}s, file {os.path.getsize(model_path) / 1024:.0f}KB")
+
+        usage = model.memory_usage()
+        ngrams = len(model.bigram_keys) + len(model.trigram_keys)
+        print(f"   {len(model.vocabulary):,} token, {len(model.bigram_keys):,} bigram, "
+              f"{len(model.trigram_keys):,} trigram: {usage['total'] / 1024:.0f}KB "
+              f"({(usage['bigrams'] + usage['trigrams']) / ngrams:.1f} bytes/n-gram)")
+
+        # Chọn một âm tiết trong câu, trộn với các gợi ý của từ điển cho chính nó
+        random.seed(1)
+        queries = []
+        for sentence in random.sample(corpus, min(args.queries, len(corpus))):
+            tokens = syllables(sentence.split())
+            i = random.randrange(len(tokens))
+            candidates = [w for w in vietnamese_dict.get_suggestions(tokens[i]) if ' ' not in w][:4]
+            if tokens[i] not in candidates:
+                candidates.append(tokens[i])
+            if len(candidates) > 1:
+                random.shuffle(candidates)
+                queries.append((candidates, tokens[max(0, i - 2):i], tokens[i + 1:i + 3], tokens[i]))
+
+        start = time.perf_counter()
+        correct = sum(1 for c, left, right, expected in queries if model.rank(c, left, right)[0] == expected)
+        latency = (time.perf_counter() - start) / len(queries) * 1e6
+        baseline = sum(1 for c, _, _, expected in queries if c[0] == expected)
+        print(f"⚡ rank(): {latency:.1f} µs/lần ({sum(len(q[0]) for q in queries) / len(queries):.1f} ứng viên)")
+        print(f"🎯 Top-1: {correct / len(queries):.1%} (thứ tự ngẫu nhiên: {baseline / len(queries):.1%})")
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark /api/suggestions throughput
+So sánh duyệt tuần tự mọi pattern với chỉ mục ngược (rule index)
+"""
+
+import argparse
+import logging
+import random
+import time
+
+import app as spell_app
+from benchmark_lexicon import generate_words
+
+
+def time_rule_lookup(checker, words, label: str) -> float:
+    """Đo riêng bước tra rule cho từng từ (micro giây/từ)"""
+    start = time.perf_counter()
+    for word in words:
+        checker._rule_suggestions(word)
+    latency = (time.perf_counter() - start) / len(words) * 1e6
+    print(f"{label:<22}{latency:>10.1f} µs/từ (bước tra rule)")
+    return latency
+
+
+def run_requests(client, words, label: str) -> float:
+    """Gửi request /api/suggestions cho từng từ, trả về số request/giây"""
+    start = time.perf_counter()
+    for word in words:
+        response = client.post('/api/suggestions', json={'word': word})
+        assert response.status_code == 200
+    elapsed = time.perf_counter() - start
+    throughput = len(words) / elapsed
+    print(f"{label:<22}{throughput:>10.1f} req/s{elapsed / len(words) * 1000:>10.2f} ms/req")
+    return throughput
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark /api/suggestions throughput')
+    parser.add_argument('--requests', type=int, default=500, help='Số request mỗi lần đo')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    checker = spell_app.spell_checker
+    # Đo đường tính gợi ý thật: tắt cache response và bảng gợi ý tính sẵn
+    spell_app.cache_manager.enable_cache = False
+    checker.suggestion_table.table.clear()
+
+    rng = random.Random(0)
+    triggers = list(checker.rule_index)
+    words = [rng.choice(triggers) for _ in range(args.requests // 2)]
+    words += generate_words(args.requests - len(words))
+    rng.shuffle(words)
+
+    client = spell_app.app.test_client()
+    print(f"📊 /api/suggestions, {len(words)} request, {len(checker.error_categories)} nhóm rule")
+
+    rule_index = checker.rule_index
+    checker.rule_index = None
+    scan_latency = time_rule_lookup(checker, words, 'Duyệt mọi pattern')
+    before = run_requests(client, words, 'Duyệt mọi pattern')
+    checker.rule_index = rule_index
+    index_latency = time_rule_lookup(checker, words, 'Chỉ mục ngược')
+    after = run_requests(client, words, 'Chỉ mục ngược')
+    print(f"⚡ Bước tra rule: {scan_latency / index_latency:.0f}x, throughput endpoint: {after / before:.2f}x")
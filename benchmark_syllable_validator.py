@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark syllable validator
+Số lần rơi xuống ViPosTagger/LLM khi có/không có automaton âm tiết, và chi phí một lần kiểm tra
+"""
+
+import argparse
+import logging
+import time
+from contextlib import contextmanager
+
+from advanced_spell_checker import advanced_spell_checker
+from benchmark_compound_lookup import build_corpus, count_fallbacks
+from hybrid_spell_checker import hybrid_spell_checker
+from smart_spell_checker import smart_spell_checker
+from spell_checker import VietnameseSpellChecker
+from syllable_validator import SyllableValidator, syllable_validator
+
+
+@contextmanager
+def without_validator():
+    """Tắt automaton: mọi từ lạ đều đi tiếp xuống pyvi/LLM như trước"""
+    is_impossible = syllable_validator.is_impossible
+    syllable_validator.is_impossible = lambda word: False
+    try:
+        yield
+    finally:
+        syllable_validator.is_impossible = is_impossible
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark syllable validator')
+    parser.add_argument('--generated', type=int, default=200, help='Số câu sinh thêm từ TestDataGenerator')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    start = time.perf_counter()
+    validator = SyllableValidator()
+    print(f"🔧 Dựng automaton: {validator.num_states} trạng thái, {(time.perf_counter() - start) * 1e3:.1f} ms")
+    samples = ['nghiêng', 'trogn', 'divt', 'người', 'khuỷu', 'tôii']
+    start = time.perf_counter()
+    for _ in range(20000):
+        for word in samples:
+            validator.is_impossible(word)
+    print(f"⏱️  is_impossible: {(time.perf_counter() - start) / (20000 * len(samples)) * 1e6:.2f} µs/từ")
+
+    corpus = build_corpus(args.generated)
+    checkers = {
+        'spell_checker': VietnameseSpellChecker(),
+        'advanced': advanced_spell_checker,
+        'smart': smart_spell_checker,
+        'hybrid': hybrid_spell_checker,
+    }
+    print(f"{'Checker':<16}{'Không automaton':>16}{'Có automaton':>14}{'Giảm':>8}")
+    for name, checker in checkers.items():
+        with without_validator():
+            before = count_fallbacks(checker, corpus)
+        after = count_fallbacks(checker, corpus)
+        print(f"{name:<16}{before:>16}{after:>14}{before - after:>8}")
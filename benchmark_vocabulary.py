@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark token-ID vocabulary
+Chi phí tra cứu theo token của một request: chuỗi (chuẩn hóa + tra từng cấu trúc) so với mảng ID
+"""
+
+import argparse
+import logging
+import time
+
+from pyvi import ViTokenizer
+
+from context_features import context_extractor
+from profile_context import generate_texts
+from vietnamese_dictionary import vietnamese_dict
+from vocabulary import WORD, Vocabulary
+
+
+def string_lookups(words):
+    """Cách cũ: mỗi bước tự lowercase/chuẩn hóa và tra cấu trúc của nó"""
+    masks = context_extractor.token_masks_for(words)
+    flags = [vietnamese_dict.is_correct_word(word) for word in words]
+    errors = [vietnamese_dict.is_common_error(word) for word in words]
+    return masks, flags, errors
+
+
+def id_lookups(vocabulary, words):
+    """Intern một lần thành mảng ID rồi đọc các mảng theo ID"""
+    table, ids = vocabulary.encode(words)
+    masks = [table.masks[i] for i in ids]
+    flags = [table.flags[i] & WORD for i in ids]
+    return masks, flags, ids
+
+
+def measure(function, requests, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for words in requests:
+            function(words)
+    return (time.perf_counter() - start) / (repeat * len(requests)) * 1e6
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark token-ID vocabulary')
+    parser.add_argument('--texts', type=int, default=400, help='Số câu sinh thêm')
+    parser.add_argument('--repeat', type=int, default=20, help='Số lần lặp')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    requests = [ViTokenizer.tokenize(text).split() for text in generate_texts(args.texts)]
+    tokens = sum(len(words) for words in requests)
+    vocabulary = Vocabulary(vietnamese_dict, context_extractor)
+    id_lookups(vocabulary, [word for words in requests for word in words])  # Làm nóng từ vựng
+
+    before = measure(string_lookups, requests, args.repeat)
+    after = measure(lambda words: id_lookups(vocabulary, words), requests, args.repeat)
+    print(f"📊 {len(requests)} request, {tokens / len(requests):.1f} token/request, "
+          f"{len(vocabulary._table):,} ID trong từ vựng")
+    print(f"Chuỗi: {before:7.1f} µs/request | Mảng ID: {after:7.1f} µs/request ({before / after:.1f}x)")
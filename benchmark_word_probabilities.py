@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark vectorized word probabilities
+Tính word_probabilities cho văn bản dài: vòng lặp từng token (cách cũ) so với mảng NumPy
+"""
+
+import argparse
+import logging
+import time
+
+from pyvi import ViTokenizer
+
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from profile_context import generate_texts
+
+
+def loop_probabilities(checker, words, errors, context):
+    """Cách cũ: mỗi token dựng lại bảng xác suất, lowercase và quét list proper_nouns/subject_words"""
+    word_probabilities = {}
+    error_words = {error['word'].lower(): error for error in errors}
+    for word in words:
+        word_lower = word.lower()
+        if word_lower in error_words:
+            category_probabilities = {
+                'tone_error': 0.95, 'typo_error': 0.90, 'sticky_typing': 0.85, 'capitalization': 0.80,
+                'compound_word': 0.75, 'spacing_punctuation': 0.70, 'unknown': 0.50
+            }
+            probability = category_probabilities.get(error_words[word_lower].get('category', 'unknown'), 0.50)
+            if context['academic_context'] and word_lower in ['nam', 'hai', 'khoa', 'học', 'tự', 'nhiên']:
+                probability *= 1.2
+            if context['business_context'] and word_lower in ['kinh', 'doanh', 'công', 'việc']:
+                probability *= 1.1
+            if word in context['proper_nouns']:
+                probability *= 0.5
+            if word in context['word_relationships']['subject_words']:
+                probability *= 0.8
+            word_probabilities[word] = min(1.0, probability)
+        else:
+            word_probabilities[word] = 0.05 if checker.vietnamese_dict.is_correct_word(word) else 0.30
+    return word_probabilities
+
+
+def measure(function, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat * 1e3, result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark vectorized word probabilities')
+    parser.add_argument('--texts', type=int, default=400, help='Số câu sinh thêm')
+    parser.add_argument('--repeat', type=int, default=3, help='Số lần lặp')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    checker = CategorizedVietnameseSpellChecker()
+    texts = list(generate_texts(args.texts))
+    for size in (1, 10, 30):
+        text = ' '.join(texts * size)
+        words = ViTokenizer.tokenize(text).split()
+        table, ids = checker.vocabulary.encode(words)
+        masks, flags = [table.masks[i] for i in ids], [table.flags[i] for i in ids]
+        errors = checker.check_text(' '.join(texts), beam_width=0)['errors']
+
+        before, expected = measure(lambda: loop_probabilities(
+            checker, words, errors, checker._analyze_context(text, words, masks)), args.repeat)
+        after, produced = measure(lambda: checker._calculate_word_probabilities_with_context(
+            text, words, errors, checker._analyze_context(text, words, masks), flags), args.repeat)
+        assert list(produced.items()) == list(expected.items())
+        print(f"📊 {len(words):>8,} token, {len(errors):,} lỗi: vòng lặp {before:>9.1f} ms, "
+              f"NumPy {after:>7.1f} ms ({before / after:.0f}x), kết quả giống hệt")
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bloom Filter for Vietnamese Spell Checker
+Bộ lọc Bloom gọn để loại nhanh các từ chắc chắn không có trong từ điển
+"""
+
+import hashlib
+import math
+from typing import Iterable, Optional, Tuple
+
+
+class BloomFilter:
+    """
+    Bloom filter trên các khóa chuẩn (compound_key) của từ
+
+    ``word in bloom`` trả về False nghĩa là từ chắc chắn chưa từng được thêm;
+    True nghĩa là "có thể có" (sai với xác suất ~false_positive_rate). Vị trí bit
+    dùng double hashing trên một digest blake2b 128-bit nên ổn định giữa các
+    tiến trình (khác với hash() của Python) và có thể lưu ra file.
+    """
+
+    def __init__(self, num_bits: int, num_hashes: int, bits: Optional[bytes] = None):
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        # bits có thể là memoryview chỉ đọc trên mmap; được sao chép ở lần add() đầu tiên
+        self.bits = bits if bits is not None else bytearray((num_bits + 7) // 8)
+
+    @staticmethod
+    def optimal_parameters(capacity: int, false_positive_rate: float) -> Tuple[int, int]:
+        """Số bit và số hàm băm tối ưu cho capacity phần tử với tỷ lệ dương tính giả cho trước"""
+        if not 0 < false_positive_rate < 1:
+            raise ValueError(f"false_positive_rate phải trong khoảng (0, 1): {false_positive_rate}")
+        capacity = max(capacity, 1)
+        num_bits = max(8, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return num_bits, num_hashes
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], false_positive_rate: float = 0.01) -> 'BloomFilter':
+        """Tạo bộ lọc chứa toàn bộ words"""
+        words = set(words)
+        bloom = cls(*cls.optimal_parameters(len(words), false_positive_rate))
+        for word in words:
+            bloom.add(word)
+        return bloom
+
+    def _positions(self, word: str):
+        digest = hashlib.blake2b(word.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % num_bits
+
+    def add(self, word: str) -> None:
+        if not isinstance(self.bits, bytearray):
+            self.bits = bytearray(self.bits)
+        bits = self.bits
+        for position in self._positions(word):
+            bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        bits = self.bits
+        for position in self._positions(word):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def false_positive_rate(self, count: int) -> float:
+        """Tỷ lệ dương tính giả ước lượng khi đã thêm count phần tử"""
+        return (1 - math.exp(-self.num_hashes * count / self.num_bits)) ** self.num_hashes
+
+    def memory_usage(self) -> int:
+        """Số bytes của mảng bit"""
+        return len(self.bits)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Corpus Frequency Builder for Vietnamese Spell Checker
+Đếm tần suất từ từ corpus văn bản lớn (nhiều GB) với bộ nhớ giới hạn
+"""
+
+import argparse
+import os
+import re
+import time
+import unicodedata
+from collections import Counter
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from lexicon_store import CompactLexicon, write_frequency_file
+
+TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+DEFAULT_CHUNK_MB = 64
+DEFAULT_MAX_ENTRIES = 2_000_000
+
+
+class BoundedCounter:
+    """Counter giới hạn số khóa (lossy counting)
+
+    Khi số khóa vượt max_entries, loại bỏ nửa dưới theo tần suất. Một từ có
+    thể bị bỏ rồi đếm lại nhiều lần, mỗi lần mất tối đa ngưỡng của lần cắt
+    tỉa đó, nên ``error_bound`` là tổng các ngưỡng đã dùng: các từ còn lại bị
+    đếm thiếu không quá chừng đó lần, các từ phổ biến giữ chính xác.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.counts = Counter()
+        self.error_bound = 0
+
+    def update(self, tokens: Iterable[str]) -> None:
+        self.counts.update(tokens)
+        if len(self.counts) > self.max_entries:
+            self._prune()
+
+    def merge(self, counts: Counter, error_bound: int = 0) -> None:
+        self.counts.update(counts)
+        self.error_bound += error_bound
+        if len(self.counts) > self.max_entries:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Bỏ các khóa có tần suất thuộc nửa dưới"""
+        threshold = sorted(self.counts.values())[len(self.counts) // 2]
+        self.counts = Counter({k: c for k, c in self.counts.items() if c > threshold})
+        self.error_bound += threshold
+
+
+def tokenize_line(line: str, lexicon: Optional[CompactLexicon] = None, max_ngram: int = 3) -> List[str]:
+    """Tách âm tiết (chữ thường, NFC); nếu có lexicon, đếm thêm các từ ghép 2-3 âm tiết có trong lexicon"""
+    syllables = TOKEN_PATTERN.findall(unicodedata.normalize('NFC', line).lower())
+    tokens = [s for s in syllables if not s.isdigit()]
+    if lexicon is not None:
+        for n in range(2, max_ngram + 1):
+            for i in range(len(syllables) - n + 1):
+                compound = ' '.join(syllables[i:i + n])
+                if compound in lexicon:
+                    tokens.append(compound)
+    return tokens
+
+
+def plan_chunks(paths: List[str], chunk_bytes: int) -> List[Tuple[str, int, int]]:
+    """Chia các file thành các đoạn (path, start, end) theo byte"""
+    chunks = []
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, max(size, 1), chunk_bytes):
+            chunks.append((path, start, min(start + chunk_bytes, size)))
+    return chunks
+
+
+def iter_chunk_lines(path: str, start: int, end: int) -> Iterator[str]:
+    """Đọc các dòng thuộc đoạn [start, end): dòng thuộc về đoạn chứa byte đầu tiên của nó"""
+    with open(path, 'rb') as f:
+        if start > 0:
+            f.seek(start - 1)
+            # Bỏ phần dòng dở dang (thuộc đoạn trước)
+            f.readline()
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line.decode('utf-8', errors='ignore')
+
+
+_worker_lexicon = None
+
+
+def _init_worker(lexicon_path: Optional[str]) -> None:
+    global _worker_lexicon
+    _worker_lexicon = CompactLexicon.load(lexicon_path) if lexicon_path else None
+
+
+def _count_chunk(args: Tuple[str, int, int, int]) -> Tuple[Counter, int, int]:
+    """Đếm tần suất trong một đoạn file (chạy trong worker)"""
+    path, start, end, max_entries = args
+    counter = BoundedCounter(max_entries)
+    batch = []
+    for line in iter_chunk_lines(path, start, end):
+        batch.extend(tokenize_line(line, _worker_lexicon))
+        if len(batch) >= 100_000:
+            counter.update(batch)
+            batch = []
+    counter.update(batch)
+    return counter.counts, counter.error_bound, end - start
+
+
+def build_frequency(paths: List[str], output: str, workers: int = os.cpu_count() or 1,
+                    chunk_mb: int = DEFAULT_CHUNK_MB, max_entries: int = DEFAULT_MAX_ENTRIES,
+                    min_count: int = 1, lexicon_path: Optional[str] = None, verbose: bool = True) -> Counter:
+    """Đếm tần suất trên toàn bộ corpus và ghi file tần suất nhị phân"""
+    chunks = plan_chunks(paths, chunk_mb * 1024 * 1024)
+    total_bytes = sum(end - start for _, start, end in chunks)
+    merged = BoundedCounter(max_entries)
+    processed = 0
+    start_time = time.time()
+
+    tasks = [(path, start, end, max_entries) for path, start, end in chunks]
+    with Pool(processes=workers, initializer=_init_worker, initargs=(lexicon_path,)) as pool:
+        for counts, error_bound, size in pool.imap_unordered(_count_chunk, tasks):
+            merged.merge(counts, error_bound)
+            processed += size
+            if verbose:
+                elapsed = time.time() - start_time
+                print(f"📊 {processed / 1024 / 1024:,.0f}/{total_bytes / 1024 / 1024:,.0f}MB "
+                      f"({processed / 1024 / 1024 / max(elapsed, 1e-9):.1f}MB/s), {len(merged.counts):,} từ")
+
+    frequency = Counter({w: c for w, c in merged.counts.items() if c >= min_count})
+    write_frequency_file(output, frequency)
+    if verbose:
+        print(f"✅ Đã ghi {len(frequency):,} từ vào {output} (sai số đếm tối đa: {merged.error_bound})")
+    return frequency
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build unigram frequency file from a plain-text corpus')
+    parser.add_argument('corpus', nargs='+', help='File corpus văn bản (UTF-8)')
+    parser.add_argument('--output', type=str, required=True, help='File tần suất nhị phân đầu ra')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Số tiến trình')
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_MB, help='Kích thước mỗi đoạn (MB)')
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help='Số từ tối đa giữ trong bộ nhớ mỗi tiến trình')
+    parser.add_argument('--min-count', type=int, default=2, help='Bỏ các từ xuất hiện ít hơn')
+    parser.add_argument('--lexicon', type=str, help='Lexicon để đếm thêm từ ghép nhiều âm tiết')
+    args = parser.parse_args()
+
+    build_frequency(args.corpus, args.output, workers=args.workers, chunk_mb=args.chunk_mb,
+                    max_entries=args.max_entries, min_count=args.min_count, lexicon_path=args.lexicon)
@@ -108,17 +108,17 @@ class CacheManager:
         }
         self.lock = Lock()
     
-    def _generate_key(self, text: str, method: str = 'check_spelling') -> str:
-        """Generate cache key"""
-        content = f"{method}:{text}"
+    def _generate_key(self, text: str, method: str = 'check_spelling', namespace: str = '') -> str:
+        """Generate cache key (namespace tách kết quả của các tenant/lớp từ điển khác nhau)"""
+        content = f"{method}:{namespace}:{text}" if namespace else f"{method}:{text}"
         return hashlib.md5(content.encode()).hexdigest()
     
-    def get(self, text: str, method: str = 'check_spelling') -> Optional[Dict]:
+    def get(self, text: str, method: str = 'check_spelling', namespace: str = '') -> Optional[Dict]:
         """Get cached result"""
         if not self.enable_cache or not self.cache:
             return None
         
-        key = self._generate_key(text, method)
+        key = self._generate_key(text, method, namespace)
         result = self.cache.get(key)
         
         with self.lock:
@@ -131,12 +131,12 @@ class CacheManager:
         
         return result
     
-    def set(self, text: str, result: Dict, method: str = 'check_spelling') -> None:
+    def set(self, text: str, result: Dict, method: str = 'check_spelling', namespace: str = '') -> None:
         """Set cached result"""
         if not self.enable_cache or not self.cache:
             return
         
-        key = self._generate_key(text, method)
+        key = self._generate_key(text, method, namespace)
         self.cache.set(key, result)
         
         with self.lock:
@@ -6,18 +6,105 @@ Categorized Vietnamese Spell Checker
 Phân loại và xử lý lỗi theo nhóm
 """
 
+import copy
 import re
 import time
-from typing import List, Dict, Tuple
+from typing import Iterable, List, Dict, Optional, Tuple
+
+import numpy as np
+
+from config import Config
 from vietnamese_dictionary import vietnamese_dict
 from pyvi import ViTokenizer, ViPosTagger
+from suggestion_table import SuggestionTable, build_suggestion_table, literal_trigger
+from context_features import context_extractor
+from lattice_decoder import LatticeDecoder
+from ngram_model import language_model
+from word_splitter import WordSplitter
+from vocabulary import WORD, Vocabulary
+from token_classes import ACRONYM, FOREIGN, NUMBER, PROPER_NOUN, SKIP_CLASSES, URL_EMAIL, token_classifier
+
+# Chuỗi các từ cách nhau đúng một dấu cách (dạng input/trigger tra được qua chỉ mục ngược)
+TOKEN_SEQUENCE = re.compile(r'\w+(?: \w+)*')
+
+# Dấu câu dính vào đầu/cuối token ('https://toi-dang.vn,', '(3.500)')
+TOKEN_PUNCTUATION = '.,;:!?()[]"\''
+
+# Xác suất lỗi cơ bản theo loại lỗi; category id của một từ là chỉ số trong bảng này
+ERROR_CATEGORIES = ('tone_error', 'typo_error', 'sticky_typing', 'capitalization', 'compound_word',
+                    'spacing_punctuation', 'unknown')
+CATEGORY_PROBABILITIES = np.array([0.95, 0.90, 0.85, 0.80, 0.75, 0.70, 0.50])
+CATEGORY_IDS = {category: i for i, category in enumerate(ERROR_CATEGORIES)}
+NO_ERROR = -1
+ACADEMIC_WORDS = frozenset(['nam', 'hai', 'khoa', 'học', 'tự', 'nhiên'])
+BUSINESS_WORDS = frozenset(['kinh', 'doanh', 'công', 'việc'])
+
+
+def _membership(words: List[str], members) -> np.ndarray:
+    """Mảng bool: từ nào nằm trong members (tra set, không quét list)"""
+    return np.fromiter((word in members for word in words), dtype=bool, count=len(words))
 
 class CategorizedVietnameseSpellChecker:
     """Spell checker phân loại lỗi theo nhóm"""
     
     def __init__(self):
         self.vietnamese_dict = vietnamese_dict
+        self.context_extractor = context_extractor
         self.error_categories = self._load_error_categories()
+        self.rule_index, self.regex_rules = self._build_rule_index()
+        self.max_trigger_tokens = max((len(trigger.split(' ')) for trigger in self.rule_index), default=1)
+        self.suggestion_table = SuggestionTable(top_k=5)
+        self.word_splitter = WordSplitter(self.vietnamese_dict)
+        self.vocabulary = Vocabulary(self.vietnamese_dict, self.context_extractor)
+        self.token_classifier = token_classifier
+        self.decoder = LatticeDecoder(self.vietnamese_dict, language_model=language_model, rule_index=self.rule_index,
+                                      splitter=self.word_splitter)
+        self.vietnamese_dict.add_update_listener(self._on_dictionary_update)
+    
+    def _build_rule_index(self) -> Tuple[Dict[str, List[Tuple[int, str]]], List[Tuple[int, 're.Pattern', str]]]:
+        """
+        Tạo chỉ mục ngược: từ kích hoạt (chữ thường) -> [(thứ tự rule, replacement)]
+        
+        Chỉ các pattern literal r'\\bword\\b' (các từ cách nhau một dấu cách) được đưa vào
+        chỉ mục; pattern còn lại giữ dạng regex đã compile. Thứ tự rule giúp giữ nguyên
+        thứ tự gợi ý như khi duyệt tuần tự mọi pattern.
+        """
+        rule_index = {}
+        regex_rules = []
+        order = 0
+        for patterns in self.error_categories.values():
+            for pattern, replacement in patterns.items():
+                trigger = literal_trigger(pattern)
+                if trigger is not None and TOKEN_SEQUENCE.fullmatch(trigger):
+                    rule_index.setdefault(trigger.lower(), []).append((order, replacement))
+                else:
+                    regex_rules.append((order, re.compile(pattern, re.IGNORECASE), replacement))
+                order += 1
+        return rule_index, regex_rules
+    
+    def _rule_suggestions(self, word: str) -> List[str]:
+        """Lấy các replacement của rule khớp với từ"""
+        # Chuỗi các từ cách nhau một dấu cách: rule literal khớp khi và chỉ khi
+        # trigger là một dãy từ liên tiếp của input -> tra chỉ mục cho từng n-gram
+        if self.rule_index is not None and TOKEN_SEQUENCE.fullmatch(word):
+            tokens = word.lower().split(' ')
+            matches = {}
+            for n in range(1, min(len(tokens), self.max_trigger_tokens) + 1):
+                for i in range(len(tokens) - n + 1):
+                    for order, replacement in self.rule_index.get(' '.join(tokens[i:i + n]), ()):
+                        matches[order] = replacement
+            for order, regex, replacement in self.regex_rules:
+                if regex.search(word):
+                    matches[order] = replacement
+            return [matches[order] for order in sorted(matches)]
+        
+        # Input có dấu câu hoặc khoảng trắng đặc biệt: duyệt tuần tự mọi pattern
+        suggestions = []
+        for category_name, patterns in self.error_categories.items():
+            for pattern, replacement in patterns.items():
+                if re.search(pattern, word, re.IGNORECASE):
+                    suggestions.append(replacement)
+        return suggestions
     
     def _load_error_categories(self) -> Dict[str, Dict[str, str]]:
         """Tải các loại lỗi theo nhóm"""
@@ -335,9 +422,7 @@ class CategorizedVietnameseSpellChecker:
             # 2. Lỗi dính chữ khi gõ
             'sticky_typing': {
                 r'\bsinh diên\b': 'sinh viên',
-                r'\blsovới\b': 'so với',
                 r'\bIsovớithảm\b': 'so với thảm',
-                r'\bđiểmnày\b': 'điểm này',
                 r'\bPhươngqyết\b': 'Phương quyết',
                 r'\bchuyen nganh\b': 'chuyên ngành',
                 r'\btrí tue nana tạo\b': 'trí tuệ nhân tạo',
@@ -868,56 +953,83 @@ class CategorizedVietnameseSpellChecker:
             }
         }
     
-    def check_text(self, text: str) -> Dict:
-        """Kiểm tra chính tả với phân loại lỗi và xác suất"""
+    def check_text(self, text: str, beam_width: Optional[int] = None) -> Dict:
+        """
+        Kiểm tra chính tả với phân loại lỗi và xác suất
+        
+        Args:
+            text: Văn bản cần kiểm tra
+            beam_width: Beam của lattice decoder cho corrected_text (mặc định Config.DECODER_BEAM_WIDTH);
+                0 = áp dụng lần lượt từng correction như trước
+        """
         try:
             # Chuẩn hóa văn bản
             normalized_text = self._normalize_text(text)
             
             # Tách từ
             words = ViTokenizer.tokenize(normalized_text).split()
+            # Intern token thành ID một lần; các bước sau đọc cờ/bitmask theo ID
+            table, ids = self.vocabulary.encode(words)
+            
+            # Nhãn lớp token (tên riêng, viết tắt, số, URL/email, từ nước ngoài) một lượt cho cả request
+            token_classes = self.token_classifier.classify(normalized_text, words)
             
             # Phân tích ngữ cảnh tổng thể
-            context_analysis = self._analyze_context(normalized_text, words)
+            context_analysis = self._analyze_context(normalized_text, words, [table.masks[i] for i in ids])
             
             # Kiểm tra từng loại lỗi với context awareness
             errors = []
             corrected_text = normalized_text
             
             # 1. Kiểm tra lỗi dấu thanh và ký tự
-            tone_errors = self._check_tone_errors_with_context(normalized_text, words, context_analysis)
+            tone_errors = self._check_tone_errors_with_context(normalized_text, words, context_analysis,
+                                                               token_classes)
             errors.extend(tone_errors)
             
             # 2. Kiểm tra lỗi dính chữ
-            sticky_errors = self._check_sticky_typing_with_context(normalized_text, words, context_analysis)
+            sticky_errors = self._check_sticky_typing_with_context(normalized_text, words, context_analysis,
+                                                                   token_classes)
             errors.extend(sticky_errors)
             
             # 3. Kiểm tra lỗi gõ nhầm
-            typo_errors = self._check_typo_errors_with_context(normalized_text, words, context_analysis)
+            typo_errors = self._check_typo_errors_with_context(normalized_text, words, context_analysis,
+                                                               token_classes)
             errors.extend(typo_errors)
             
             # 4. Kiểm tra lỗi viết hoa
-            cap_errors = self._check_capitalization_with_context(normalized_text, words, context_analysis)
+            cap_errors = self._check_capitalization_with_context(normalized_text, words, context_analysis,
+                                                                 token_classes)
             errors.extend(cap_errors)
             
             # 5. Kiểm tra lỗi dấu cách và dấu câu
-            spacing_errors = self._check_spacing_punctuation(normalized_text)
+            spacing_errors = self._check_spacing_punctuation(normalized_text, token_classes)
             errors.extend(spacing_errors)
             
             # 6. Kiểm tra lỗi từ ghép
-            compound_errors = self._check_compound_words_with_context(normalized_text, words, context_analysis)
+            compound_errors = self._check_compound_words_with_context(normalized_text, words, context_analysis,
+                                                                      token_classes)
             errors.extend(compound_errors)
             
             # Loại bỏ duplicate errors (cùng từ, cùng vị trí)
             unique_errors = self._remove_duplicate_errors(errors)
             
             # Tính xác suất lỗi cho từng từ với context
-            word_probabilities = self._calculate_word_probabilities_with_context(normalized_text, words, unique_errors, context_analysis)
+            word_probabilities = self._calculate_word_probabilities_with_context(
+                normalized_text, words, unique_errors, context_analysis, [table.flags[i] for i in ids])
             
-            # Áp dụng corrections với context awareness
-            corrected_text = self._apply_categorized_corrections_with_context(normalized_text, unique_errors, context_analysis)
+            if beam_width is None:
+                beam_width = Config.DECODER_BEAM_WIDTH
+            decoded = None
+            if beam_width > 0:
+                # Sửa cả câu một lần: các correction nhất quán với nhau và theo ngữ cảnh
+                decoded = self.decoder.decode(normalized_text, beam_width, token_classes)
+                corrected_text = decoded['corrected_text']
+            else:
+                # Áp dụng corrections với context awareness
+                corrected_text = self._apply_categorized_corrections_with_context(normalized_text, unique_errors,
+                                                                                 context_analysis, token_classes)
             
-            return {
+            result = {
                 'original_text': text,
                 'corrected_text': corrected_text,
                 'errors': unique_errors,
@@ -926,6 +1038,9 @@ class CategorizedVietnameseSpellChecker:
                 'error_categories': self._categorize_errors(unique_errors),
                 'word_probabilities': word_probabilities
             }
+            if decoded is not None:
+                result['decoder'] = {'beam_width': decoded['beam_width'], 'corrections': decoded['corrections']}
+            return result
             
         except Exception as e:
             return {
@@ -971,8 +1086,28 @@ class CategorizedVietnameseSpellChecker:
                     'category': 'sticky_typing',
                     'suggestions': [replacement]
                 })
+        errors.extend(self._split_sticky_tokens(text, errors))
         return errors
     
+    def _split_sticky_tokens(self, text: str, errors: List[Dict]) -> List[Dict]:
+        """Tách các token dính chữ chưa có rule literal nào bắt (quy hoạch động, xem word_splitter)"""
+        flagged = {error['position'] for error in errors}
+        split_errors = []
+        for match in re.finditer(r'\w+', text):
+            if match.start() in flagged:
+                continue
+            units = self.word_splitter.split(match.group())
+            if units:
+                replacement = ' '.join(units)
+                split_errors.append({
+                    'word': match.group(),
+                    'position': match.start(),
+                    'corrected': replacement,
+                    'category': 'sticky_typing',
+                    'suggestions': [replacement]
+                })
+        return split_errors
+    
     def _check_typo_errors(self, text: str, words: List[str]) -> List[Dict]:
         """Kiểm tra lỗi gõ nhầm chữ"""
         errors = []
@@ -1003,12 +1138,14 @@ class CategorizedVietnameseSpellChecker:
                 })
         return errors
     
-    def _check_spacing_punctuation(self, text: str) -> List[Dict]:
-        """Kiểm tra lỗi dấu cách và dấu câu"""
+    def _check_spacing_punctuation(self, text: str, token_classes=None) -> List[Dict]:
+        """Kiểm tra lỗi dấu cách và dấu câu (token_classes: bỏ qua dấu chấm/phẩy bên trong số, URL/email)"""
         errors = []
         for pattern, replacement in self.error_categories['spacing_punctuation'].items():
             matches = re.finditer(pattern, text)
             for match in matches:
+                if token_classes is not None and token_classes.skips(match.start(), match.end(), NUMBER | URL_EMAIL):
+                    continue
                 errors.append({
                     'word': match.group(),
                     'position': match.start(),
@@ -1069,10 +1206,29 @@ class CategorizedVietnameseSpellChecker:
             elif old_word.istitle():
                 new_word = new_word.capitalize()
             
-            return re.sub(pattern, new_word, text, flags=re.IGNORECASE)
+            # Không thay bên trong URL/email, số, từ viết tắt, từ nước ngoài ('toi@gmail.com');
+            # chỉ đổi hoa thường thì vẫn áp dụng cho từ nước ngoài ('bangladesh' -> 'Bangladesh')
+            skip_classes = SKIP_CLASSES & ~FOREIGN if new_word.lower() == old_word.lower() else SKIP_CLASSES
+            
+            def replace(match):
+                if self._inside_protected_token(text, match.start(), match.end(), skip_classes):
+                    return match.group()
+                return match.expand(new_word)
+            
+            return re.sub(pattern, replace, text, flags=re.IGNORECASE)
         
         return text
     
+    def _inside_protected_token(self, text: str, start: int, end: int, skip_classes: int = SKIP_CLASSES) -> bool:
+        """Đoạn text[start:end] nằm trong một token (giữa hai dấu cách) thuộc skip_classes"""
+        left = text.rfind(' ', 0, start) + 1
+        right = text.find(' ', end)
+        token = text[left:right if right >= 0 else len(text)].strip(TOKEN_PUNCTUATION)
+        # Văn bản viết hoa toàn bộ: không có từ viết tắt (như TokenClassifier.classify)
+        if text == text.upper():
+            skip_classes &= ~ACRONYM
+        return bool(self.token_classifier.token_class(token) & skip_classes)
+    
     def _get_category_priority(self, category: str) -> int:
         """Lấy độ ưu tiên của category (số càng nhỏ càng ưu tiên)"""
         priorities = {
@@ -1108,12 +1264,9 @@ class CategorizedVietnameseSpellChecker:
         if self.vietnamese_dict.is_correct_word(word):
             return True
         
-        # Kiểm tra có phải tên riêng không
-        if word[0].isupper() and len(word) > 1:
-            return True
-        
-        # Kiểm tra có phải số không
-        if word.isdigit():
+        # Tên riêng viết hoa, từ viết tắt, số, URL/email, từ nước ngoài (nhãn của token_classifier)
+        token_class = self.token_classifier.token_class(word)
+        if token_class & SKIP_CLASSES or (token_class & PROPER_NOUN and not word.islower()):
             return True
         
         return False
@@ -1149,59 +1302,72 @@ class CategorizedVietnameseSpellChecker:
     
     def _calculate_word_probabilities(self, text: str, words: List[str], errors: List[Dict]) -> Dict[str, float]:
         """Tính xác suất lỗi cho từng từ"""
-        word_probabilities = {}
-        
-        # Tạo mapping từ errors
-        error_words = {error['word'].lower(): error for error in errors}
-        
-        for word in words:
-            word_lower = word.lower()
-            
-            if word_lower in error_words:
-                # Từ có lỗi - tính xác suất dựa trên category
-                error = error_words[word_lower]
-                category = error.get('category', 'unknown')
-                
-                # Xác suất dựa trên loại lỗi
-                category_probabilities = {
-                    'tone_error': 0.95,      # Lỗi dấu thanh - xác suất cao
-                    'typo_error': 0.90,      # Lỗi gõ nhầm - xác suất cao
-                    'sticky_typing': 0.85,   # Lỗi dính chữ - xác suất cao
-                    'capitalization': 0.80,  # Lỗi viết hoa - xác suất trung bình
-                    'compound_word': 0.75,   # Lỗi từ ghép - xác suất trung bình
-                    'spacing_punctuation': 0.70,  # Lỗi dấu câu - xác suất thấp
-                    'unknown': 0.50
-                }
-                
-                probability = category_probabilities.get(category, 0.50)
-                
-                # Điều chỉnh dựa trên độ dài từ và tần suất
-                if len(word) <= 2:
-                    probability *= 0.8  # Từ ngắn có thể ít lỗi hơn
-                elif len(word) >= 8:
-                    probability *= 1.1  # Từ dài có thể nhiều lỗi hơn
-                
-                word_probabilities[word] = min(1.0, probability)
-                
-            else:
-                # Từ không có lỗi - xác suất thấp
-                if self.vietnamese_dict.is_correct_word(word):
-                    word_probabilities[word] = 0.05  # Từ đúng - xác suất lỗi thấp
-                else:
-                    # Từ không có trong từ điển nhưng không được detect là lỗi
-                    word_probabilities[word] = 0.30  # Xác suất trung bình
-        
-        return word_probabilities
+        # Xác suất chỉ phụ thuộc vào từ: mỗi từ khác nhau tính một lần, theo thứ tự xuất hiện
+        unique_words = list(dict.fromkeys(words))
+        categories = self._error_category_ids(unique_words, errors)
+        correct = _membership(unique_words, {word for word in unique_words if self.vietnamese_dict.is_correct_word(word)})
+        # Từ không có lỗi: đúng từ điển - xác suất lỗi thấp, không có trong từ điển - trung bình
+        probabilities = np.where(correct, 0.05, 0.30)
+
+        error_index = np.flatnonzero(categories != NO_ERROR)
+        if error_index.size:
+            # Từ có lỗi: xác suất theo loại lỗi, điều chỉnh theo độ dài (từ ngắn ít lỗi, từ dài nhiều lỗi)
+            lengths = np.fromiter((len(unique_words[i]) for i in error_index), dtype=np.int64, count=error_index.size)
+            probability = CATEGORY_PROBABILITIES[categories[error_index]]
+            probability = probability * np.select([lengths <= 2, lengths >= 8], [0.8, 1.1], 1.0)
+            probabilities[error_index] = np.minimum(1.0, probability)
+
+        return dict(zip(unique_words, probabilities.tolist()))
+
+    @staticmethod
+    def _error_category_ids(words: List[str], errors: List[Dict]) -> np.ndarray:
+        """Category id của lỗi ứng với từng từ (so khớp không phân biệt hoa thường); NO_ERROR nếu không có lỗi"""
+        unknown = CATEGORY_IDS['unknown']
+        error_categories = {error['word'].lower(): CATEGORY_IDS.get(error.get('category', 'unknown'), unknown)
+                            for error in errors}
+        return np.fromiter((error_categories.get(word.lower(), NO_ERROR) for word in words),
+                           dtype=np.int8, count=len(words))
     
     def get_suggestions(self, word: str) -> List[str]:
         """Lấy gợi ý sửa lỗi cho từ (compatibility method)"""
-        suggestions = []
+        # Tra bảng gợi ý đã tính sẵn trước
+        suggestions = self.suggestion_table.get(word)
+        if suggestions is not None:
+            return suggestions
+        return self._compute_suggestions(word)
+    
+    def for_dictionary(self, dictionary) -> 'CategorizedVietnameseSpellChecker':
+        """
+        Tạo checker dùng từ điển khác (ví dụ LayeredDictionary của một tenant)
         
-        # Kiểm tra trong các pattern lỗi
-        for category_name, patterns in self.error_categories.items():
-            for pattern, replacement in patterns.items():
-                if re.search(pattern, word, re.IGNORECASE):
-                    suggestions.append(replacement)
+        Bản sao nông: rule, chỉ mục ngược... được dùng chung; chỉ từ điển và bảng
+        gợi ý (phụ thuộc từ điển) là riêng.
+        """
+        checker = copy.copy(self)
+        checker.vietnamese_dict = dictionary
+        checker.suggestion_table = SuggestionTable(top_k=self.suggestion_table.top_k)
+        checker.word_splitter = WordSplitter(dictionary, validator=self.word_splitter.validator)
+        checker.vocabulary = Vocabulary(dictionary, self.context_extractor)
+        checker.decoder = LatticeDecoder(dictionary, language_model=self.decoder.language_model,
+                                         rule_index=self.rule_index, splitter=checker.word_splitter)
+        dictionary.add_update_listener(checker._on_dictionary_update)
+        return checker
+    
+    def warm_suggestion_table(self, path: str = None, traffic_words: List[str] = ()) -> int:
+        """Tính sẵn (hoặc tải từ file) bảng gợi ý top-k, trả về số từ trong bảng"""
+        self.suggestion_table = build_suggestion_table(self, top_k=5, traffic_words=traffic_words, path=path)
+        return len(self.suggestion_table)
+    
+    def _on_dictionary_update(self, word: str) -> None:
+        """Cập nhật bảng gợi ý (và cache của decoder, từ vựng ID) khi từ điển thay đổi lúc chạy"""
+        self.suggestion_table.refresh(self._compute_suggestions, word)
+        self.decoder.clear_cache()
+        self.vocabulary.clear()
+    
+    def _compute_suggestions(self, word: str) -> List[str]:
+        """Tính gợi ý sửa lỗi cho từ (không qua bảng tính sẵn)"""
+        # Kiểm tra trong các pattern lỗi (qua chỉ mục ngược)
+        suggestions = self._rule_suggestions(word)
         
         # Kiểm tra trong từ điển
         if self.vietnamese_dict.is_correct_word(word):
@@ -1215,120 +1381,26 @@ class CategorizedVietnameseSpellChecker:
         unique_suggestions = list(dict.fromkeys(suggestions))
         return unique_suggestions[:5]
 
-    def _analyze_context(self, text: str, words: List[str]) -> Dict:
-        """Phân tích ngữ cảnh tổng thể của văn bản"""
-        context = {
-            'sentence_type': self._detect_sentence_type(text),
-            'subject_verb_patterns': self._detect_subject_verb_patterns(words),
-            'proper_nouns': self._detect_proper_nouns(words),
-            'academic_context': self._detect_academic_context(text),
-            'business_context': self._detect_business_context(text),
-            'education_context': self._detect_education_context(text),
-            'word_relationships': self._analyze_word_relationships(words),
-            'semantic_groups': self._group_semantic_words(words)
-        }
-        return context
-    
-    def _detect_sentence_type(self, text: str) -> str:
-        """Phát hiện loại câu"""
-        if text.endswith('?'):
-            return 'question'
-        elif text.endswith('!'):
-            return 'exclamation'
-        else:
-            return 'statement'
-    
-    def _detect_subject_verb_patterns(self, words: List[str]) -> List[Tuple[str, str]]:
-        """Phát hiện mẫu chủ ngữ - động từ"""
-        patterns = []
-        for i in range(len(words) - 1):
-            word1, word2 = words[i], words[i + 1]
-            # Kiểm tra các mẫu chủ ngữ - động từ phổ biến
-            if (word1.lower() in ['tôi', 'bạn', 'anh', 'chị', 'em', 'chúng', 'họ', 'nó'] and 
-                word2.lower() in ['đang', 'sẽ', 'đã', 'có', 'là', 'học', 'làm', 'đi', 'đến']):
-                patterns.append((word1, word2))
-        return patterns
-    
-    def _detect_proper_nouns(self, words: List[str]) -> List[str]:
-        """Phát hiện danh từ riêng"""
-        proper_nouns = []
-        for word in words:
-            # Kiểm tra từ viết hoa hoặc có thể là tên riêng
-            if (word[0].isupper() and len(word) > 1) or word.lower() in ['việt', 'nam', 'hà', 'nội', 'tp', 'hcm']:
-                proper_nouns.append(word)
-        return proper_nouns
-    
-    def _detect_academic_context(self, text: str) -> bool:
-        """Phát hiện ngữ cảnh học thuật"""
-        academic_keywords = ['học', 'trường', 'đại học', 'khoa học', 'nghiên cứu', 'chuyên ngành', 'sinh viên', 'giáo viên', 'giáo dục']
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in academic_keywords)
-    
-    def _detect_business_context(self, text: str) -> bool:
-        """Phát hiện ngữ cảnh kinh doanh"""
-        business_keywords = ['kinh doanh', 'công việc', 'công ty', 'doanh nghiệp', 'thị trường', 'kinh tế', 'tài chính']
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in business_keywords)
-    
-    def _detect_education_context(self, text: str) -> bool:
-        """Phát hiện ngữ cảnh giáo dục"""
-        education_keywords = ['học', 'trường', 'lớp', 'sinh viên', 'học sinh', 'giáo viên', 'giáo dục', 'đào tạo']
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in education_keywords)
-    
-    def _analyze_word_relationships(self, words: List[str]) -> Dict[str, List[str]]:
-        """Phân tích mối quan hệ giữa các từ"""
-        relationships = {
-            'subject_words': [],
-            'action_words': [],
-            'object_words': [],
-            'descriptive_words': []
-        }
-        
-        for word in words:
-            word_lower = word.lower()
-            # Phân loại từ theo chức năng
-            if word_lower in ['tôi', 'bạn', 'anh', 'chị', 'em', 'chúng', 'họ', 'nó']:
-                relationships['subject_words'].append(word)
-            elif word_lower in ['học', 'làm', 'đi', 'đến', 'có', 'là', 'đang', 'sẽ', 'đã']:
-                relationships['action_words'].append(word)
-            elif word_lower in ['trường', 'lớp', 'công việc', 'nghề', 'ngành']:
-                relationships['object_words'].append(word)
-            elif word_lower in ['rất', 'khó', 'khăn', 'tốt', 'xấu', 'lớn', 'nhỏ']:
-                relationships['descriptive_words'].append(word)
-        
-        return relationships
-    
-    def _group_semantic_words(self, words: List[str]) -> Dict[str, List[str]]:
-        """Nhóm từ theo ngữ nghĩa"""
-        semantic_groups = {
-            'education': ['học', 'trường', 'lớp', 'sinh viên', 'học sinh', 'giáo viên', 'giáo dục'],
-            'business': ['kinh doanh', 'công việc', 'công ty', 'doanh nghiệp', 'thị trường'],
-            'technology': ['ai', 'công nghệ', 'máy tính', 'phần mềm', 'trí tuệ'],
-            'time': ['năm', 'tháng', 'ngày', 'tuần', 'giờ', 'phút'],
-            'location': ['ở', 'tại', 'trong', 'ngoài', 'trên', 'dưới']
-        }
-        
-        grouped_words = {category: [] for category in semantic_groups}
-        
-        for word in words:
-            word_lower = word.lower()
-            for category, keywords in semantic_groups.items():
-                if word_lower in keywords:
-                    grouped_words[category].append(word)
-                    break
-        
-        return grouped_words 
+    def _analyze_context(self, text: str, words: List[str], masks: Optional[List[int]] = None) -> Dict:
+        """Phân tích ngữ cảnh tổng thể của văn bản (một lượt duyệt token, xem context_features)"""
+        return self.context_extractor.extract(text, words, masks)
+
+    def _rule_matches(self, pattern: str, text: str, token_classes, skip_classes: int = SKIP_CLASSES):
+        """Các match của một quy tắc, trừ match chạm vào token không bao giờ sửa (số, viết tắt, URL/email...)"""
+        for match in re.finditer(pattern, text, re.IGNORECASE):
+            if not token_classes.skips(match.start(), match.end(), skip_classes):
+                yield match
 
-    def _check_tone_errors_with_context(self, text: str, words: List[str], context: Dict) -> List[Dict]:
+    def _check_tone_errors_with_context(self, text: str, words: List[str], context: Dict,
+                                        token_classes) -> List[Dict]:
         """Kiểm tra lỗi dấu thanh và ký tự với context awareness"""
         errors = []
         for pattern, replacement in self.error_categories['tone_errors'].items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            matches = self._rule_matches(pattern, text, token_classes)
             for match in matches:
                 word = match.group()
                 # Kiểm tra context trước khi báo lỗi
-                if self._should_correct_word_with_context(word, replacement, context):
+                if self._should_correct_word_with_context(word, replacement, context, token_classes):
                     errors.append({
                         'word': word,
                         'position': match.start(),
@@ -1338,15 +1410,16 @@ class CategorizedVietnameseSpellChecker:
                     })
         return errors
     
-    def _check_sticky_typing_with_context(self, text: str, words: List[str], context: Dict) -> List[Dict]:
+    def _check_sticky_typing_with_context(self, text: str, words: List[str], context: Dict,
+                                          token_classes) -> List[Dict]:
         """Kiểm tra lỗi dính chữ khi gõ với context awareness"""
         errors = []
         for pattern, replacement in self.error_categories['sticky_typing'].items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            matches = self._rule_matches(pattern, text, token_classes)
             for match in matches:
                 word = match.group()
                 # Kiểm tra context trước khi báo lỗi
-                if self._should_correct_word_with_context(word, replacement, context):
+                if self._should_correct_word_with_context(word, replacement, context, token_classes):
                     errors.append({
                         'word': word,
                         'position': match.start(),
@@ -1354,17 +1427,22 @@ class CategorizedVietnameseSpellChecker:
                         'category': 'sticky_typing',
                         'suggestions': [replacement]
                     })
+        for error in self._split_sticky_tokens(text, errors):
+            if self._should_correct_word_with_context(error['word'], error['corrected'], context,
+                                                      token_classes):
+                errors.append(error)
         return errors
     
-    def _check_typo_errors_with_context(self, text: str, words: List[str], context: Dict) -> List[Dict]:
+    def _check_typo_errors_with_context(self, text: str, words: List[str], context: Dict,
+                                        token_classes) -> List[Dict]:
         """Kiểm tra lỗi gõ nhầm với context awareness"""
         errors = []
         for pattern, replacement in self.error_categories['typo_errors'].items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            matches = self._rule_matches(pattern, text, token_classes)
             for match in matches:
                 word = match.group()
                 # Kiểm tra context trước khi báo lỗi
-                if self._should_correct_word_with_context(word, replacement, context):
+                if self._should_correct_word_with_context(word, replacement, context, token_classes):
                     errors.append({
                         'word': word,
                         'position': match.start(),
@@ -1374,15 +1452,17 @@ class CategorizedVietnameseSpellChecker:
                     })
         return errors
     
-    def _check_capitalization_with_context(self, text: str, words: List[str], context: Dict) -> List[Dict]:
+    def _check_capitalization_with_context(self, text: str, words: List[str], context: Dict,
+                                           token_classes) -> List[Dict]:
         """Kiểm tra lỗi viết hoa với context awareness"""
         errors = []
         for pattern, replacement in self.error_categories['capitalization'].items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            # Viết hoa lại từ nước ngoài ('bangladesh' -> 'Bangladesh') vẫn được phép
+            matches = self._rule_matches(pattern, text, token_classes, SKIP_CLASSES & ~FOREIGN)
             for match in matches:
                 word = match.group()
                 # Kiểm tra context trước khi báo lỗi
-                if self._should_correct_word_with_context(word, replacement, context):
+                if self._should_correct_word_with_context(word, replacement, context, token_classes):
                     errors.append({
                         'word': word,
                         'position': match.start(),
@@ -1392,15 +1472,16 @@ class CategorizedVietnameseSpellChecker:
                     })
         return errors
     
-    def _check_compound_words_with_context(self, text: str, words: List[str], context: Dict) -> List[Dict]:
+    def _check_compound_words_with_context(self, text: str, words: List[str], context: Dict,
+                                           token_classes) -> List[Dict]:
         """Kiểm tra lỗi từ ghép với context awareness"""
         errors = []
         for pattern, replacement in self.error_categories['compound_words'].items():
-            matches = re.finditer(pattern, text, re.IGNORECASE)
+            matches = self._rule_matches(pattern, text, token_classes)
             for match in matches:
                 word = match.group()
                 # Kiểm tra context trước khi báo lỗi
-                if self._should_correct_word_with_context(word, replacement, context):
+                if self._should_correct_word_with_context(word, replacement, context, token_classes):
                     errors.append({
                         'word': word,
                         'position': match.start(),
@@ -1410,7 +1491,8 @@ class CategorizedVietnameseSpellChecker:
                     })
         return errors
     
-    def _should_correct_word_with_context(self, word: str, replacement: str, context: Dict) -> bool:
+    def _should_correct_word_with_context(self, word: str, replacement: str, context: Dict,
+                                          token_classes) -> bool:
         """Quyết định có nên sửa từ dựa trên context không"""
         word_lower = word.lower()
         replacement_lower = replacement.lower()
@@ -1498,73 +1580,52 @@ class CategorizedVietnameseSpellChecker:
         if self.vietnamese_dict.is_correct_word(word):
             return False
         
-        # Kiểm tra từ có phải là số không
-        if word.isdigit():
-            return False
-        
-        # Kiểm tra từ có phải là từ viết tắt không
-        if len(word) <= 2 and word.isupper():
-            return False
-        
-        # Kiểm tra xem từ có phải là tên riêng không
-        if word in context['proper_nouns']:
+        # Số, từ viết tắt, tên riêng: nhãn lớp token đã tính một lần cho cả request
+        # (từ nước ngoài đã bị bỏ qua khi khớp quy tắc, trừ quy tắc viết hoa)
+        if token_classes.of(word) & (NUMBER | ACRONYM | PROPER_NOUN):
             return False
         
         return True
     
-    def _calculate_word_probabilities_with_context(self, text: str, words: List[str], errors: List[Dict], context: Dict) -> Dict[str, float]:
-        """Tính xác suất lỗi cho từng từ với context"""
-        word_probabilities = {}
-        
-        # Tạo mapping từ errors
-        error_words = {error['word'].lower(): error for error in errors}
-        
-        for word in words:
-            word_lower = word.lower()
-            
-            if word_lower in error_words:
-                # Từ có lỗi - tính xác suất dựa trên category và context
-                error = error_words[word_lower]
-                category = error.get('category', 'unknown')
-                
-                # Xác suất cơ bản dựa trên loại lỗi
-                category_probabilities = {
-                    'tone_error': 0.95,
-                    'typo_error': 0.90,
-                    'sticky_typing': 0.85,
-                    'capitalization': 0.80,
-                    'compound_word': 0.75,
-                    'spacing_punctuation': 0.70,
-                    'unknown': 0.50
-                }
-                
-                probability = category_probabilities.get(category, 0.50)
-                
-                # Điều chỉnh dựa trên context
-                if context['academic_context'] and word_lower in ['nam', 'hai', 'khoa', 'học', 'tự', 'nhiên']:
-                    probability *= 1.2  # Tăng xác suất trong ngữ cảnh học thuật
-                
-                if context['business_context'] and word_lower in ['kinh', 'doanh', 'công', 'việc']:
-                    probability *= 1.1  # Tăng xác suất trong ngữ cảnh kinh doanh
-                
-                if word in context['proper_nouns']:
-                    probability *= 0.5  # Giảm xác suất cho tên riêng
-                
-                if word in context['word_relationships']['subject_words']:
-                    probability *= 0.8  # Giảm xác suất cho từ chủ ngữ
-                
-                word_probabilities[word] = min(1.0, probability)
-                
-            else:
-                # Từ không có lỗi - xác suất thấp
-                if self.vietnamese_dict.is_correct_word(word):
-                    word_probabilities[word] = 0.05
-                else:
-                    word_probabilities[word] = 0.30
-        
-        return word_probabilities
+    def _calculate_word_probabilities_with_context(self, text: str, words: List[str], errors: List[Dict], context: Dict,
+                                                   token_flags: Optional[Iterable[int]] = None) -> Dict[str, float]:
+        """
+        Tính xác suất lỗi cho từng từ với context (token_flags: cờ từ vựng theo ID của từng token)
+
+        Tính trên mảng NumPy theo từ phân biệt: category id, cờ từ điển và các cờ
+        ngữ cảnh; các hệ số được nhân theo đúng thứ tự cũ (nhân với 1.0 là chính
+        xác) nên kết quả trùng từng bit với cách tính từng từ.
+        """
+        if token_flags is None:
+            token_flags = [WORD if self.vietnamese_dict.is_correct_word(word) else 0 for word in words]
+        # Xác suất chỉ phụ thuộc vào từ: mỗi từ khác nhau tính một lần, theo thứ tự xuất hiện
+        flags_of = dict(zip(words, token_flags))
+        unique_words = list(flags_of)
+        categories = self._error_category_ids(unique_words, errors)
+        flags = np.fromiter(flags_of.values(), dtype=np.uint8, count=len(unique_words))
+        # Từ không có lỗi - xác suất thấp
+        probabilities = np.where(flags & WORD, 0.05, 0.30)
+
+        error_index = np.flatnonzero(categories != NO_ERROR)
+        if error_index.size:
+            # Từ có lỗi - xác suất cơ bản theo loại lỗi, điều chỉnh theo context
+            error_words = [unique_words[i] for i in error_index]
+            lower_words = [word.lower() for word in error_words]
+            probability = CATEGORY_PROBABILITIES[categories[error_index]]
+            if context['academic_context']:
+                probability = probability * np.where(_membership(lower_words, ACADEMIC_WORDS), 1.2, 1.0)
+            if context['business_context']:
+                probability = probability * np.where(_membership(lower_words, BUSINESS_WORDS), 1.1, 1.0)
+            # Giảm xác suất cho tên riêng và từ chủ ngữ
+            probability = probability * np.where(_membership(error_words, set(context['proper_nouns'])), 0.5, 1.0)
+            subject_words = set(context['word_relationships']['subject_words'])
+            probability = probability * np.where(_membership(error_words, subject_words), 0.8, 1.0)
+            probabilities[error_index] = np.minimum(1.0, probability)
+
+        return dict(zip(unique_words, probabilities.tolist()))
     
-    def _apply_categorized_corrections_with_context(self, text: str, errors: List[Dict], context: Dict) -> str:
+    def _apply_categorized_corrections_with_context(self, text: str, errors: List[Dict], context: Dict,
+                                                    token_classes) -> str:
         """Áp dụng corrections với context awareness"""
         corrected_text = text
         
@@ -1576,7 +1637,7 @@ class CategorizedVietnameseSpellChecker:
             corrected_word = error['corrected']
             
             # Kiểm tra context trước khi áp dụng correction
-            if self._should_correct_word_with_context(original_word, corrected_word, context):
+            if self._should_correct_word_with_context(original_word, corrected_word, context, token_classes):
                 corrected_text = self._safe_replace(corrected_text, original_word, corrected_word)
         
         return corrected_text 
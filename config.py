@@ -21,6 +21,15 @@ class Config:
     
     # Model Configuration
     MODEL_PATH = os.getenv('MODEL_PATH', '')
+    LLAMA_SERVER_PATH = os.getenv('LLAMA_SERVER_PATH', '../build/bin/llama-server')
+    LLAMA_SERVER_LOG = os.getenv('LLAMA_SERVER_LOG', 'llama-server.log')  # stdout/stderr của llama-server
+    LLAMA_CTX_SIZE = int(os.getenv('LLAMA_CTX_SIZE', 2048))
+    LLAMA_STARTUP_TIMEOUT = float(os.getenv('LLAMA_STARTUP_TIMEOUT', 120))  # Thời gian tối đa chờ nạp model
+    LLAMA_MAX_RESTARTS = int(os.getenv('LLAMA_MAX_RESTARTS', 5))  # Số lần crash liên tiếp được khởi động lại
+    LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 4))
+    LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', 10))
+    LLM_RETRIES = int(os.getenv('LLM_RETRIES', 2))
+    LLM_RETRY_BACKOFF = float(os.getenv('LLM_RETRY_BACKOFF', 0.2))
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -29,6 +38,7 @@ class Config:
     # Performance Configuration
     MAX_TEXT_LENGTH = int(os.getenv('MAX_TEXT_LENGTH', 10000))
     PROCESSING_TIMEOUT = int(os.getenv('PROCESSING_TIMEOUT', 30))
+    LATENCY_BUDGET_MS = float(os.getenv('LATENCY_BUDGET_MS', 0))  # Ngân sách thời gian mỗi request (0 = không giới hạn)
     
     # API Configuration
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', '*')
@@ -38,10 +48,27 @@ class Config:
     CONFIDENCE_THRESHOLD = 0.7
     MAX_SUGGESTIONS = 5
     
+    # Dictionary Configuration
+    LEXICON_PATH = os.getenv('LEXICON_PATH', '')  # File lexicon ngoài, mỗi dòng một từ
+    DICTIONARY_PATH = os.getenv('DICTIONARY_PATH', '')  # File từ điển nhị phân (mmap), ưu tiên hơn LEXICON_PATH
+    FREQUENCY_PATH = os.getenv('FREQUENCY_PATH', '')  # File tần suất từ corpus (build_frequency.py)
+    SUGGESTION_TABLE_PATH = os.getenv('SUGGESTION_TABLE_PATH', '')  # Bảng gợi ý tính sẵn (suggestion_table.py)
+    DICTIONARY_LOG_PATH = os.getenv('DICTIONARY_LOG_PATH', '')  # Log cập nhật từ điển lúc chạy (append-only)
+    TENANT_DICTIONARY_DIR = os.getenv('TENANT_DICTIONARY_DIR', '')  # Thư mục <tenant>.txt: từ điển riêng theo tenant
+    BLOOM_FALSE_POSITIVE_RATE = float(os.getenv('BLOOM_FALSE_POSITIVE_RATE', 0.01))  # Bloom filter của lexicon lớn
+    LANGUAGE_MODEL_PATH = os.getenv('LANGUAGE_MODEL_PATH', '')  # Mô hình n-gram xếp hạng gợi ý (ngram_model.py)
+    DECODER_BEAM_WIDTH = int(os.getenv('DECODER_BEAM_WIDTH', 0))  # Beam mặc định của lattice decoder (0 = sửa tuần tự)
+    DECODER_MAX_BEAM_WIDTH = int(os.getenv('DECODER_MAX_BEAM_WIDTH', 32))  # Giới hạn beam_width của request
+    ACCENT_BEAM_WIDTH = int(os.getenv('ACCENT_BEAM_WIDTH', 8))  # Beam của chế độ khôi phục dấu (accent_restorer.py)
+    ACCENT_MAX_BATCH = int(os.getenv('ACCENT_MAX_BATCH', 256))  # Số văn bản tối đa mỗi request /api/restore_accents
+    
     # Cache Configuration
     ENABLE_CACHE = os.getenv('ENABLE_CACHE', 'true').lower() == 'true'
     CACHE_TTL = int(os.getenv('CACHE_TTL', 3600))  # 1 hour
     CACHE_MAX_SIZE = int(os.getenv('CACHE_MAX_SIZE', 1000))
+    LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', '')  # File SQLite cache câu trả lời LLM (llm_cache.py)
+    LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 3600))  # 7 ngày
+    LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 100000))
     
     # Performance Optimization
     ENABLE_COMPRESSION = os.getenv('ENABLE_COMPRESSION', 'true').lower() == 'true'
@@ -60,17 +87,42 @@ class Config:
             'port': cls.PORT,
             'debug': cls.DEBUG,
             'model_path': cls.MODEL_PATH,
+            'llama_server_path': cls.LLAMA_SERVER_PATH,
+            'llama_server_log': cls.LLAMA_SERVER_LOG,
+            'llama_ctx_size': cls.LLAMA_CTX_SIZE,
+            'llama_startup_timeout': cls.LLAMA_STARTUP_TIMEOUT,
+            'llama_max_restarts': cls.LLAMA_MAX_RESTARTS,
+            'llm_max_concurrency': cls.LLM_MAX_CONCURRENCY,
+            'llm_timeout': cls.LLM_TIMEOUT,
+            'llm_retries': cls.LLM_RETRIES,
+            'llm_retry_backoff': cls.LLM_RETRY_BACKOFF,
             'log_level': cls.LOG_LEVEL,
             'log_file': cls.LOG_FILE,
             'max_text_length': cls.MAX_TEXT_LENGTH,
             'processing_timeout': cls.PROCESSING_TIMEOUT,
+            'latency_budget_ms': cls.LATENCY_BUDGET_MS,
             'cors_origins': cls.CORS_ORIGINS,
             'rate_limit': cls.RATE_LIMIT,
             'confidence_threshold': cls.CONFIDENCE_THRESHOLD,
             'max_suggestions': cls.MAX_SUGGESTIONS,
+            'lexicon_path': cls.LEXICON_PATH,
+            'dictionary_path': cls.DICTIONARY_PATH,
+            'frequency_path': cls.FREQUENCY_PATH,
+            'suggestion_table_path': cls.SUGGESTION_TABLE_PATH,
+            'dictionary_log_path': cls.DICTIONARY_LOG_PATH,
+            'tenant_dictionary_dir': cls.TENANT_DICTIONARY_DIR,
+            'bloom_false_positive_rate': cls.BLOOM_FALSE_POSITIVE_RATE,
+            'language_model_path': cls.LANGUAGE_MODEL_PATH,
+            'decoder_beam_width': cls.DECODER_BEAM_WIDTH,
+            'decoder_max_beam_width': cls.DECODER_MAX_BEAM_WIDTH,
+            'accent_beam_width': cls.ACCENT_BEAM_WIDTH,
+            'accent_max_batch': cls.ACCENT_MAX_BATCH,
             'enable_cache': cls.ENABLE_CACHE,
             'cache_ttl': cls.CACHE_TTL,
             'cache_max_size': cls.CACHE_MAX_SIZE,
+            'llm_cache_path': cls.LLM_CACHE_PATH,
+            'llm_cache_ttl': cls.LLM_CACHE_TTL,
+            'llm_cache_max_entries': cls.LLM_CACHE_MAX_ENTRIES,
             'enable_compression': cls.ENABLE_COMPRESSION,
             'enable_async': cls.ENABLE_ASYNC,
             'worker_threads': cls.WORKER_THREADS,
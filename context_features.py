@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Context Feature Extractor for Vietnamese Spell Checker
+Trích xuất đặc trưng ngữ cảnh theo nhu cầu (cờ lĩnh vực, vai trò từ, nhóm ngữ nghĩa)
+"""
+
+from collections import deque
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Cờ ngữ cảnh: bật khi văn bản chứa một cụm từ khóa (khớp theo ranh giới âm tiết)
+CONTEXT_KEYWORDS = {
+    'academic_context': ['học', 'trường', 'đại học', 'khoa học', 'nghiên cứu', 'chuyên ngành', 'sinh viên',
+                         'giáo viên', 'giáo dục'],
+    'business_context': ['kinh doanh', 'công việc', 'công ty', 'doanh nghiệp', 'thị trường', 'kinh tế', 'tài chính'],
+    'education_context': ['học', 'trường', 'lớp', 'sinh viên', 'học sinh', 'giáo viên', 'giáo dục', 'đào tạo'],
+}
+
+# Vai trò của từ (mỗi từ thuộc nhóm đầu tiên khớp)
+WORD_ROLES = {
+    'subject_words': ['tôi', 'bạn', 'anh', 'chị', 'em', 'chúng', 'họ', 'nó'],
+    'action_words': ['học', 'làm', 'đi', 'đến', 'có', 'là', 'đang', 'sẽ', 'đã'],
+    'object_words': ['trường', 'lớp', 'công việc', 'nghề', 'ngành'],
+    'descriptive_words': ['rất', 'khó', 'khăn', 'tốt', 'xấu', 'lớn', 'nhỏ'],
+}
+
+# Nhóm ngữ nghĩa (mỗi từ thuộc nhóm đầu tiên khớp)
+SEMANTIC_GROUPS = {
+    'education': ['học', 'trường', 'lớp', 'sinh viên', 'học sinh', 'giáo viên', 'giáo dục'],
+    'business': ['kinh doanh', 'công việc', 'công ty', 'doanh nghiệp', 'thị trường'],
+    'technology': ['ai', 'công nghệ', 'máy tính', 'phần mềm', 'trí tuệ'],
+    'time': ['năm', 'tháng', 'ngày', 'tuần', 'giờ', 'phút'],
+    'location': ['ở', 'tại', 'trong', 'ngoài', 'trên', 'dưới'],
+}
+
+# Từ có thể là một phần của tên riêng dù viết thường
+PROPER_NOUN_HINTS = ['việt', 'nam', 'hà', 'nội', 'tp', 'hcm']
+
+# Mẫu chủ ngữ - động từ: từ trước thuộc nhóm SUBJECT, từ sau thuộc nhóm VERB
+SUBJECT_WORDS = WORD_ROLES['subject_words']
+VERB_WORDS = ['đang', 'sẽ', 'đã', 'có', 'là', 'học', 'làm', 'đi', 'đến']
+
+
+class KeywordAutomaton:
+    """
+    Automaton Aho-Corasick trên chuỗi âm tiết
+
+    Mỗi cụm từ khóa là một dãy âm tiết gắn một bitmask; feed() nhận lần lượt
+    từng âm tiết và trả về OR các bitmask của mọi cụm kết thúc tại đó. Chi
+    phí O(số âm tiết), không phụ thuộc số từ khóa.
+    """
+
+    def __init__(self, phrases: Iterable[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[int] = [0]
+        for phrase, mask in phrases:
+            state = 0
+            for syllable in phrase.split():
+                next_state = self._goto[state].get(syllable)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][syllable] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(0)
+                state = next_state
+            self._output[state] |= mask
+        self._build_failure_links()
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for syllable, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and syllable not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(syllable, 0)
+                # Gộp output theo chuỗi failure để feed() không phải đi lại chuỗi đó
+                self._output[next_state] |= self._output[self._fail[next_state]]
+
+    def feed(self, state: int, syllable: str) -> Tuple[int, int]:
+        """Chuyển trạng thái với một âm tiết; trả về (trạng thái mới, bitmask các cụm vừa khớp)"""
+        goto, fail = self._goto, self._fail
+        while state and syllable not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(syllable, 0)
+        return state, self._output[state]
+
+
+class ContextFeatureExtractor:
+    """Tính context của categorized checker: automaton cho cờ lĩnh vực, bitmask tính sẵn cho token"""
+
+    def __init__(self, context_keywords: Dict[str, List[str]] = CONTEXT_KEYWORDS,
+                 word_roles: Dict[str, List[str]] = WORD_ROLES,
+                 semantic_groups: Dict[str, List[str]] = SEMANTIC_GROUPS,
+                 proper_noun_hints: List[str] = PROPER_NOUN_HINTS,
+                 subject_words: List[str] = SUBJECT_WORDS, verb_words: List[str] = VERB_WORDS):
+        self.flag_names = list(context_keywords)
+        self.all_flags = (1 << len(self.flag_names)) - 1
+        self.automaton = KeywordAutomaton(
+            (keyword, 1 << i) for i, keywords in enumerate(context_keywords.values()) for keyword in keywords)
+
+        # Bitmask đặc trưng của từng token (chữ thường): vai trò, nhóm ngữ nghĩa, tên riêng, chủ ngữ/động từ
+        self._token_bits: List[Tuple[int, str, str]] = []
+        self.token_masks: Dict[str, int] = {}
+        for feature, groups in (('word_relationships', word_roles), ('semantic_groups', semantic_groups)):
+            for name, words in groups.items():
+                bit = 1 << len(self._token_bits)
+                self._token_bits.append((bit, feature, name))
+                for word in words:
+                    # Chỉ nhóm đầu tiên khớp được tính
+                    if not any(self.token_masks.get(word, 0) & b for b, f, _ in self._token_bits if f == feature):
+                        self.token_masks[word] = self.token_masks.get(word, 0) | bit
+        self.group_names = {feature: [name for _, f, name in self._token_bits if f == feature]
+                            for feature in ('word_relationships', 'semantic_groups')}
+        self.PROPER_HINT = 1 << len(self._token_bits)
+        self.SUBJECT = self.PROPER_HINT << 1
+        self.VERB = self.SUBJECT << 1
+        for words, bit in ((proper_noun_hints, self.PROPER_HINT), (subject_words, self.SUBJECT),
+                           (verb_words, self.VERB)):
+            for word in words:
+                self.token_masks[word] = self.token_masks.get(word, 0) | bit
+
+    def extract(self, text: str, words: List[str], masks: Optional[List[int]] = None) -> 'LazyContext':
+        """
+        Context của văn bản; mỗi đặc trưng chỉ được tính ở lần truy cập đầu tiên
+
+        Args:
+            text: Văn bản (đã chuẩn hóa)
+            words: Token của ViTokenizer (từ ghép nối bằng '_')
+            masks: Bitmask của từng token nếu đã có sẵn (ví dụ từ Vocabulary), bỏ qua để tự tra
+
+        Returns:
+            LazyContext với sentence_type, subject_verb_patterns, proper_nouns, các cờ *_context,
+            word_relationships và semantic_groups
+        """
+        return LazyContext(self, text, words, masks)
+
+    def token_masks_for(self, words: List[str]) -> List[int]:
+        """Bitmask đặc trưng của từng token"""
+        token_masks = self.token_masks
+        return [token_masks.get(word.lower(), 0) for word in words]
+
+    def flags(self, words: List[str]) -> Dict[str, bool]:
+        """Các cờ lĩnh vực, một lượt automaton qua các âm tiết (dừng sớm khi đã bật hết)"""
+        automaton, flags, state = self.automaton, 0, 0
+        for word in words:
+            for syllable in word.lower().split('_'):
+                state, matched = automaton.feed(state, syllable)
+                flags |= matched
+            if flags == self.all_flags:
+                break
+        return {name: bool(flags & (1 << i)) for i, name in enumerate(self.flag_names)}
+
+    def groups(self, feature: str, words: List[str], masks: List[int]) -> Dict[str, List[str]]:
+        """Nhóm token theo feature ('word_relationships' hoặc 'semantic_groups')"""
+        grouped = {name: [] for name in self.group_names[feature]}
+        bits = [(bit, name) for bit, f, name in self._token_bits if f == feature]
+        feature_bits = sum(bit for bit, _ in bits)
+        for word, mask in zip(words, masks):
+            if mask & feature_bits:
+                for bit, name in bits:
+                    if mask & bit:
+                        grouped[name].append(word)
+        return grouped
+
+    def subject_verb_patterns(self, words: List[str], masks: List[int]) -> List[Tuple[str, str]]:
+        """Các cặp (chủ ngữ, động từ) liền nhau"""
+        return [(words[i - 1], words[i]) for i in range(1, len(words))
+                if masks[i - 1] & self.SUBJECT and masks[i] & self.VERB]
+
+    def proper_nouns(self, words: List[str], masks: List[int]) -> List[str]:
+        """Token viết hoa (dài hơn 1 ký tự) hoặc là một phần tên riêng thường gặp"""
+        return [word for word, mask in zip(words, masks)
+                if (word[0].isupper() and len(word) > 1) or mask & self.PROPER_HINT]
+
+    @staticmethod
+    def sentence_type(text: str) -> str:
+        """Phát hiện loại câu"""
+        if text.endswith('?'):
+            return 'question'
+        elif text.endswith('!'):
+            return 'exclamation'
+        return 'statement'
+
+
+class LazyContext(Mapping):
+    """
+    Context chỉ đọc, tính từng đặc trưng khi được truy cập lần đầu rồi ghi nhớ
+
+    Các bước kiểm tra không đọc tới một đặc trưng thì không phải trả chi phí
+    của nó; các cờ lĩnh vực dùng chung một lượt automaton, các nhóm token dùng
+    chung danh sách bitmask.
+    """
+
+    def __init__(self, extractor: ContextFeatureExtractor, text: str, words: List[str],
+                 masks: Optional[List[int]] = None):
+        self.extractor = extractor
+        self.text = text
+        self.words = words
+        self._values: Dict[str, object] = {}
+        self._masks = masks
+
+    def _token_masks(self) -> List[int]:
+        if self._masks is None:
+            self._masks = self.extractor.token_masks_for(self.words)
+        return self._masks
+
+    def _compute(self, key: str) -> None:
+        extractor, words = self.extractor, self.words
+        if key == 'sentence_type':
+            self._values[key] = extractor.sentence_type(self.text)
+        elif key in extractor.flag_names:
+            self._values.update(extractor.flags(words))
+        elif key in extractor.group_names:
+            self._values[key] = extractor.groups(key, words, self._token_masks())
+        elif key == 'subject_verb_patterns':
+            self._values[key] = extractor.subject_verb_patterns(words, self._token_masks())
+        elif key == 'proper_nouns':
+            self._values[key] = extractor.proper_nouns(words, self._token_masks())
+        else:
+            raise KeyError(key)
+
+    def __getitem__(self, key: str):
+        if key not in self._values:
+            self._compute(key)
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'sentence_type'
+        yield 'subject_verb_patterns'
+        yield 'proper_nouns'
+        yield from self.extractor.flag_names
+        yield from self.extractor.group_names
+
+    def __len__(self) -> int:
+        return 3 + len(self.extractor.flag_names) + len(self.extractor.group_names)
+
+
+# Tạo instance global
+context_extractor = ContextFeatureExtractor()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Edit Distance for Vietnamese Spell Checker
+Khoảng cách chỉnh sửa dùng chung: Levenshtein/Damerau có giới hạn (banded, dừng sớm)
+và chi phí thấp hơn cho lỗi chỉ khác dấu
+"""
+
+import math
+import unicodedata
+from functools import lru_cache
+
+# Chi phí thay thế khi hai ký tự chỉ khác dấu (ví dụ 'o' -> 'ô', 'a' -> 'á')
+DIACRITIC_COST = 0.5
+DEFAULT_THRESHOLD = 0.7
+
+
+@lru_cache(maxsize=4096)
+def base_char(char: str) -> str:
+    """Lấy ký tự gốc không dấu ('ộ' -> 'o', 'đ' -> 'd')"""
+    if char in ('đ', 'Đ'):
+        return 'd' if char == 'đ' else 'D'
+    decomposed = unicodedata.normalize('NFD', char)
+    return decomposed[0] if decomposed else char
+
+
+def strip_diacritics(text: str) -> str:
+    """Bỏ toàn bộ dấu của chuỗi ('Việt Nam' -> 'Viet Nam')"""
+    return ''.join(base_char(char) for char in text)
+
+
+def bounded_distance(word1: str, word2: str, max_distance: float,
+                     transpositions: bool = True, diacritic_cost: float = DIACRITIC_COST) -> float:
+    """
+    Khoảng cách chỉnh sửa có giới hạn
+
+    Chỉ tính các ô trong dải |i - j| <= max_distance và dừng ngay khi mọi ô
+    của một hàng đều vượt giới hạn.
+
+    Args:
+        max_distance: Giới hạn khoảng cách cần quan tâm
+        transpositions: Cho phép đổi chỗ hai ký tự liền kề (Damerau, chi phí 1)
+        diacritic_cost: Chi phí thay thế khi hai ký tự chỉ khác dấu (1 = Levenshtein thường)
+
+    Returns:
+        Khoảng cách nếu <= max_distance, ngược lại math.inf
+    """
+    if word1 == word2:
+        return 0.0
+
+    len1, len2 = len(word1), len(word2)
+    if abs(len1 - len2) > max_distance:
+        return math.inf
+    if len1 == 0 or len2 == 0:
+        return float(max(len1, len2))
+
+    band = int(max_distance)
+    base1 = strip_diacritics(word1) if diacritic_cost < 1 else word1
+    base2 = strip_diacritics(word2) if diacritic_cost < 1 else word2
+
+    inf = math.inf
+    previous2 = None
+    previous = [float(j) if j <= band else inf for j in range(len2 + 1)]
+
+    for i in range(1, len1 + 1):
+        current = [inf] * (len2 + 1)
+        if i <= band:
+            current[0] = float(i)
+        char1 = word1[i - 1]
+        row_min = current[0]
+
+        for j in range(max(1, i - band), min(len2, i + band) + 1):
+            char2 = word2[j - 1]
+            if char1 == char2:
+                cost = 0.0
+            elif base1[i - 1] == base2[j - 1]:
+                cost = diacritic_cost
+            else:
+                cost = 1.0
+
+            distance = min(
+                previous[j] + 1,         # deletion
+                current[j - 1] + 1,      # insertion
+                previous[j - 1] + cost   # substitution
+            )
+            if (transpositions and previous2 is not None and j > 1
+                    and char1 == word2[j - 2] and word1[i - 2] == char2):
+                distance = min(distance, previous2[j - 2] + 1)  # transposition
+
+            current[j] = distance
+            if distance < row_min:
+                row_min = distance
+
+        # Dừng sớm: mọi ô của hàng đều vượt giới hạn
+        if row_min > max_distance:
+            return inf
+
+        previous2, previous = previous, current
+
+    distance = previous[len2]
+    return distance if distance <= max_distance else inf
+
+
+def distance(word1: str, word2: str, transpositions: bool = True,
+             diacritic_cost: float = DIACRITIC_COST) -> float:
+    """Khoảng cách chỉnh sửa đầy đủ (không giới hạn)"""
+    return bounded_distance(word1, word2, max(len(word1), len(word2)),
+                            transpositions=transpositions, diacritic_cost=diacritic_cost)
+
+
+def similarity(word1: str, word2: str, transpositions: bool = True,
+               diacritic_cost: float = DIACRITIC_COST) -> float:
+    """Độ tương đồng 1 - distance / max_len (1.0 nếu giống hệt)"""
+    if word1 == word2:
+        return 1.0
+    max_len = max(len(word1), len(word2))
+    if max_len == 0:
+        return 0
+    return 1 - distance(word1, word2, transpositions, diacritic_cost) / max_len
+
+
+def is_similar(word1: str, word2: str, threshold: float = DEFAULT_THRESHOLD,
+               transpositions: bool = True, diacritic_cost: float = DIACRITIC_COST) -> bool:
+    """Kiểm tra similarity(word1, word2) > threshold, dừng sớm khi chắc chắn không đạt"""
+    if word1 == word2:
+        return True
+    max_len = max(len(word1), len(word2))
+    if max_len == 0:
+        return False
+    limit = (1 - threshold) * max_len
+    result = bounded_distance(word1, word2, limit, transpositions, diacritic_cost)
+    return result != math.inf and 1 - result / max_len > threshold
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Lattice Decoder for Vietnamese Spell Checker
+Sửa lỗi cả câu một lần: dựng lattice ứng viên cho từng đoạn âm tiết (rule, chỉ mục không dấu,
+khoảng cách chỉnh sửa) rồi chọn chuỗi tốt nhất bằng beam search chấm điểm theo mô hình ngôn ngữ
+"""
+
+import heapq
+import re
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+import edit_distance
+from ngram_model import SENTENCE_END, SENTENCE_START, NgramLanguageModel, syllables
+
+SYLLABLE_PATTERN = re.compile(r'\w+')
+
+# Chi phí kênh (đơn vị log10, trừ vào điểm mô hình ngôn ngữ)
+UNKNOWN_COST = 2.0      # Giữ nguyên một âm tiết không có trong từ điển
+SYLLABLE_COST = 0.1     # Giữ nguyên một âm tiết chỉ xuất hiện trong từ ghép của từ điển
+RULE_COST = 0.3         # Thay theo rule đã biết (rẻ hơn sửa một dấu)
+SPLIT_COST = 0.5        # Tách token dính chữ thành nhiều âm tiết
+EDIT_COST = 0.5         # Cộng thêm vào khoảng cách chỉnh sửa của gợi ý từ điển
+CHANNEL_WEIGHT = 1.0
+ORDER_COST = 1e-3       # Phân định ứng viên bằng điểm theo thứ tự đề xuất
+
+
+def match_case(original: str, replacement: str) -> str:
+    """Giữ kiểu viết hoa của từ gốc nếu replacement viết thường"""
+    if replacement != replacement.lower():
+        return replacement
+    if original.isupper() and len(original) > 1:
+        return replacement.upper()
+    if original[:1].isupper():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+class Edge(NamedTuple):
+    """Một cạnh của lattice: thay các âm tiết [start, end) bằng output"""
+    start: int
+    end: int
+    output: str
+    cost: float
+    source: str
+
+
+class _Hypothesis(NamedTuple):
+    score: float
+    state: Tuple[str, ...]
+    previous: Optional['_Hypothesis']
+    edge: Optional[Edge]
+
+
+class LatticeDecoder:
+    """
+    Giải mã lattice ứng viên sửa lỗi cho cả câu
+
+    Mỗi đoạn 1..max_span âm tiết liên tiếp có các cạnh: giữ nguyên, replacement
+    của rule literal (kể cả rule nhiều âm tiết như 'viet nam'), cách tách token
+    dính chữ (splitter), các từ cùng dạng không dấu trong từ điển, và gợi ý theo
+    khoảng cách chỉnh sửa cho từ lạ. Beam search duyệt các vị trí từ trái sang
+    phải, gộp các giả thuyết có cùng 2 âm tiết cuối (Viterbi) và giữ beam_width
+    giả thuyết tốt nhất mỗi vị trí: beam hẹp cho request tương tác, beam rộng
+    cho batch. Không có mô hình ngôn ngữ thì lattice chỉ gồm giữ nguyên, rule và
+    cách tách (chi phí kênh quyết định).
+    """
+
+    def __init__(self, dictionary, language_model: Optional[NgramLanguageModel] = None,
+                 rule_index: Optional[Dict[str, List[Tuple[int, str]]]] = None,
+                 max_span: int = 3, max_candidates: int = 8, splitter=None):
+        self.dictionary = dictionary
+        self.language_model = language_model
+        self.rule_index = rule_index or {}
+        self.splitter = splitter
+        self.max_span = max(max_span, max((len(t.split(' ')) for t in self.rule_index), default=1))
+        self.max_candidates = max_candidates
+        self._edit_cache: Dict[str, List[str]] = {}
+        self._syllables: Optional[Set[str]] = None
+
+    def decode(self, text: str, beam_width: int = 4, token_classes=None) -> Dict:
+        """
+        Sửa lỗi cả văn bản
+
+        Args:
+            text: Văn bản cần sửa
+            beam_width: Số giả thuyết giữ lại ở mỗi vị trí (1 = tham lam)
+            token_classes: Nhãn lớp token của văn bản (token_classes.TokenClasses); âm tiết thuộc
+                số, từ viết tắt, URL/email, từ nước ngoài chỉ được giữ nguyên hoặc đổi hoa thường
+
+        Returns:
+            Dict gồm corrected_text, corrections (word, position, corrected, source) và beam_width
+        """
+        beam_width = max(1, int(beam_width))
+        matches = list(SYLLABLE_PATTERN.finditer(text))
+        tokens = [m.group() for m in matches]
+        fixed = set()
+        if token_classes is not None:
+            fixed = {i for i, m in enumerate(matches) if token_classes.skips(m.start(), m.end())}
+        edges = self.build_lattice(tokens, fixed)
+
+        beams: List[Dict[Tuple[str, ...], _Hypothesis]] = [dict() for _ in range(len(tokens) + 1)]
+        beams[0][(SENTENCE_START,)] = _Hypothesis(0.0, (SENTENCE_START,), None, None)
+        for position in range(len(tokens)):
+            for hypothesis in heapq.nlargest(beam_width, beams[position].values()):
+                for edge in edges[position]:
+                    output_syllables = syllables([edge.output])
+                    state = (hypothesis.state + tuple(output_syllables))[-2:]
+                    score = (hypothesis.score + self._lm_score(hypothesis.state, output_syllables)
+                             - CHANNEL_WEIGHT * edge.cost)
+                    best = beams[edge.end].get(state)
+                    if best is None or score > best.score:
+                        beams[edge.end][state] = _Hypothesis(score, state, hypothesis, edge)
+
+        final = max(beams[-1].values(), key=lambda h: h.score + self._lm_score(h.state, [SENTENCE_END]))
+        chosen = []
+        while final.edge is not None:
+            chosen.append(final.edge)
+            final = final.previous
+        chosen.reverse()
+        return self._render(text, matches, chosen, beam_width)
+
+    def build_lattice(self, tokens: List[str], fixed: Set[int] = frozenset()) -> List[List[Edge]]:
+        """Các cạnh bắt đầu tại mỗi vị trí âm tiết (vị trí trong fixed chỉ được giữ nguyên)"""
+        edges: List[List[Edge]] = [[] for _ in tokens]
+        for start in range(len(tokens)):
+            if start in fixed:
+                # Chỉ giữ nguyên hoặc đổi hoa thường theo rule ('bangladesh' -> 'Bangladesh')
+                key = tokens[start].lower()
+                edges[start].extend(edge for edge in self._span_candidates(tokens, start, start + 1)
+                                    if edge.output.lower() == key)
+                continue
+            for end in range(start + 1, min(len(tokens), start + self.max_span) + 1):
+                if end - 1 in fixed:
+                    break
+                edges[start].extend(self._span_candidates(tokens, start, end))
+        return edges
+
+    def _span_candidates(self, tokens: List[str], start: int, end: int) -> List[Edge]:
+        span = ' '.join(tokens[start:end])
+        key = span.lower()
+        candidates: Dict[str, Tuple[float, str]] = {}
+
+        def add(output: str, cost: float, source: str) -> None:
+            if output not in candidates or cost < candidates[output][0]:
+                candidates[output] = (cost, source)
+
+        # Giữ nguyên: một âm tiết, hoặc cả đoạn nếu là từ ghép có trong từ điển
+        known = self.dictionary.is_correct_word(span) or span.isdigit()
+        if known:
+            add(span, 0.0, 'original')
+        elif end - start == 1:
+            known = key in self._known_syllables()
+            add(span, SYLLABLE_COST if known else UNKNOWN_COST, 'original')
+        rules = self.rule_index.get(key, ())
+        for _, replacement in rules:
+            add(replacement, RULE_COST, 'rule')
+        if end - start == 1 and not known and self.splitter is not None:
+            units = self.splitter.split(span)
+            if units:
+                add(' '.join(units), SPLIT_COST, 'split')
+
+        # Không có mô hình ngôn ngữ thì không có căn cứ chọn giữa các từ của từ điển: chỉ dùng rule và cách tách
+        if self.language_model is not None:
+            # Cùng dạng không dấu (lỗi thiếu/sai dấu), kể cả từ ghép nhiều âm tiết
+            frequency = self.dictionary.word_frequency
+            similar = sorted((w for w in self.dictionary.words_with_skeleton(key) if w != key),
+                             key=lambda w: -frequency.get(w, 0))
+            if (end - start == 1 and not known and not rules and not span[0].isupper()
+                    and len(similar) < self.max_candidates):
+                # Từ lạ viết thường chưa có rule: thêm gợi ý theo khoảng cách chỉnh sửa (quét từ điển)
+                similar += self._edit_suggestions(key)
+            skeleton = edit_distance.strip_diacritics(key)
+            for word in similar[:self.max_candidates]:
+                cost = edit_distance.distance(key, word)
+                if edit_distance.strip_diacritics(word) != skeleton:
+                    cost += EDIT_COST
+                add(word, cost, 'dictionary')
+
+        return [Edge(start, end, output, cost + i * ORDER_COST, source)
+                for i, (output, (cost, source)) in enumerate(candidates.items())]
+
+    def _edit_suggestions(self, word: str) -> List[str]:
+        """Gợi ý một âm tiết theo khoảng cách chỉnh sửa (có cache, từ lạ thường lặp lại)"""
+        suggestions = self._edit_cache.get(word)
+        if suggestions is None:
+            suggestions = [w for w in self.dictionary.get_suggestions(word, self.max_candidates) if ' ' not in w]
+            if len(self._edit_cache) >= 4096:
+                self._edit_cache.clear()
+            self._edit_cache[word] = suggestions
+        return suggestions
+
+    def clear_cache(self) -> None:
+        """Xóa cache gợi ý và tập âm tiết (gọi khi từ điển thay đổi)"""
+        self._edit_cache = {}
+        self._syllables = None
+
+    def _known_syllables(self) -> Set[str]:
+        """Mọi âm tiết xuất hiện trong các từ của từ điển (dựng lười)"""
+        if self._syllables is None:
+            self._syllables = {syllable for word in self.dictionary.words for syllable in word.split(' ')}
+        return self._syllables
+
+    def _lm_score(self, state: Tuple[str, ...], output_syllables: List[str]) -> float:
+        """log10 điểm của các âm tiết output sau state (0 khi không có mô hình: chỉ chi phí kênh quyết định)"""
+        if self.language_model is None:
+            return 0.0
+        context = list(state)
+        return self.language_model.score(context + output_syllables, start=len(context))
+
+    def _render(self, text: str, matches, chosen: List[Edge], beam_width: int) -> Dict:
+        pieces, corrections, cursor = [], [], 0
+        for edge in chosen:
+            begin, finish = matches[edge.start].start(), matches[edge.end - 1].end()
+            original = text[begin:finish]
+            output = match_case(original, edge.output)
+            pieces.append(text[cursor:begin])
+            pieces.append(output)
+            if output != original:
+                corrections.append({'word': original, 'position': begin, 'corrected': output,
+                                    'source': edge.source})
+            cursor = finish
+        pieces.append(text[cursor:])
+        return {'corrected_text': ''.join(pieces), 'corrections': corrections, 'beam_width': beam_width}
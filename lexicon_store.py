@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact Lexicon Storage for Vietnamese Spell Checker
+Lưu trữ từ điển lớn dạng mảng UTF-8 đã sắp xếp (tra cứu bằng bisect)
+và file nhị phân mở bằng mmap để chia sẻ giữa các worker
+"""
+
+import argparse
+import bisect
+import mmap
+import struct
+import sys
+import unicodedata
+from array import array
+from collections.abc import Mapping, MutableMapping, Set
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from bloom_filter import BloomFilter
+
+# Định dạng file nhị phân: MAGIC + số chunk (uint32) + (start, length) uint64 cho mỗi chunk
+MAGIC = b'VNDICT02'
+LEGACY_MAGIC = b'VNDICT01'  # Phiên bản chưa có Bloom filter, vẫn mở được
+_LEGACY_CHUNK_NAMES = (
+    'words_offsets', 'words_blob',
+    'error_keys_offsets', 'error_keys_blob',
+    'error_values_offsets', 'error_values_blob',
+    'freq_keys_offsets', 'freq_keys_blob',
+    'freq_values',
+)
+_CHUNK_NAMES = _LEGACY_CHUNK_NAMES + ('bloom_params', 'bloom_blob')
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+_FREQUENCY_CHUNK_NAMES = ('freq_keys_offsets', 'freq_keys_blob', 'freq_values')
+FREQUENCY_MAGIC = b'VNFREQ01'
+_ALIGNMENT = 8
+# Kiểu phần tử của chunk theo hậu tố tên (mặc định uint32); *_blob giữ dạng bytes
+_CHUNK_FORMATS = (('_blob', None), ('_u8', 'B'), ('_u64', 'Q'), ('_f64', 'd'))
+_MAX_UINT32 = 0xFFFFFFFF
+
+
+def compound_key(word: str) -> str:
+    """
+    Khóa chuẩn của một từ (đơn hoặc ghép) dùng chung cho từ điển và output tokenizer
+
+    NFC, chữ thường, dấu gạch dưới của pyvi ('giáo_viên') và khoảng trắng thừa
+    đều quy về một dấu cách ('giáo viên').
+    """
+    return ' '.join(unicodedata.normalize('NFC', word).lower().replace('_', ' ').split())
+
+
+def iter_word_file(path: str) -> Iterator[str]:
+    """Đọc file danh sách từ: mỗi dòng một từ, dòng bắt đầu bằng # là chú thích"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def _pack_strings(strings: Iterable[str]) -> Tuple[bytes, array]:
+    """Nối các chuỗi thành (blob UTF-8, bảng offset uint32)"""
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = array('I', [0])
+    position = 0
+    for key in encoded:
+        position += len(key)
+        offsets.append(position)
+    return b''.join(encoded), offsets
+
+
+class StringTable:
+    """Bảng chuỗi chỉ đọc: một khối bytes UTF-8 + bảng offset (count + 1 phần tử)
+
+    ``blob`` và ``offsets`` có thể là bytes/array trong bộ nhớ hoặc memoryview
+    trỏ vào một vùng mmap.
+    """
+
+    def __init__(self, blob: bytes = b'', offsets: Optional[Sequence[int]] = None):
+        self._blob = blob
+        self._offsets = offsets if offsets is not None else array('I', [0])
+
+    def _key(self, index: int) -> bytes:
+        """Lấy bytes của phần tử thứ index"""
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._key(index).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self)):
+            yield self._key(index).decode('utf-8')
+
+    def memory_usage(self) -> int:
+        """Ước lượng số bytes dữ liệu (blob + bảng offset)"""
+        return len(self._blob) + len(self._offsets) * self._offsets.itemsize
+
+
+class _KeyView:
+    """Sequence chỉ đọc trên các khóa bytes để dùng với bisect"""
+
+    __slots__ = ('_table',)
+
+    def __init__(self, table: StringTable):
+        self._table = table
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __getitem__(self, index: int) -> bytes:
+        return self._table._key(index)
+
+
+class CompactLexicon(StringTable):
+    """Tập từ chỉ đọc, lưu gọn trong một khối bytes UTF-8 đã sắp xếp
+
+    Các từ được nối liền trong ``_blob``; ``_offsets`` (uint32, dài count + 1)
+    đánh dấu vị trí bắt đầu của từng từ. Thứ tự bytes UTF-8 trùng với thứ tự
+    code point nên có thể tìm kiếm nhị phân trực tiếp trên bytes.
+    """
+
+    def __init__(self, blob: bytes = b'', offsets: Optional[Sequence[int]] = None):
+        super().__init__(blob, offsets)
+        self._keys = _KeyView(self)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], normalize: bool = True) -> 'CompactLexicon':
+        """Tạo lexicon từ một iterable các từ (loại trùng, mặc định chuẩn hóa)"""
+        if normalize:
+            unique = {compound_key(w) for w in words if w and w.strip()}
+        else:
+            unique = set(words)
+        blob, offsets = _pack_strings(sorted(unique, key=lambda w: w.encode('utf-8')))
+        return cls(blob, offsets)
+
+    @classmethod
+    def load(cls, path: str, extra_words: Iterable[str] = ()) -> 'CompactLexicon':
+        """Tải lexicon từ file văn bản: mỗi dòng một từ, dòng bắt đầu bằng # là chú thích"""
+        def _iter_file():
+            yield from iter_word_file(path)
+            yield from extra_words
+
+        return cls.from_words(_iter_file())
+
+    def index_of(self, word: str) -> int:
+        """Vị trí của từ trong lexicon, -1 nếu không có"""
+        key = word.encode('utf-8')
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self) and self._key(index) == key:
+            return index
+        return -1
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        return self.index_of(word) >= 0
+
+    def iter_prefix(self, prefix: str) -> Iterator[str]:
+        """Liệt kê các từ bắt đầu bằng prefix (theo thứ tự từ điển)"""
+        key_prefix = prefix.encode('utf-8')
+        index = bisect.bisect_left(self._keys, key_prefix)
+        while index < len(self):
+            key = self._key(index)
+            if not key.startswith(key_prefix):
+                break
+            yield key.decode('utf-8')
+            index += 1
+
+    def words_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Lấy danh sách từ có cùng tiền tố, tối đa limit từ"""
+        result = []
+        for word in self.iter_prefix(prefix):
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(word)
+        return result
+
+
+class CompactMapping(Mapping):
+    """Mapping chỉ đọc: khóa là CompactLexicon, giá trị là StringTable hoặc mảng uint32"""
+
+    def __init__(self, keys: CompactLexicon, values: Sequence):
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, data: Dict, int_values: bool = False) -> 'CompactMapping':
+        """Tạo mapping từ dict (giữ nguyên khóa, không chuẩn hóa)"""
+        keys = CompactLexicon.from_words(data.keys(), normalize=False)
+        ordered = [data[key] for key in keys]
+        if int_values:
+            values = array('I', (min(int(v), _MAX_UINT32) for v in ordered))
+        else:
+            values = StringTable(*_pack_strings(ordered))
+        return cls(keys, values)
+
+    def __getitem__(self, key: str):
+        index = self._keys.index_of(key) if isinstance(key, str) else -1
+        if index < 0:
+            raise KeyError(key)
+        return self._values[index]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class OverlayLexicon(Set):
+    """Tập từ có thể sửa đổi, phủ lên một tập gốc không bị sửa (set/CompactLexicon/mmap)
+
+    Tập gốc không bị sao chép hay dựng lại: từ thêm vào nằm trong ``added``,
+    từ bị xóa khỏi tập gốc nằm trong ``removed``. Hai tập nhỏ này được thay
+    bằng bản sao mới mỗi lần sửa (copy-on-write) nên các thread đang duyệt
+    từ điển không bị lỗi "Set changed size during iteration".
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.added = set()
+        self.removed = set()
+
+    def __contains__(self, word: object) -> bool:
+        if word in self.added:
+            return True
+        return word not in self.removed and word in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        for word in self.base:
+            if word not in self.removed:
+                yield word
+        yield from self.added
+
+    def __len__(self) -> int:
+        return len(self.base) - len(self.removed) + len(self.added)
+
+    def add(self, word: str) -> None:
+        if word in self.base:
+            self.removed = self.removed - {word}
+        else:
+            self.added = self.added | {word}
+
+    def discard(self, word: str) -> None:
+        if word in self.added:
+            self.added = self.added - {word}
+        elif word in self.base:
+            self.removed = self.removed | {word}
+
+    def update(self, words: Iterable[str]) -> None:
+        """Thêm nhiều từ với một lần sao chép"""
+        words = set(words)
+        in_base = {word for word in words if word in self.base}
+        self.removed = self.removed - in_base
+        self.added = self.added | (words - in_base)
+
+    def words_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Lấy danh sách từ có cùng tiền tố (theo thứ tự bytes UTF-8), tối đa limit từ"""
+        if hasattr(self.base, 'iter_prefix'):
+            base_words = self.base.iter_prefix(prefix)
+        else:
+            base_words = (w for w in self.base if w.startswith(prefix))
+        matches = [w for w in base_words if w not in self.removed]
+        matches += [w for w in self.added if w.startswith(prefix)]
+        matches.sort(key=lambda w: w.encode('utf-8'))
+        return matches[:limit] if limit is not None else matches
+
+
+class LayeredLexicon(Set):
+    """Tập từ nhiều lớp chỉ đọc, không sao chép lớp nào
+
+    Lớp đầu (thường là lớp phủ nhỏ của tenant) được tra trước; tra cứu tốn
+    O(số lớp) lần tra O(1)/O(log n) của từng lớp.
+    """
+
+    def __init__(self, *layers):
+        self.layers = layers
+
+    def __contains__(self, word: object) -> bool:
+        return any(word in layer for layer in self.layers)
+
+    def __iter__(self) -> Iterator[str]:
+        for index, layer in enumerate(self.layers):
+            previous = self.layers[:index]
+            for word in layer:
+                if not any(word in other for other in previous):
+                    yield word
+
+    def __len__(self) -> int:
+        # Lớp cuối (từ điển gốc lớn) đếm bằng len(); chỉ duyệt các lớp trên (nhỏ)
+        *upper, last = self.layers
+        return len(last) + sum(1 for index, layer in enumerate(upper) for word in layer
+                               if not any(word in other for other in self.layers[index + 1:]))
+
+    def words_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Lấy danh sách từ có cùng tiền tố (theo thứ tự bytes UTF-8), tối đa limit từ"""
+        matches = set()
+        for layer in self.layers:
+            if hasattr(layer, 'words_with_prefix'):
+                matches.update(layer.words_with_prefix(prefix, limit))
+            else:
+                matches.update(w for w in layer if w.startswith(prefix))
+        matches = sorted(matches, key=lambda w: w.encode('utf-8'))
+        return matches[:limit] if limit is not None else matches
+
+
+class OverlayMapping(MutableMapping):
+    """Mapping có thể sửa đổi, phủ lên một mapping gốc không bị sửa (dict/CompactMapping)
+
+    Giống OverlayLexicon, ``updates`` và ``removed`` được sửa theo kiểu copy-on-write.
+    """
+
+    def __init__(self, base: Mapping):
+        self.base = base
+        self.updates = {}
+        self.removed = set()
+
+    def __getitem__(self, key: str):
+        if key in self.updates:
+            return self.updates[key]
+        if key in self.removed:
+            raise KeyError(key)
+        return self.base[key]
+
+    def __setitem__(self, key: str, value) -> None:
+        self.updates = {**self.updates, key: value}
+        self.removed = self.removed - {key}
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self.updates = {k: v for k, v in self.updates.items() if k != key}
+        if key in self.base:
+            self.removed = self.removed | {key}
+
+    def __contains__(self, key: object) -> bool:
+        if key in self.updates:
+            return True
+        return key not in self.removed and key in self.base
+
+    def __iter__(self) -> Iterator[str]:
+        for key in self.base:
+            if key not in self.removed and key not in self.updates:
+                yield key
+        yield from self.updates
+
+    def __len__(self) -> int:
+        new_keys = sum(1 for key in self.updates if key not in self.base)
+        return len(self.base) - len(self.removed) + new_keys
+
+
+def _check_byte_order():
+    """File nhị phân dùng byte order little-endian của máy x86/ARM"""
+    if sys.byteorder != 'little':
+        raise ValueError("Định dạng từ điển nhị phân chỉ hỗ trợ máy little-endian")
+
+
+def string_table_chunks(table: StringTable) -> List[bytes]:
+    """
+    Chuyển StringTable thành 2 chunk (offsets, blob) cho write_chunks
+
+    Đặt tên hai chunk là '<tên>_offsets', '<tên>_blob' khi đọc lại bằng map_chunks.
+    """
+    return [table._offsets.tobytes(), bytes(table._blob)]
+
+
+def write_chunks(path: str, magic: bytes, chunks: List[bytes]) -> None:
+    """
+    Ghi các chunk ra file nhị phân dạng chunk (dùng chung cho từ điển, bảng tần suất, mô hình n-gram)
+
+    File gồm magic + số chunk (uint32) + bảng (start, length) uint64 cho mỗi chunk, mỗi chunk
+    căn lề 8 bytes để map_chunks cast thẳng thành mảng số. Thứ tự chunk phải khớp danh sách
+    tên truyền cho map_chunks khi đọc lại.
+    """
+    _check_byte_order()
+    header_size = len(magic) + 4 + 16 * len(chunks)
+    position = -(-header_size // _ALIGNMENT) * _ALIGNMENT
+    layout = []
+    for chunk in chunks:
+        layout.append((position, len(chunk)))
+        position = -(-(position + len(chunk)) // _ALIGNMENT) * _ALIGNMENT
+
+    with open(path, 'wb') as f:
+        f.write(magic)
+        f.write(struct.pack('<I', len(chunks)))
+        for start, length in layout:
+            f.write(struct.pack('<QQ', start, length))
+        for (start, _), chunk in zip(layout, chunks):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(chunk)
+
+
+def map_chunks(path: str, magic: bytes, names: Sequence[str]) -> Tuple[mmap.mmap, Dict[str, memoryview]]:
+    """
+    Mở file của write_chunks bằng mmap (chỉ đọc), trả về buffer và memoryview cho từng chunk
+
+    Kiểu phần tử theo hậu tố tên chunk: *_blob giữ dạng bytes, *_u8 uint8, *_u64 uint64,
+    *_f64 float64, còn lại uint32. ValueError nếu magic hoặc số chunk không khớp. Giữ buffer
+    sống chừng nào còn dùng các memoryview.
+    """
+    _check_byte_order()
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    if buffer[:len(magic)] != magic:
+        buffer.close()
+        raise ValueError(f"File từ điển không hợp lệ: {path}")
+
+    (count,) = struct.unpack_from('<I', buffer, len(magic))
+    if count != len(names):
+        buffer.close()
+        raise ValueError(f"File từ điển có {count} chunk, cần {len(names)}")
+
+    view = memoryview(buffer)
+    chunks = {}
+    for i, name in enumerate(names):
+        start, length = struct.unpack_from('<QQ', buffer, len(magic) + 4 + 16 * i)
+        chunk = view[start:start + length]
+        fmt = next((fmt for suffix, fmt in _CHUNK_FORMATS if name.endswith(suffix)), 'I')
+        chunks[name] = chunk if fmt is None else chunk.cast(fmt)
+    return buffer, chunks
+
+
+def write_dictionary_file(path: str, words: Iterable[str], common_errors: Dict[str, str],
+                          word_frequency: Dict[str, int],
+                          false_positive_rate: float = DEFAULT_FALSE_POSITIVE_RATE) -> None:
+    """Ghi từ điển, common_errors, word_frequency và Bloom filter (từ + khóa lỗi) ra file nhị phân mmap được"""
+    lexicon = CompactLexicon.from_words(words, normalize=False)
+    errors = CompactMapping.from_dict(common_errors)
+    frequency = CompactMapping.from_dict(word_frequency, int_values=True)
+    bloom = BloomFilter.from_words(list(lexicon) + list(errors), false_positive_rate)
+    chunks = (string_table_chunks(lexicon)
+              + string_table_chunks(errors._keys) + string_table_chunks(errors._values)
+              + string_table_chunks(frequency._keys) + [frequency._values.tobytes()]
+              + [array('I', (bloom.num_bits, bloom.num_hashes)).tobytes(), bytes(bloom.bits)])
+    write_chunks(path, MAGIC, chunks)
+
+
+def open_dictionary_file(path: str) -> Tuple[mmap.mmap, CompactLexicon, CompactMapping, CompactMapping,
+                                             Optional[BloomFilter]]:
+    """Mở file từ điển nhị phân bằng mmap (không parse, không copy dữ liệu)
+
+    Returns:
+        (mmap, words, common_errors, word_frequency, bloom_filter). Các tiến trình
+        cùng mở một file sẽ dùng chung page cache của hệ điều hành. bloom_filter
+        là None với file định dạng cũ (LEGACY_MAGIC).
+    """
+    with open(path, 'rb') as f:
+        legacy = f.read(len(LEGACY_MAGIC)) == LEGACY_MAGIC
+    if legacy:
+        buffer, chunks = map_chunks(path, LEGACY_MAGIC, _LEGACY_CHUNK_NAMES)
+    else:
+        buffer, chunks = map_chunks(path, MAGIC, _CHUNK_NAMES)
+    words = CompactLexicon(chunks['words_blob'], chunks['words_offsets'])
+    common_errors = CompactMapping(
+        CompactLexicon(chunks['error_keys_blob'], chunks['error_keys_offsets']),
+        StringTable(chunks['error_values_blob'], chunks['error_values_offsets']),
+    )
+    word_frequency = CompactMapping(
+        CompactLexicon(chunks['freq_keys_blob'], chunks['freq_keys_offsets']),
+        chunks['freq_values'],
+    )
+    bloom = None
+    if not legacy:
+        num_bits, num_hashes = chunks['bloom_params']
+        bloom = BloomFilter(num_bits, num_hashes, chunks['bloom_blob'])
+    return buffer, words, common_errors, word_frequency, bloom
+
+
+def write_frequency_file(path: str, word_frequency: Dict[str, int]) -> None:
+    """Ghi bảng tần suất (từ -> số lần xuất hiện) ra file nhị phân mmap được"""
+    frequency = CompactMapping.from_dict(word_frequency, int_values=True)
+    write_chunks(path, FREQUENCY_MAGIC,
+                  string_table_chunks(frequency._keys) + [frequency._values.tobytes()])
+
+
+def open_frequency_file(path: str) -> Tuple[mmap.mmap, CompactMapping]:
+    """Mở bảng tần suất nhị phân bằng mmap"""
+    buffer, chunks = map_chunks(path, FREQUENCY_MAGIC, _FREQUENCY_CHUNK_NAMES)
+    word_frequency = CompactMapping(
+        CompactLexicon(chunks['freq_keys_blob'], chunks['freq_keys_offsets']),
+        chunks['freq_values'],
+    )
+    return buffer, word_frequency
+
+
+if __name__ == '__main__':
+    from vietnamese_dictionary import VietnameseDictionary
+
+    parser = argparse.ArgumentParser(description='Build binary (mmap) Vietnamese dictionary file')
+    parser.add_argument('--output', type=str, required=True, help='Đường dẫn file nhị phân đầu ra')
+    parser.add_argument('--lexicon', type=str, help='File lexicon văn bản (mỗi dòng một từ)')
+    args = parser.parse_args()
+
+    dictionary = VietnameseDictionary(lexicon_path=args.lexicon)
+    dictionary.save(args.output)
+    print(f"✅ Đã ghi {len(dictionary.words):,} từ vào {args.output}")
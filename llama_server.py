@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Llama Server Manager for Vietnamese Spell Checker
+Quản lý tiến trình llama-server: chờ sẵn sàng bằng cách hỏi /health với backoff lũy thừa (thời gian
+khởi động bằng đúng thời gian nạp model), ghi log ra file (không dùng pipe) và tự khởi động lại khi crash
+"""
+
+import os
+import subprocess
+import threading
+import time
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from config import Config
+from llm_client import LLMClient
+
+# Khoảng hỏi /health lúc chờ server: bắt đầu nhỏ, nhân đôi tới mức trần
+POLL_INITIAL_DELAY = 0.05
+POLL_MAX_DELAY = 1.0
+
+# Chạy ổn định quá ngần này giây thì bộ đếm crash liên tiếp được đặt lại
+STABLE_UPTIME = 60.0
+
+
+class LlamaServerError(RuntimeError):
+    """llama-server không khởi động được (thoát sớm hoặc quá thời gian chờ)"""
+
+
+class LlamaServer:
+    """
+    Tiến trình llama-server được quản lý
+
+    start() chạy server rồi hỏi /health (llama-server trả 503 trong lúc nạp
+    model) với khoảng chờ tăng gấp đôi cho tới khi server sẵn sàng, server
+    thoát hoặc quá startup_timeout. stdout/stderr được ghi thẳng vào log_path
+    nên tiến trình con không bao giờ bị chặn vì pipe đầy. Một thread theo dõi
+    khởi động lại server khi nó thoát ngoài ý muốn (chờ restart_backoff * 2^lần
+    giữa các lần crash liên tiếp, tối đa max_restarts lần).
+
+    Có poll()/terminate()/wait() như subprocess.Popen để dùng thay cho tiến
+    trình con ở các chỗ cũ.
+    """
+
+    def __init__(self, model_path: str, server_url: str = 'http://localhost:8080',
+                 binary: str = Config.LLAMA_SERVER_PATH, log_path: str = Config.LLAMA_SERVER_LOG,
+                 ctx_size: int = Config.LLAMA_CTX_SIZE, startup_timeout: float = Config.LLAMA_STARTUP_TIMEOUT,
+                 max_restarts: int = Config.LLAMA_MAX_RESTARTS, restart_backoff: float = 1.0,
+                 max_restart_delay: float = 30.0):
+        self.model_path = model_path
+        self.server_url = server_url
+        self.binary = binary
+        self.log_path = log_path
+        self.ctx_size = ctx_size
+        self.startup_timeout = startup_timeout
+        self.max_restarts = max_restarts
+        self.restart_backoff = restart_backoff
+        self.max_restart_delay = max_restart_delay
+        self.client = LLMClient(server_url)
+        self.process: Optional[subprocess.Popen] = None
+        self.restarts = 0
+        self.startup_time = 0.0
+        self._started_at = 0.0
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._monitor_thread: Optional[threading.Thread] = None
+
+    def command(self) -> List[str]:
+        port = urlparse(self.server_url).port or 8080
+        return [self.binary, '-m', self.model_path, '--host', '0.0.0.0',
+                '--port', str(port), '--ctx-size', str(self.ctx_size)]
+
+    def start(self) -> 'LlamaServer':
+        """Chạy server và chờ tới khi /health sẵn sàng; LlamaServerError nếu không khởi động được"""
+        self._stopping.clear()
+        self._launch()
+        try:
+            self.wait_ready()
+        except LlamaServerError:
+            self.terminate()
+            raise
+        self._monitor_thread = threading.Thread(target=self._monitor, name='llama-server-monitor', daemon=True)
+        self._monitor_thread.start()
+        return self
+
+    def wait_ready(self) -> float:
+        """Hỏi /health với backoff lũy thừa cho tới khi sẵn sàng; trả về thời gian khởi động (giây)"""
+        deadline = self._started_at + self.startup_timeout
+        delay = POLL_INITIAL_DELAY
+        while True:
+            if self.client.health(timeout=max(delay, 0.5)):
+                self.startup_time = time.monotonic() - self._started_at
+                return self.startup_time
+            code = self.process.poll()
+            if code is not None:
+                raise LlamaServerError(f'llama-server thoát với mã {code} khi đang khởi động (xem {self.log_path})')
+            if time.monotonic() + delay > deadline:
+                raise LlamaServerError(f'llama-server chưa sẵn sàng sau {self.startup_timeout:g}s '
+                                       f'(xem {self.log_path})')
+            time.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY)
+
+    def poll(self) -> Optional[int]:
+        return self.process.poll() if self.process else None
+
+    def terminate(self, timeout: float = 10.0) -> None:
+        """Dừng server (không khởi động lại nữa); kill nếu không thoát sau timeout giây"""
+        with self._lock:
+            self._stopping.set()
+            process = self.process
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        if self._monitor_thread is not None and self._monitor_thread is not threading.current_thread():
+            self._monitor_thread.join(timeout)
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[int]:
+        return self.process.wait(timeout) if self.process else None
+
+    def _launch(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.log_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.log_path, 'ab') as log:
+            self.process = subprocess.Popen(self.command(), stdin=subprocess.DEVNULL,
+                                            stdout=log, stderr=subprocess.STDOUT)
+        self._started_at = time.monotonic()
+
+    def _monitor(self) -> None:
+        """Khởi động lại server khi nó thoát ngoài ý muốn"""
+        crashes = 0
+        while not self._stopping.is_set():
+            code = self.process.wait()
+            if self._stopping.is_set():
+                return
+            crashes = 1 if time.monotonic() - self._started_at > STABLE_UPTIME else crashes + 1
+            if crashes > self.max_restarts:
+                print(f'❌ llama-server crash {crashes} lần liên tiếp, không khởi động lại (xem {self.log_path})')
+                return
+            delay = min(self.restart_backoff * 2 ** (crashes - 1), self.max_restart_delay)
+            print(f'⚠️ llama-server thoát với mã {code}, khởi động lại sau {delay:g}s')
+            if self._stopping.wait(delay):
+                return
+            with self._lock:
+                if self._stopping.is_set():
+                    return
+                self._launch()
+            self.restarts += 1
+            try:
+                self.wait_ready()
+                print(f'✅ llama-server đã khởi động lại ({self.startup_time:.1f}s)')
+            except LlamaServerError as e:
+                print(f'❌ {e}')
+                if self.process.poll() is None:
+                    self.process.kill()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Cache for Vietnamese Spell Checker
+Cache trên đĩa (SQLite) cho câu trả lời của llama-server: kết luận đúng/sai và gợi ý theo
+phiên bản prompt + từ + ngữ cảnh đã chuẩn hóa; có TTL, giới hạn kích thước, sống qua khởi
+động lại và dùng chung giữa các tiến trình worker trên một máy
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, Optional
+
+from config import Config
+
+WHITESPACE = re.compile(r'\s+')
+
+# Số lần ghi giữa hai lần dọn (xóa mục hết hạn, cắt về max_entries)
+PRUNE_INTERVAL = 256
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS llm_cache_created ON llm_cache (created);
+'''
+
+
+def normalize(text: str) -> str:
+    """Chuẩn hóa từ/ngữ cảnh cho khóa cache (NFC, chữ thường, gộp khoảng trắng, '_' của pyvi = ' ')"""
+    return WHITESPACE.sub(' ', unicodedata.normalize('NFC', text).replace('_', ' ').lower()).strip()
+
+
+class LLMCache:
+    """
+    Cache câu trả lời LLM trên SQLite
+
+    Khóa là hash của (loại prompt, phiên bản prompt, từ, ngữ cảnh) đã chuẩn hóa,
+    nên đổi nội dung prompt chỉ cần tăng phiên bản là các câu trả lời cũ không
+    còn được dùng. File mở ở chế độ WAL (nhiều tiến trình đọc song song, ghi
+    không chặn đọc); mỗi thread dùng một kết nối riêng. Mục quá ttl giây bị bỏ
+    qua khi đọc; cứ PRUNE_INTERVAL lần ghi thì xóa mục hết hạn và các mục cũ
+    nhất vượt quá max_entries.
+    """
+
+    def __init__(self, path: str, ttl: float = Config.LLM_CACHE_TTL,
+                 max_entries: int = Config.LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._writes = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    @staticmethod
+    def key(kind: str, version: int, word: str, context: str = '') -> str:
+        content = f'{kind}\x1f{version}\x1f{normalize(word)}\x1f{normalize(context)}'
+        return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+    def get(self, kind: str, version: int, word: str, context: str = '') -> Optional[Any]:
+        """Câu trả lời đã cache (None nếu chưa có hoặc đã hết hạn)"""
+        row = self._connection().execute(
+            'SELECT value FROM llm_cache WHERE key = ? AND expires > ?',
+            (self.key(kind, version, word, context), time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, kind: str, version: int, word: str, value: Any, context: str = '') -> None:
+        self.set_many(kind, version, {word: value}, {word: context} if context else None)
+
+    def set_many(self, kind: str, version: int, values: Dict[str, Any],
+                 contexts: Optional[Dict[str, str]] = None) -> None:
+        """Ghi nhiều câu trả lời trong một transaction (contexts: từ -> ngữ cảnh)"""
+        if not values:
+            return
+        now = time.time()
+        contexts = contexts or {}
+        rows = [(self.key(kind, version, word, contexts.get(word, '')), json.dumps(value, ensure_ascii=False),
+                 now, now + self.ttl) for word, value in values.items()]
+        connection = self._connection()
+        with connection:
+            connection.executemany('INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?)', rows)
+        with self._lock:
+            self._writes += len(rows)
+            prune = self._writes >= PRUNE_INTERVAL
+            if prune:
+                self._writes = 0
+        if prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """Xóa mục hết hạn và các mục cũ nhất vượt quá max_entries; trả về số mục đã xóa"""
+        connection = self._connection()
+        with connection:
+            removed = connection.execute('DELETE FROM llm_cache WHERE expires <= ?', (time.time(),)).rowcount
+            excess = len(self) - self.max_entries
+            if excess > 0:
+                removed += connection.execute(
+                    'DELETE FROM llm_cache WHERE key IN '
+                    '(SELECT key FROM llm_cache ORDER BY created LIMIT ?)', (excess,)).rowcount
+        return removed
+
+    def clear(self) -> None:
+        connection = self._connection()
+        with connection:
+            connection.execute('DELETE FROM llm_cache')
+
+    def __len__(self) -> int:
+        return self._connection().execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+        return connection
+
+
+# Tạo instance global (None nếu chưa cấu hình LLM_CACHE_PATH)
+llm_cache: Optional[LLMCache] = LLMCache(Config.LLM_CACHE_PATH) if Config.LLM_CACHE_PATH else None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+LLM Client for Vietnamese Spell Checker
+Lớp gọi llama-server dùng chung: session keep-alive (connection pool) cho caller đồng bộ, client asyncio
+cho caller đồng thời; giới hạn số request đồng thời, deadline cho mỗi lần gọi và retry có jitter
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+
+# Mã HTTP đáng thử lại (server quá tải/đang khởi động)
+RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+class LLMError(Exception):
+    """Gọi llama-server thất bại (hết deadline, hết lượt thử lại hoặc lỗi không thử lại được)"""
+
+
+class _RetryableError(Exception):
+    """Lỗi tạm thời của một lần gửi (mất kết nối, timeout, HTTP 429/5xx)"""
+
+
+class LLMClient:
+    """
+    Client đồng bộ cho llama-server
+
+    Mọi lần gọi dùng chung một requests.Session (connection pool keep-alive,
+    pool_maxsize = max_concurrency) thay vì mở kết nối TCP mới mỗi lần. Số
+    request đang bay bị chặn bởi semaphore; timeout là deadline của cả lần gọi
+    (kể cả các lần thử lại), mỗi lần gửi chỉ được phần thời gian còn lại. Lỗi
+    tạm thời được thử lại sau khoảng chờ ngẫu nhiên trong [0, backoff * 2^lần)
+    (full jitter) để các worker không dồn lại cùng lúc.
+    """
+
+    def __init__(self, server_url: str, max_concurrency: int = Config.LLM_MAX_CONCURRENCY,
+                 timeout: float = Config.LLM_TIMEOUT, retries: int = Config.LLM_RETRIES,
+                 backoff: float = Config.LLM_RETRY_BACKOFF):
+        self.server_url = server_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def complete(self, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """POST /completion, trả về JSON của server (timeout: deadline tính bằng giây)"""
+        return self.request('POST', '/completion', payload, timeout)
+
+    def health(self, timeout: float = 2.0) -> bool:
+        """Server đã sẵn sàng (GET /health trả 200), không thử lại"""
+        try:
+            return self.session.get(f'{self.server_url}/health', timeout=timeout).status_code == 200
+        except requests.RequestException:
+            return False
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None,
+                timeout: Optional[float] = None) -> Dict:
+        """Gửi một request, thử lại lỗi tạm thời cho tới deadline"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._slots.acquire(timeout=remaining):
+                raise LLMError(f'Hết deadline khi gọi {path}')
+            try:
+                return self._send(method, path, payload, deadline - time.monotonic())
+            except _RetryableError as error:
+                attempt += 1
+                delay = self.retry_delay(attempt, error, deadline - time.monotonic())
+            finally:
+                self._slots.release()
+            time.sleep(delay)
+
+    def retry_delay(self, attempt: int, error: Exception, remaining: float) -> float:
+        """Khoảng chờ trước lần thử thứ attempt + 1 (full jitter); LLMError nếu không còn được thử"""
+        delay = random.uniform(0, self.backoff * 2 ** (attempt - 1))
+        if attempt > self.retries or delay >= remaining:
+            raise LLMError(f'{error} (sau {attempt} lần gửi)') from error
+        return delay
+
+    def _send(self, method: str, path: str, payload: Optional[Dict], timeout: float) -> Dict:
+        """Một lần gửi; _RetryableError cho lỗi tạm thời, LLMError cho lỗi còn lại"""
+        if timeout <= 0:
+            raise LLMError(f'Hết deadline khi gọi {path}')
+        try:
+            response = self.session.request(method, f'{self.server_url}{path}', json=payload, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as error:
+            raise _RetryableError(f'Không gọi được {path}: {error}') from error
+        if response.status_code in RETRY_STATUS:
+            raise _RetryableError(f'{path} trả về HTTP {response.status_code}')
+        if response.status_code != 200:
+            raise LLMError(f'{path} trả về HTTP {response.status_code}')
+        try:
+            return response.json()
+        except ValueError as error:
+            raise LLMError(f'{path} trả về JSON không hợp lệ') from error
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class AsyncLLMClient:
+    """
+    Client asyncio cho caller cần chồng nhiều lần gọi LLM lên nhau
+
+    Mỗi lần gọi chạy LLMClient.request trong thread pool riêng (requests là
+    I/O chặn) nên event loop vẫn làm việc khác trong lúc chờ. Session/pool,
+    semaphore giới hạn request đồng thời và chính sách thử lại là của LLMClient,
+    nên caller đồng bộ và async cộng lại cũng không vượt max_concurrency của
+    client; deadline áp thêm bằng asyncio.wait_for (tính cả lúc chờ thread).
+    """
+
+    def __init__(self, client: LLMClient, max_concurrency: Optional[int] = None):
+        self.client = client
+        self.max_concurrency = max_concurrency or client.max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='llm')
+
+    async def complete(self, payload: Dict, timeout: Optional[float] = None) -> Dict:
+        """POST /completion (bản async của LLMClient.complete)"""
+        return await self.request('POST', '/completion', payload, timeout)
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None,
+                      timeout: Optional[float] = None) -> Dict:
+        timeout = self.client.timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        send = loop.run_in_executor(self._executor, self.client.request, method, path, payload, timeout)
+        try:
+            return await asyncio.wait_for(send, max(timeout, 0))
+        except asyncio.TimeoutError as error:
+            raise LLMError(f'Hết deadline khi gọi {path}') from error
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
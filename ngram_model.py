@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Compact N-gram Language Model for Vietnamese Spell Checker
+Mô hình ngôn ngữ bigram/trigram gọn (ID số nguyên, mảng đã sắp xếp, log-prob lượng tử hóa 8 bit)
+dùng để xếp hạng gợi ý sửa lỗi theo các từ xung quanh
+"""
+
+import argparse
+import bisect
+import math
+import os
+import re
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from multiprocessing import Pool
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from build_frequency import DEFAULT_CHUNK_MB, DEFAULT_MAX_ENTRIES, TOKEN_PATTERN, BoundedCounter, \
+    iter_chunk_lines, plan_chunks
+from config import Config
+from lexicon_store import CompactLexicon, compound_key, map_chunks, string_table_chunks, write_chunks
+
+LM_MAGIC = b'VNLM0001'
+_LM_CHUNK_NAMES = (
+    'vocab_offsets', 'vocab_blob',
+    'unigrams_u8', 'bigram_keys_u64', 'bigrams_u8', 'trigram_keys_u64', 'trigrams_u8',
+    'floors_f64',
+)
+
+SENTENCE_START = '<s>'
+SENTENCE_END = '</s>'
+NUMBER_TOKEN = '<num>'
+
+# ID được đóng gói 21 bit mỗi token trong khóa uint64 của bigram/trigram
+ID_BITS = 21
+MAX_VOCABULARY = (1 << ID_BITS) - 1
+
+# Stupid backoff (Brants et al. 2007): mỗi lần lùi về bậc thấp hơn nhân 0.4
+BACKOFF_LOGPROB = math.log10(0.4)
+MIN_LOGPROB = -20.0
+
+_SENTENCE_SPLIT = re.compile(r'[.!?;:…]+')
+
+
+def sentence_tokens(line: str) -> List[List[str]]:
+    """Tách một dòng corpus thành các câu, mỗi câu là danh sách âm tiết chữ thường (số -> <num>)"""
+    sentences = []
+    for part in _SENTENCE_SPLIT.split(unicodedata.normalize('NFC', line).lower()):
+        tokens = [NUMBER_TOKEN if token.isdigit() else token for token in TOKEN_PATTERN.findall(part)]
+        if tokens:
+            sentences.append(tokens)
+    return sentences
+
+
+def syllables(words: Iterable[str]) -> List[str]:
+    """Tách các từ (từ ghép pyvi 'giáo_viên', cụm 'khó khăn', có dấu câu) thành âm tiết như lúc huấn luyện"""
+    tokens = []
+    for word in words:
+        for token in TOKEN_PATTERN.findall(compound_key(word).replace('_', ' ')):
+            tokens.append(NUMBER_TOKEN if token.isdigit() else token)
+    return tokens
+
+
+def count_ngrams(sentences: Iterable[List[str]]) -> Tuple[Counter, Counter, Counter]:
+    """Đếm unigram/bigram/trigram (có <s>, </s> ở hai đầu câu)"""
+    unigrams, bigrams, trigrams = Counter(), Counter(), Counter()
+    for tokens in sentences:
+        padded = [SENTENCE_START] + tokens + [SENTENCE_END]
+        unigrams.update(padded)
+        bigrams.update(zip(padded, padded[1:]))
+        trigrams.update(zip(padded, padded[1:], padded[2:]))
+    return unigrams, bigrams, trigrams
+
+
+def _quantize(logprobs: Sequence[float], floor: float) -> array:
+    """Lượng tử hóa tuyến tính log-prob trong [floor, 0] về 0..255"""
+    scale = 255 / -floor if floor < 0 else 0
+    return array('B', (min(255, max(0, round((lp - floor) * scale))) for lp in logprobs))
+
+
+def _dequantize_table(floor: float) -> List[float]:
+    """Bảng giải lượng tử 256 giá trị"""
+    return [floor - floor * q / 255 for q in range(256)]
+
+
+class NgramLanguageModel:
+    """
+    Mô hình bigram/trigram dạng gọn, chỉ đọc
+
+    - Từ vựng là CompactLexicon; ID của token là vị trí trong lexicon
+    - Khóa bigram/trigram là các ID đóng gói vào uint64 (21 bit mỗi ID), lưu
+      trong mảng đã sắp xếp và tra bằng bisect
+    - Log10-prob của mỗi mục lượng tử hóa 8 bit (1 byte); mỗi bigram/trigram
+      tốn 9 bytes
+    - Xác suất dùng stupid backoff, đủ để so sánh các ứng viên với nhau
+    """
+
+    def __init__(self, vocabulary: CompactLexicon, unigrams: Sequence[int],
+                 bigram_keys: Sequence[int], bigrams: Sequence[int],
+                 trigram_keys: Sequence[int], trigrams: Sequence[int], floors: Sequence[float]):
+        self.vocabulary = vocabulary
+        self.unigrams = unigrams
+        self.bigram_keys = bigram_keys
+        self.bigrams = bigrams
+        self.trigram_keys = trigram_keys
+        self.trigrams = trigrams
+        self.floors = floors
+        self._unigram_values = _dequantize_table(floors[0])
+        self._bigram_values = _dequantize_table(floors[1])
+        self._trigram_values = _dequantize_table(floors[2])
+        # Token chưa biết: thấp hơn mọi unigram đã biết
+        self.unknown_logprob = floors[0] + BACKOFF_LOGPROB
+        self._ids: Dict[str, int] = {}
+        self._mmap = None
+
+    @classmethod
+    def from_counts(cls, unigrams: Counter, bigrams: Counter, trigrams: Counter,
+                    min_count: int = 1) -> 'NgramLanguageModel':
+        """Tạo mô hình từ các bộ đếm (bỏ n-gram xuất hiện ít hơn min_count)"""
+        kept = [w for w, c in unigrams.items() if c >= min_count or w in (SENTENCE_START, SENTENCE_END)]
+        if len(kept) > MAX_VOCABULARY:
+            kept = sorted(kept, key=lambda w: unigrams[w], reverse=True)[:MAX_VOCABULARY]
+        vocabulary = CompactLexicon.from_words(kept, normalize=False)
+        ids = {word: i for i, word in enumerate(vocabulary)}
+
+        total = sum(unigrams[w] for w in vocabulary)
+        unigram_lp = [max(MIN_LOGPROB, math.log10(unigrams[w] / total)) for w in vocabulary]
+
+        # Số lần làm ngữ cảnh (history) của mỗi token/cặp token
+        history1, history2 = Counter(), Counter()
+        for (v, _), count in bigrams.items():
+            history1[v] += count
+        for (u, v, _), count in trigrams.items():
+            history2[(u, v)] += count
+
+        bigram_entries = sorted(
+            ((ids[v] << ID_BITS) | ids[w], math.log10(count / history1[v]))
+            for (v, w), count in bigrams.items()
+            if count >= min_count and v in ids and w in ids
+        )
+        trigram_entries = sorted(
+            ((((ids[u] << ID_BITS) | ids[v]) << ID_BITS) | ids[w], math.log10(count / history2[(u, v)]))
+            for (u, v, w), count in trigrams.items()
+            if count >= min_count and u in ids and v in ids and w in ids
+        )
+
+        floors = array('d', [
+            min(unigram_lp, default=MIN_LOGPROB),
+            max(MIN_LOGPROB, min((lp for _, lp in bigram_entries), default=MIN_LOGPROB)),
+            max(MIN_LOGPROB, min((lp for _, lp in trigram_entries), default=MIN_LOGPROB)),
+        ])
+        return cls(
+            vocabulary,
+            _quantize(unigram_lp, floors[0]),
+            array('Q', (key for key, _ in bigram_entries)),
+            _quantize([lp for _, lp in bigram_entries], floors[1]),
+            array('Q', (key for key, _ in trigram_entries)),
+            _quantize([lp for _, lp in trigram_entries], floors[2]),
+            floors,
+        )
+
+    @classmethod
+    def train(cls, sentences: Iterable[List[str]], min_count: int = 1) -> 'NgramLanguageModel':
+        """Huấn luyện trong bộ nhớ từ các câu đã tách âm tiết (dùng cho corpus nhỏ/test)"""
+        return cls.from_counts(*count_ngrams(sentences), min_count=min_count)
+
+    def save(self, path: str) -> None:
+        """Ghi mô hình ra file nhị phân (mở lại bằng load(), qua mmap)"""
+        write_chunks(path, LM_MAGIC, string_table_chunks(self.vocabulary) + [
+            bytes(self.unigrams), array('Q', self.bigram_keys).tobytes(), bytes(self.bigrams),
+            array('Q', self.trigram_keys).tobytes(), bytes(self.trigrams), array('d', self.floors).tobytes(),
+        ])
+
+    @classmethod
+    def load(cls, path: str) -> 'NgramLanguageModel':
+        """Mở mô hình bằng mmap (không parse, các worker dùng chung page cache)"""
+        buffer, chunks = map_chunks(path, LM_MAGIC, _LM_CHUNK_NAMES)
+        model = cls(
+            CompactLexicon(chunks['vocab_blob'], chunks['vocab_offsets']),
+            chunks['unigrams_u8'], chunks['bigram_keys_u64'], chunks['bigrams_u8'],
+            chunks['trigram_keys_u64'], chunks['trigrams_u8'], chunks['floors_f64'],
+        )
+        model._mmap = buffer
+        return model
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Số bytes của từng phần dữ liệu"""
+        usage = {
+            'vocabulary': self.vocabulary.memory_usage(),
+            'unigrams': len(self.unigrams),
+            'bigrams': len(self.bigram_keys) * 8 + len(self.bigrams),
+            'trigrams': len(self.trigram_keys) * 8 + len(self.trigrams),
+        }
+        usage['total'] = sum(usage.values())
+        return usage
+
+    def token_id(self, token: str) -> int:
+        """ID của token, -1 nếu ngoài từ vựng (có cache cho các token hay gặp)"""
+        token_id = self._ids.get(token)
+        if token_id is None:
+            token_id = self.vocabulary.index_of(token)
+            if len(self._ids) >= 65536:
+                self._ids.clear()
+            self._ids[token] = token_id
+        return token_id
+
+    @staticmethod
+    def _find(keys: Sequence[int], key: int) -> int:
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index
+        return -1
+
+    def logprob_ids(self, u: int, v: int, w: int) -> float:
+        """log10 S(w | u v) theo stupid backoff; u, v có thể là -1 (không có/ngoài từ vựng)"""
+        if w < 0:
+            return self.unknown_logprob
+        penalty = 0.0
+        if u >= 0 and v >= 0:
+            index = self._find(self.trigram_keys, (((u << ID_BITS) | v) << ID_BITS) | w)
+            if index >= 0:
+                return self._trigram_values[self.trigrams[index]]
+            penalty += BACKOFF_LOGPROB
+        if v >= 0:
+            index = self._find(self.bigram_keys, (v << ID_BITS) | w)
+            if index >= 0:
+                return penalty + self._bigram_values[self.bigrams[index]]
+            penalty += BACKOFF_LOGPROB
+        return penalty + self._unigram_values[self.unigrams[w]]
+
+    def logprob(self, token: str, history: Sequence[str] = ()) -> float:
+        """log10 xác suất (stupid backoff) của token sau history (tối đa 2 token cuối được dùng)"""
+        history = list(history)[-2:]
+        ids = [-1] * (2 - len(history)) + [self.token_id(t) for t in history]
+        return self.logprob_ids(ids[0], ids[1], self.token_id(token))
+
+    def score(self, tokens: Sequence[str], start: int = 0) -> float:
+        """Tổng log10-prob của tokens[start:] (các token trước start chỉ làm ngữ cảnh)"""
+        ids = [self.token_id(token) for token in tokens]
+        total = 0.0
+        for i in range(start, len(ids)):
+            u = ids[i - 2] if i >= 2 else -1
+            v = ids[i - 1] if i >= 1 else -1
+            total += self.logprob_ids(u, v, ids[i])
+        return total
+
+    def rank(self, candidates: Sequence[str], left_words: Sequence[str],
+             right_words: Sequence[str]) -> List[str]:
+        """
+        Xếp hạng ứng viên sửa lỗi theo các từ xung quanh
+
+        Args:
+            candidates: Các ứng viên (có thể nhiều âm tiết, ví dụ 'khó khăn')
+            left_words: Các từ đứng trước (chỉ 2 âm tiết cuối được dùng; ít hơn thì coi như đầu câu)
+            right_words: Các từ đứng sau (chỉ 2 âm tiết đầu được dùng; ít hơn thì coi như cuối câu)
+
+        Returns:
+            Ứng viên theo thứ tự điểm giảm dần (bằng điểm thì giữ thứ tự cũ)
+        """
+        left = ([SENTENCE_START] + syllables(left_words))[-2:]
+        right = (syllables(right_words) + [SENTENCE_END])[:2]
+
+        scores = {}
+        for candidate in candidates:
+            if candidate not in scores:
+                scores[candidate] = self.score(left + syllables([candidate]) + right, start=len(left))
+        return sorted(candidates, key=lambda candidate: -scores[candidate])
+
+
+def _count_chunk(args: Tuple[str, int, int, int]) -> Tuple[Counter, Counter, Counter]:
+    """Đếm n-gram trong một đoạn corpus (chạy trong worker)"""
+    path, start, end, max_entries = args
+    counters = [BoundedCounter(max_entries) for _ in range(3)]
+    for line in iter_chunk_lines(path, start, end):
+        for counter, counts in zip(counters, count_ngrams(sentence_tokens(line))):
+            counter.merge(counts)
+    return tuple(counter.counts for counter in counters)
+
+
+def train_language_model(paths: List[str], output: str, workers: int = os.cpu_count() or 1,
+                         chunk_mb: int = DEFAULT_CHUNK_MB, max_entries: int = DEFAULT_MAX_ENTRIES,
+                         min_count: int = 2, verbose: bool = True) -> NgramLanguageModel:
+    """Huấn luyện mô hình từ các file corpus văn bản (mỗi dòng một hoặc nhiều câu) và ghi ra output"""
+    tasks = [(path, start, end, max_entries)
+             for path, start, end in plan_chunks(paths, chunk_mb * 1024 * 1024)]
+    merged = [BoundedCounter(max_entries) for _ in range(3)]
+    start_time = time.time()
+    with Pool(processes=workers) as pool:
+        for done, counts in enumerate(pool.imap_unordered(_count_chunk, tasks), 1):
+            for counter, chunk_counts in zip(merged, counts):
+                counter.merge(chunk_counts)
+            if verbose:
+                print(f"📊 {done}/{len(tasks)} đoạn, {time.time() - start_time:.1f}s, "
+                      f"{len(merged[1].counts):,} bigram, {len(merged[2].counts):,} trigram")
+
+    model = NgramLanguageModel.from_counts(*(counter.counts for counter in merged), min_count=min_count)
+    model.save(output)
+    if verbose:
+        usage = model.memory_usage()
+        print(f"✅ Đã ghi {output}: {len(model.vocabulary):,} token, {len(model.bigram_keys):,} bigram, "
+              f"{len(model.trigram_keys):,} trigram, {usage['total'] / 1024 / 1024:.1f}MB")
+    return model
+
+
+# Tạo instance global (None nếu chưa cấu hình LANGUAGE_MODEL_PATH)
+language_model: Optional[NgramLanguageModel] = (
+    NgramLanguageModel.load(Config.LANGUAGE_MODEL_PATH) if Config.LANGUAGE_MODEL_PATH else None
+)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train a compact bigram/trigram language model')
+    parser.add_argument('corpus', nargs='+', help='File corpus văn bản (UTF-8)')
+    parser.add_argument('--output', type=str, required=True, help='File mô hình nhị phân đầu ra')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Số tiến trình')
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_MB, help='Kích thước mỗi đoạn (MB)')
+    parser.add_argument('--max-entries', type=int, default=DEFAULT_MAX_ENTRIES,
+                        help='Số n-gram tối đa giữ trong bộ nhớ mỗi bậc, mỗi tiến trình')
+    parser.add_argument('--min-count', type=int, default=2, help='Bỏ n-gram xuất hiện ít hơn')
+    args = parser.parse_args()
+
+    train_language_model(args.corpus, args.output, workers=args.workers, chunk_mb=args.chunk_mb,
+                         max_entries=args.max_entries, min_count=args.min_count)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Profile context analysis in categorized check_text
+Đo phần thời gian check_text dành cho phân tích ngữ cảnh: tính toàn bộ (eager) so với lazy
+"""
+
+import argparse
+import cProfile
+import logging
+import pstats
+import random
+
+from benchmark_ngram import generate_corpus
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from context_features import context_extractor
+from test_data_generator import TestDataGenerator
+from test_real_data import REAL_TEST_CASES
+
+
+class EagerExtractor:
+    """Tính mọi đặc trưng ngay khi tạo context (cách làm trước khi có LazyContext)"""
+
+    def extract(self, text, words, masks=None):
+        return dict(context_extractor.extract(text, words, masks))
+
+
+def generate_texts(num_texts: int):
+    """Câu thực tế + câu sinh có lỗi + câu đúng"""
+    random.seed(0)
+    generator = TestDataGenerator()
+    categories = list(generator.natural_sentences)
+    with_errors = [generator.generate_natural_sentence(random.choice(categories), 0.3)['original']
+                   for _ in range(num_texts // 2)]
+    return list(REAL_TEST_CASES) + with_errors + generate_corpus(num_texts // 2, seed=1)
+
+
+def profile(checker, texts, label: str, verbose: bool = True):
+    """Profile check_text trên các câu, trả về danh sách lỗi tìm được của từng câu"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    results = [checker.check_text(text) for text in texts]
+    profiler.disable()
+    # check_text bắt mọi exception: kết quả lỗi nghĩa là đang đo nhánh exception, số đo vô nghĩa
+    failed = [result['error'] for result in results if 'error' in result]
+    if failed:
+        raise RuntimeError(f"{label}: check_text lỗi trên {len(failed)} câu: {failed[0]}")
+    errors = [result['errors'] for result in results]
+    if not verbose:
+        return errors
+
+    stats = pstats.Stats(profiler).stats
+    total = next(cumulative for (_, _, name), (_, _, _, cumulative, _) in stats.items() if name == 'check_text')
+    # Thời gian tự thân của mọi hàm trong context_features (gồm cả lúc đặc trưng được đọc muộn)
+    context = sum(own for (path, _, _), (_, _, own, _, _) in stats.items() if path.endswith('context_features.py'))
+    print(f"{label:<8} check_text {total / len(texts) * 1e3:6.2f} ms/câu, ngữ cảnh "
+          f"{context / len(texts) * 1e6:6.1f} µs/câu ({context / total:.2%})")
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Profile context analysis in categorized check_text')
+    parser.add_argument('--texts', type=int, default=400, help='Số câu sinh thêm')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    texts = generate_texts(args.texts)
+    checker = CategorizedVietnameseSpellChecker()
+    for text in texts:
+        checker.check_text(text)  # Làm nóng pyvi và cache của từ điển
+
+    checker.context_extractor = EagerExtractor()
+    eager_errors = profile(checker, texts, 'Eager')
+    checker.context_extractor = context_extractor
+    lazy_errors = profile(checker, texts, 'Lazy')
+    print(f"Kết quả giống nhau: {eager_errors == lazy_errors}")
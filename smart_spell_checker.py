@@ -10,6 +10,9 @@ import re
 import time
 from typing import List, Dict, Tuple
 from vietnamese_dictionary import vietnamese_dict
+from ngram_model import language_model
+from syllable_validator import syllable_validator
+from token_classes import SKIP_CLASSES, token_classifier
 from pyvi import ViTokenizer, ViPosTagger
 
 class SmartVietnameseSpellChecker:
@@ -17,6 +20,7 @@ class SmartVietnameseSpellChecker:
     
     def __init__(self):
         self.vietnamese_dict = vietnamese_dict
+        self.language_model = language_model
         self.error_patterns = self._load_smart_error_patterns()
         self.context_rules = self._load_context_rules()
     
@@ -119,6 +123,8 @@ class SmartVietnameseSpellChecker:
             
             # Tách từ
             words = ViTokenizer.tokenize(normalized_text).split()
+            # Nhãn lớp token (viết tắt, số, URL/email, từ nước ngoài...) một lượt cho cả request
+            token_classes = token_classifier.classify(normalized_text, words).classes
             
             # Kiểm tra từng từ với context
             errors = []
@@ -131,7 +137,7 @@ class SmartVietnameseSpellChecker:
                     continue
                 
                 # Kiểm tra context
-                if self._should_skip_word(clean_word, words, i):
+                if self._should_skip_word(clean_word, words, i, token_classes[i]):
                     continue
                 
                 # Kiểm tra chính tả
@@ -172,13 +178,13 @@ class SmartVietnameseSpellChecker:
         text = re.sub(r'\s+', ' ', text.strip())
         return text
     
-    def _should_skip_word(self, word: str, all_words: List[str], position: int) -> bool:
-        """Kiểm tra có nên bỏ qua từ này không"""
-        # Bỏ qua tên riêng, từ viết tắt
-        if word.upper() in ['AI', 'Mitch', 'Bangladesh']:
+    def _should_skip_word(self, word: str, all_words: List[str], position: int, token_class: int = 0) -> bool:
+        """Kiểm tra có nên bỏ qua từ này không (token_class: nhãn của token trong token_classes)"""
+        # Bỏ qua từ viết tắt, số, URL/email, từ nước ngoài
+        if token_class & SKIP_CLASSES:
             return True
         
-        # Bỏ qua số
+        # Bỏ qua số (sau khi đã bỏ dấu câu)
         if word.isdigit():
             return True
         
@@ -190,12 +196,21 @@ class SmartVietnameseSpellChecker:
     
     def _is_correct_word(self, word: str) -> bool:
         """Kiểm tra từ có đúng chính tả không"""
+        # Bloom filter: từ chắc chắn không có trong từ điển/common_errors
+        # thì bỏ qua các bước tra cứu và fallback (pyvi, LLM), chuyển thẳng sang gợi ý
+        if not self.vietnamese_dict.might_contain(word):
+            return False
+        
         # Kiểm tra trong từ điển mở rộng
         if self.vietnamese_dict.is_correct_word(word):
             return True
         
         # Kiểm tra trong common errors
-        if word.lower() in self.vietnamese_dict.common_errors:
+        if self.vietnamese_dict.is_common_error(word):
+            return False
+        
+        # Không thể là âm tiết tiếng Việt ('trogn', 'divt'): không cần hỏi pyvi/LLM
+        if syllable_validator.is_impossible(word):
             return False
         
         # Kiểm tra bằng pyvi
@@ -227,6 +242,11 @@ class SmartVietnameseSpellChecker:
             if self._validate_suggestion(word, suggestion, all_words, position):
                 validated_suggestions.append(suggestion)
         
+        # Xếp hạng theo ngữ cảnh (các từ xung quanh) nếu có mô hình n-gram
+        if self.language_model is not None and len(validated_suggestions) > 1:
+            validated_suggestions = self.language_model.rank(
+                validated_suggestions, all_words[max(0, position - 2):position], all_words[position + 1:position + 3])
+        
         return validated_suggestions[:3]  # Trả về tối đa 3 gợi ý
     
     def _get_pattern_suggestion(self, word: str) -> str:
@@ -3,14 +3,87 @@
 
 import os
 import json
-import requests
-import subprocess
+import asyncio
 import re
 import time
-from typing import List, Dict, Tuple
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple
 # import underthesea  # Tạm thời comment out
-from pyvi import ViTokenizer, ViPosTagger
+from pyvi import ViTokenizer
+import edit_distance
+from config import Config
+from llama_server import LlamaServer
+from llm_cache import llm_cache
+from llm_client import AsyncLLMClient, LLMClient
 from vietnamese_dictionary import vietnamese_dict
+from ngram_model import SENTENCE_START, language_model, syllables
+from syllable_validator import syllable_validator
+
+# Câu của văn bản (ngữ cảnh gửi kèm từ cần LLM xác minh)
+SENTENCE_PATTERN = re.compile(r'[^.!?…\n]+[.!?…]*')
+MAX_CONTEXT_LENGTH = 200
+
+# Phiên bản prompt gửi LLM: tăng khi đổi nội dung prompt để bỏ các câu trả lời đã cache
+VERIFY_PROMPT_VERSION = 1
+SUGGEST_PROMPT_VERSION = 1
+
+# Câu trả lời JSON bị cắt (hết n_predict): đọc các cặp "từ": true/false đã trọn vẹn
+VERDICT_PAIR = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*(true|false|"(?:[^"\\]|\\.)*")')
+# Số lần gọi tối đa cho một lô từ (các lần sau chỉ hỏi lại từ chưa có kết luận)
+MAX_VERDICT_ATTEMPTS = 3
+
+# Các tầng của pipeline, theo thứ tự; hai tầng cục bộ đầu luôn chạy, các tầng sau có thể bị bỏ qua theo ngân sách
+TIERS = ('rules', 'dictionary', 'ngram', 'llm')
+# Tầng n-gram chấp nhận từ khi mọi âm tiết có trong mô hình và log10-prob trung bình trong ngữ cảnh từ mức này
+NGRAM_ACCEPT_LOGPROB = -4.0
+# Trọng số của lần đo mới trong ước lượng thời gian của mỗi tầng (trung bình trượt mũ)
+TIER_LATENCY_SMOOTHING = 0.2
+
+class LatencyBudget:
+    """
+    Ngân sách thời gian của một request và các tầng đã chạy/bị bỏ qua
+    
+    Một tầng chỉ chạy khi thời gian ước lượng của nó (trung bình trượt mũ của
+    các lần chạy trước, dùng chung giữa các request) còn vừa phần ngân sách
+    còn lại. Mỗi lần bị bỏ qua, ước lượng giảm dần để thỉnh thoảng tầng được
+    thử lại và cập nhật ước lượng.
+    """
+    
+    def __init__(self, budget_ms: float, estimates: Dict[str, float]):
+        self.budget = budget_ms / 1000 if budget_ms and budget_ms > 0 else None
+        self.estimates = estimates
+        self.started = time.monotonic()
+        self.ran: List[str] = []
+        self.skipped: List[str] = []
+    
+    def remaining(self) -> Optional[float]:
+        """Số giây còn lại (None nếu không giới hạn)"""
+        if self.budget is None:
+            return None
+        return self.budget - (time.monotonic() - self.started)
+    
+    def allows(self, tier: str) -> bool:
+        """Tầng còn vừa ngân sách; nếu không thì ghi nhận là bị bỏ qua"""
+        remaining = self.remaining()
+        estimate = self.estimates.get(tier, 0.0)
+        if remaining is None or (remaining > 0 and estimate <= remaining):
+            return True
+        self.estimates[tier] = estimate * (1 - TIER_LATENCY_SMOOTHING)
+        self.skipped.append(tier)
+        return False
+    
+    @contextmanager
+    def run(self, tier: str):
+        """Chạy một tầng: đo thời gian, cập nhật ước lượng và ghi nhận tầng đã chạy"""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            previous = self.estimates.get(tier)
+            self.estimates[tier] = elapsed if previous is None else \
+                previous + TIER_LATENCY_SMOOTHING * (elapsed - previous)
+            self.ran.append(tier)
 
 class VietnameseSpellChecker:
     """Kiểm tra lỗi chính tả tiếng Việt sử dụng GPT-OSS"""
@@ -26,9 +99,17 @@ class VietnameseSpellChecker:
         self.server_url = server_url
         self.model_path = model_path
         self.server_process = None
+        # Mọi lần gọi llama-server đi qua client dùng chung (pool keep-alive, deadline, retry)
+        self.llm_client = LLMClient(server_url)
+        self.async_llm_client = AsyncLLMClient(self.llm_client)
+        # Cache câu trả lời LLM trên đĩa (None nếu chưa cấu hình LLM_CACHE_PATH)
+        self.llm_cache = llm_cache
+        # Thời gian ước lượng (giây) của mỗi tầng, dùng cho ngân sách thời gian của request
+        self.tier_latency: Dict[str, float] = {}
         
         # Sử dụng từ điển tiếng Việt mở rộng
         self.vietnamese_dict = vietnamese_dict
+        self.language_model = language_model
         
         # Khởi động server nếu cần
         if model_path and os.path.exists(model_path):
@@ -40,75 +121,104 @@ class VietnameseSpellChecker:
     
     def _start_server(self):
         """Khởi động llama-server"""
-        try:
-            # Kiểm tra xem server đã chạy chưa
-            response = requests.get(f"{self.server_url}/health", timeout=2)
-            if response.status_code == 200:
-                print("✅ Server đã đang chạy")
-                return
-        except:
-            pass
+        # Kiểm tra xem server đã chạy chưa
+        if self.llm_client.health():
+            print("✅ Server đã đang chạy")
+            return
         
         try:
-            # Khởi động server
-            llama_server_path = "../build/bin/llama-server"
-            if os.path.exists(llama_server_path):
-                cmd = [
-                    llama_server_path,
-                    "-m", self.model_path,
-                    "--host", "0.0.0.0",
-                    "--port", "8080",
-                    "--ctx-size", "2048"
-                ]
-                
-                self.server_process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE
-                )
-                
-                # Đợi server khởi động
-                time.sleep(5)
-                print("✅ Server đã được khởi động")
+            # Khởi động server và chờ tới khi model nạp xong (/health sẵn sàng)
+            if os.path.exists(Config.LLAMA_SERVER_PATH):
+                self.server_process = LlamaServer(self.model_path, self.server_url).start()
+                print(f"✅ Server đã được khởi động ({self.server_process.startup_time:.1f}s)")
             else:
                 print("⚠️ Không tìm thấy llama-server")
                 
         except Exception as e:
             print(f"❌ Lỗi khởi động server: {e}")
     
-    def check_text(self, text: str) -> Dict:
+    def check_text(self, text: str, latency_budget_ms: Optional[float] = None) -> Dict:
         """
         Kiểm tra chính tả trong văn bản
         
+        Các từ đi qua lần lượt các tầng: quy tắc, từ điển/automaton âm tiết, mô
+        hình n-gram, rồi LLM chỉ cho những từ vẫn chưa kết luận được. Tầng n-gram
+        và LLM bị bỏ qua nếu không vừa ngân sách thời gian còn lại; lần gọi LLM
+        có deadline bằng phần ngân sách còn lại. Từ vẫn chưa kết luận được sau
+        các tầng đã chạy được coi là sai.
+        
         Args:
             text: Văn bản cần kiểm tra
+            latency_budget_ms: Ngân sách thời gian (ms) của request; None = LATENCY_BUDGET_MS, 0 = không giới hạn
             
         Returns:
-            Dict chứa kết quả kiểm tra
+            Dict chứa kết quả kiểm tra ('tiers': các tầng đã chạy, 'skipped_tiers': các tầng bị bỏ qua)
         """
+        budget = LatencyBudget(Config.LATENCY_BUDGET_MS if latency_budget_ms is None else latency_budget_ms,
+                               self.tier_latency)
         try:
             # Tách từ
             words = ViTokenizer.tokenize(text).split()
             
-            # Kiểm tra từng từ
             errors = []
             corrected_text = text
             
-            for word in words:
+            candidates = []
+            positions = {}
+            for i, word in enumerate(words):
                 # Loại bỏ dấu câu
                 clean_word = re.sub(r'[^\w\s]', '', word)
                 if not clean_word:
                     continue
-                
-                # Kiểm tra chính tả
-                if not self._is_correct_word(clean_word):
-                    suggestions = self._get_suggestions(clean_word)
-                    errors.append({
-                        'word': word,
-                        'position': text.find(word),
-                        'suggestions': suggestions,
-                        'corrected': suggestions[0] if suggestions else word
-                    })
+                candidates.append((i, word, clean_word))
+                positions.setdefault(clean_word, i)
+            
+            # Tầng 1-2: quy tắc rồi từ điển/automaton âm tiết (cục bộ, luôn chạy)
+            verdicts: Dict[str, Optional[bool]] = {}
+            with budget.run('rules'):
+                for clean_word in positions:
+                    verdicts[clean_word] = self._rule_verdict(clean_word)
+            with budget.run('dictionary'):
+                for clean_word, verdict in verdicts.items():
+                    if verdict is None:
+                        verdicts[clean_word] = self._dictionary_verdict(clean_word)
+            
+            # Tầng 3: mô hình n-gram cho các từ còn mơ hồ
+            ambiguous = [clean_word for clean_word, verdict in verdicts.items() if verdict is None]
+            if ambiguous and self.language_model is not None and budget.allows('ngram'):
+                with budget.run('ngram'):
+                    for clean_word in ambiguous:
+                        i = positions[clean_word]
+                        verdicts[clean_word] = self._ngram_verdict(clean_word, words[max(0, i - 2):i])
+                ambiguous = [clean_word for clean_word in ambiguous if verdicts[clean_word] is None]
+            
+            # Tầng 4: LLM, một lần gọi cho mọi từ còn mơ hồ và gợi ý đồng thời cho các từ sai
+            gpt_suggestions = {}
+            if self.server_process and not all(verdicts.values()) and budget.allows('llm'):
+                with budget.run('llm'):
+                    if ambiguous:
+                        verdicts.update(self._check_words_with_gpt(ambiguous, text, timeout=budget.remaining()))
+                    misspelled_words = [clean_word for clean_word, verdict in verdicts.items() if not verdict]
+                    remaining = budget.remaining()
+                    if misspelled_words and (remaining is None or remaining > 0):
+                        gpt_suggestions = self._get_gpt_suggestions_many(misspelled_words, timeout=remaining)
+            else:
+                # Tầng LLM không chạy (không có server hoặc hết ngân sách): kết luận theo cấu trúc âm tiết
+                for clean_word in ambiguous:
+                    verdicts[clean_word] = self._fallback_verdict(clean_word)
+            
+            for i, word, clean_word in candidates:
+                if verdicts[clean_word]:
+                    continue
+                suggestions = self.get_suggestions(clean_word, gpt_suggestions.get(clean_word, []))
+                if self.language_model is not None and len(suggestions) > 1:
+                    suggestions = self.language_model.rank(suggestions, words[max(0, i - 2):i], words[i + 1:i + 3])
+                errors.append({
+                    'word': word,
+                    'position': text.find(word),
+                    'suggestions': suggestions,
+                    'corrected': suggestions[0] if suggestions else word
+                })
             
             # Sửa lỗi trong văn bản
             for error in errors:
@@ -119,7 +229,9 @@ class VietnameseSpellChecker:
                 'corrected_text': corrected_text,
                 'errors': errors,
                 'error_count': len(errors),
-                'confidence': self._calculate_confidence(errors, len(words))
+                'confidence': self._calculate_confidence(errors, len(words)),
+                'tiers': budget.ran,
+                'skipped_tiers': budget.skipped
             }
             
         except Exception as e:
@@ -134,64 +246,199 @@ class VietnameseSpellChecker:
     
     def _is_correct_word(self, word: str) -> bool:
         """Kiểm tra xem từ có đúng chính tả không"""
-        # Kiểm tra trong từ điển mở rộng
-        if self.vietnamese_dict.is_correct_word(word):
-            return True
+        verdict = self._local_verdict(word)
+        if verdict is None:
+            return self._check_with_gpt(word) if self.server_process else self._fallback_verdict(word)
+        return verdict
+    
+    @staticmethod
+    def _fallback_verdict(word: str) -> bool:
+        """Kết luận cho từ còn mơ hồ khi tầng LLM không chạy được: sai nếu không thể là tiếng Việt"""
+        return not syllable_validator.is_impossible(word)
+    
+    def _local_verdict(self, word: str) -> Optional[bool]:
+        """
+        Kết luận đúng/sai bằng các tầng cục bộ (quy tắc, từ điển/automaton âm tiết)
         
-        # Kiểm tra trong common errors
-        if word.lower() in self.vietnamese_dict.common_errors:
+        Returns:
+            True/False, hoặc None nếu các tầng cục bộ không kết luận được
+        """
+        verdict = self._rule_verdict(word)
+        return self._dictionary_verdict(word) if verdict is None else verdict
+    
+    def _rule_verdict(self, word: str) -> Optional[bool]:
+        """Tầng quy tắc: chỉ kết luận sai (Bloom filter, common_errors, cấu trúc âm tiết)"""
+        # Bloom filter: từ chắc chắn không có trong từ điển/common_errors
+        # thì bỏ qua các bước tra cứu và fallback (n-gram, LLM), chuyển thẳng sang gợi ý
+        if not self.vietnamese_dict.might_contain(word):
             return False
         
-        # Kiểm tra bằng pyvi
-        try:
-            pos_tags = ViPosTagger.postagging(word)
-            if pos_tags and pos_tags[0]:
-                return True
-        except:
-            pass
-        
-        # Kiểm tra bằng GPT-OSS nếu có server
-        if self.server_process:
-            return self._check_with_gpt(word)
+        # Lỗi thường gặp, trừ khi từ có trong từ điển: không cần hỏi n-gram/LLM
+        if self.vietnamese_dict.is_common_error(word) and not self.vietnamese_dict.is_correct_word(word):
+            return False
         
-        return False
+        # Không thể là âm tiết tiếng Việt ('trogn', nhưng cả 'zalo', 'blockchain'): để tầng
+        # n-gram/LLM quyết định, chỉ coi là sai khi không còn tầng nào chạy được (_fallback_verdict)
+        return None
+    
+    def _dictionary_verdict(self, word: str) -> Optional[bool]:
+        """Tầng từ điển: chỉ kết luận đúng (từ điển mở rộng)"""
+        # ViPosTagger gắn nhãn cho mọi chuỗi ('xoẻn', 'qwrtz' đều là 'N') nên không dùng để kết luận
+        if self.vietnamese_dict.is_correct_word(word):
+            return True
+        return None
+    
+    def _ngram_verdict(self, word: str, left_words: List[str]) -> Optional[bool]:
+        """Tầng n-gram: từ đúng nếu mọi âm tiết có trong mô hình và hợp với 2 từ đứng trước"""
+        tokens = syllables([word])
+        if not tokens or any(self.language_model.token_id(token) < 0 for token in tokens):
+            return None
+        left = ([SENTENCE_START] + syllables(left_words))[-2:]
+        score = self.language_model.score(left + tokens, start=len(left)) / len(tokens)
+        return True if score >= NGRAM_ACCEPT_LOGPROB else None
     
     def _check_with_gpt(self, word: str) -> bool:
         """Kiểm tra từ bằng GPT-OSS"""
-        try:
-            prompt = f"""Kiểm tra xem từ "{word}" có phải là từ tiếng Việt đúng chính tả không. 
-            Chỉ trả lời "ĐÚNG" hoặc "SAI"."""
-            
-            response = requests.post(
-                f"{self.server_url}/completion",
-                json={
-                    "prompt": prompt,
-                    "n_predict": 10,
-                    "temperature": 0.1,
-                    "stop": ["\n", ".", "!"]
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                answer = result.get('content', '').strip().upper()
-                return "ĐÚNG" in answer
+        return self._check_words_with_gpt([word]).get(word, False)
+    
+    def _check_words_with_gpt(self, words: List[str], text: str = '',
+                              timeout: Optional[float] = None) -> Dict[str, bool]:
+        """
+        Kiểm tra nhiều từ bằng GPT-OSS trong một lần gọi
+        
+        Mọi từ chưa kết luận được của một request (kèm câu chứa từ đó) được gửi
+        trong một prompt; server trả về một đối tượng JSON {từ: true/false} (ràng
+        buộc bằng json_schema), nên N từ lạ chỉ tốn một round trip thay vì N.
+        Nếu câu trả lời vẫn bị cắt, các từ chưa có kết luận được hỏi lại (tối đa
+        MAX_VERDICT_ATTEMPTS lần gọi, dừng khi một lần gọi không thêm được kết
+        luận nào). Kết luận được cache theo (từ, câu chứa từ); chỉ từ chưa có trong cache
+        mới được gửi đi.
+        
+        Args:
+            words: Các từ cần kiểm tra
+            text: Văn bản chứa các từ (ngữ cảnh)
+            timeout: Deadline của cả các lần gọi (giây; None = LLM_TIMEOUT mỗi lần)
             
-        except Exception as e:
-            print(f"Lỗi kiểm tra với GPT: {e}")
+        Returns:
+            Dict từ -> đúng chính tả; từ thiếu trong câu trả lời (hoặc khi lỗi) không có mặt
+        """
+        words = list(dict.fromkeys(words))
+        contexts = {word: self._sentence_of(text, word) for word in words}
+        verdicts = {}
+        if self.llm_cache is not None:
+            for word in words:
+                verdict = self.llm_cache.get('verify', VERIFY_PROMPT_VERSION, word, contexts[word])
+                if verdict is not None:
+                    verdicts[word] = verdict
+            words = [word for word in words if word not in verdicts]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for _ in range(MAX_VERDICT_ATTEMPTS):
+            if not words:
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                answered = self._request_verdicts(words, contexts, remaining)
+            except Exception as e:
+                print(f"Lỗi kiểm tra với GPT: {e}")
+                break
+            if self.llm_cache is not None:
+                self.llm_cache.set_many('verify', VERIFY_PROMPT_VERSION, answered, contexts)
+            verdicts.update(answered)
+            if not answered:
+                break
+            words = [word for word in words if word not in answered]
         
-        return False
+        return verdicts
+    
+    def _request_verdicts(self, words: List[str], contexts: Dict[str, str],
+                          timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Một lần gọi LLM cho một lô từ, trả về các kết luận đọc được"""
+        items = []
+        for word in words:
+            context = contexts[word]
+            items.append(f'- "{word}"' + (f' (trong câu: "{context}")' if context else ''))
+        prompt = ("Kiểm tra xem mỗi từ dưới đây có phải là từ tiếng Việt đúng chính tả không "
+                  "(xét trong câu chứa từ đó).\n" + '\n'.join(items) +
+                  '\nChỉ trả lời một đối tượng JSON, khóa là từ, giá trị là true (ĐÚNG) hoặc false (SAI).\n')
+        
+        result = self.llm_client.complete({
+            "prompt": prompt,
+            "n_predict": self._verdict_budget(words),
+            "temperature": 0.1,
+            "json_schema": {
+                "type": "object",
+                "properties": {word: {"type": "boolean"} for word in words},
+                "required": words
+            }
+        }, timeout)
+        return self._parse_verdicts(result.get('content', ''), words)
+    
+    @staticmethod
+    def _verdict_budget(words: List[str]) -> int:
+        """
+        n_predict cho câu trả lời {từ: true/false}
+        
+        Mỗi token dài ít nhất một byte nên số byte UTF-8 của câu trả lời (khóa JSON,
+        ': false, ') là cận trên của số token; cộng thêm 25% và 16 token dự phòng.
+        """
+        size = sum(len(json.dumps(word, ensure_ascii=False).encode('utf-8')) + len(': false, ') for word in words)
+        return 16 + size * 5 // 4
+    
+    @staticmethod
+    def _parse_verdicts(content: str, words: List[str]) -> Dict[str, bool]:
+        """
+        Đọc câu trả lời JSON {từ: true/false} (chấp nhận cả "ĐÚNG"/"SAI")
+        
+        Câu trả lời bị cắt giữa chừng (không đọc được như JSON) vẫn cho kết luận
+        của các cặp đã trọn vẹn.
+        """
+        match = re.search(r'\{.*\}', content, re.DOTALL)
+        try:
+            answer = json.loads(match.group()) if match else None
+        except ValueError:
+            answer = None
+        if answer is None:
+            answer = {}
+            for key, value in VERDICT_PAIR.findall(content):
+                try:
+                    answer[json.loads(f'"{key}"')] = json.loads(value)
+                except ValueError:
+                    continue
+        verdicts = {}
+        for word in words:
+            value = answer.get(word) if isinstance(answer, dict) else None
+            if isinstance(value, str):
+                value = value.strip().upper() in ('ĐÚNG', 'TRUE')
+            if isinstance(value, bool):
+                verdicts[word] = value
+        return verdicts
+    
+    @staticmethod
+    def _sentence_of(text: str, word: str) -> str:
+        """Câu đầu tiên của văn bản chứa từ (cắt ngắn), '' nếu không có"""
+        word = word.replace('_', ' ')
+        for sentence in SENTENCE_PATTERN.findall(text):
+            if word in sentence:
+                return sentence.strip()[:MAX_CONTEXT_LENGTH]
+        return ''
     
-    def get_suggestions(self, word: str) -> List[str]:
-        """Lấy gợi ý sửa lỗi cho từ"""
+    def get_suggestions(self, word: str, gpt_suggestions: Optional[List[str]] = None) -> List[str]:
+        """
+        Lấy gợi ý sửa lỗi cho từ
+        
+        Args:
+            word: Từ sai
+            gpt_suggestions: Gợi ý GPT đã lấy trước (None = gọi server nếu có)
+        """
         # Sử dụng từ điển mở rộng để lấy gợi ý
         suggestions = self.vietnamese_dict.get_suggestions(word)
         
         # Gợi ý bằng GPT-OSS nếu có server
-        if self.server_process:
+        if gpt_suggestions is None and self.server_process:
             gpt_suggestions = self._get_gpt_suggestions(word)
-            suggestions.extend(gpt_suggestions)
+        suggestions.extend(gpt_suggestions or [])
         
         # Loại bỏ trùng lặp và sắp xếp theo độ tương đồng
         unique_suggestions = list(set(suggestions))
@@ -201,58 +448,83 @@ class VietnameseSpellChecker:
     
     def _get_gpt_suggestions(self, word: str) -> List[str]:
         """Lấy gợi ý từ GPT-OSS"""
+        return self._get_gpt_suggestions_many([word]).get(word, [])
+    
+    def _get_gpt_suggestions_many(self, words: List[str], timeout: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Lấy gợi ý GPT-OSS cho nhiều từ, các lần gọi chạy đồng thời
+        
+        Gợi ý đã cache được dùng lại; các từ còn lại gọi qua client asyncio (tối
+        đa LLM_MAX_CONCURRENCY lần gọi cùng lúc), hoặc gọi lần lượt nếu chỉ có
+        một từ hay đang ở trong một event loop (không gọi được asyncio.run).
+        """
+        words = list(dict.fromkeys(words))
+        suggestions = {}
+        if self.llm_cache is not None:
+            for word in words:
+                cached = self.llm_cache.get('suggest', SUGGEST_PROMPT_VERSION, word)
+                if cached is not None:
+                    suggestions[word] = cached
+        missing = [word for word in words if word not in suggestions]
+        if not missing:
+            return suggestions
+        
         try:
-            prompt = f"""Cho từ "{word}" bị sai chính tả tiếng Việt, hãy đưa ra 3 từ gợi ý sửa lỗi.
-            Chỉ trả lời các từ, cách nhau bằng dấu phẩy."""
-            
-            response = requests.post(
-                f"{self.server_url}/completion",
-                json={
-                    "prompt": prompt,
-                    "n_predict": 50,
-                    "temperature": 0.3,
-                    "stop": ["\n", ".", "!"]
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result.get('content', '').strip()
-                suggestions = [s.strip() for s in content.split(',')]
-                return [s for s in suggestions if s and len(s) > 1]
-            
+            asyncio.get_running_loop()
+            in_event_loop = True
+        except RuntimeError:
+            in_event_loop = False
+        if len(missing) == 1 or in_event_loop:
+            fetched = [self._fetch_gpt_suggestions(word, timeout) for word in missing]
+        else:
+            fetched = asyncio.run(self._gather_gpt_suggestions(missing, timeout))
+        
+        # Chỉ cache câu trả lời thành công (lần gọi lỗi trả về None)
+        answered = {word: result for word, result in zip(missing, fetched) if result is not None}
+        if self.llm_cache is not None:
+            self.llm_cache.set_many('suggest', SUGGEST_PROMPT_VERSION, answered)
+        suggestions.update({word: answered.get(word, []) for word in missing})
+        return suggestions
+    
+    def _fetch_gpt_suggestions(self, word: str, timeout: Optional[float] = None) -> Optional[List[str]]:
+        try:
+            return self._parse_suggestions(self.llm_client.complete(self._suggestion_payload(word), timeout))
         except Exception as e:
             print(f"Lỗi lấy gợi ý từ GPT: {e}")
+            return None
+    
+    async def _gather_gpt_suggestions(self, words: List[str],
+                                      timeout: Optional[float] = None) -> List[Optional[List[str]]]:
+        async def fetch(word: str) -> Optional[List[str]]:
+            try:
+                payload = self._suggestion_payload(word)
+                return self._parse_suggestions(await self.async_llm_client.complete(payload, timeout))
+            except Exception as e:
+                print(f"Lỗi lấy gợi ý từ GPT: {e}")
+                return None
         
-        return []
+        return await asyncio.gather(*(fetch(word) for word in words))
+    
+    @staticmethod
+    def _suggestion_payload(word: str) -> Dict:
+        prompt = f"""Cho từ "{word}" bị sai chính tả tiếng Việt, hãy đưa ra 3 từ gợi ý sửa lỗi.
+            Chỉ trả lời các từ, cách nhau bằng dấu phẩy."""
+        return {
+            "prompt": prompt,
+            "n_predict": 50,
+            "temperature": 0.3,
+            "stop": ["\n", ".", "!"]
+        }
+    
+    @staticmethod
+    def _parse_suggestions(result: Dict) -> List[str]:
+        content = result.get('content', '').strip()
+        suggestions = [s.strip() for s in content.split(',')]
+        return [s for s in suggestions if s and len(s) > 1]
     
     def _similarity(self, word1: str, word2: str) -> float:
         """Tính độ tương đồng giữa hai từ"""
-        if word1 == word2:
-            return 1.0
-        
-        # Tính Levenshtein distance
-        len1, len2 = len(word1), len(word2)
-        matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        
-        for i in range(len1 + 1):
-            matrix[i][0] = i
-        for j in range(len2 + 1):
-            matrix[0][j] = j
-        
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                cost = 0 if word1[i-1] == word2[j-1] else 1
-                matrix[i][j] = min(
-                    matrix[i-1][j] + 1,      # deletion
-                    matrix[i][j-1] + 1,      # insertion
-                    matrix[i-1][j-1] + cost  # substitution
-                )
-        
-        distance = matrix[len1][len2]
-        max_len = max(len1, len2)
-        return 1 - (distance / max_len) if max_len > 0 else 0
+        return edit_distance.similarity(word1, word2)
     
     def _calculate_confidence(self, errors: List, total_words: int) -> float:
         """Tính độ tin cậy của kết quả kiểm tra"""
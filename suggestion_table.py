@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Precomputed Suggestion Table for Vietnamese Spell Checker
+Bảng gợi ý top-k tính sẵn cho các lỗi phổ biến, làm ấm khi khởi động
+"""
+
+import argparse
+import json
+import logging
+import os
+import re
+from threading import Lock
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import edit_distance
+from build_frequency import BoundedCounter
+from lexicon_store import compound_key
+
+# Pattern dạng r'\bliteral\b' (không chứa ký tự đặc biệt của regex)
+_LITERAL_PATTERN = re.compile(r'\\b([^\\\[\](){}.*+?^$|]+)\\b')
+
+
+def literal_trigger(pattern: str) -> Optional[str]:
+    """Từ kích hoạt của pattern dạng r'\\bword\\b', None nếu pattern là regex thật"""
+    match = _LITERAL_PATTERN.fullmatch(pattern)
+    return match.group(1) if match else None
+
+
+def rule_triggers(error_categories: Dict[str, Dict[str, str]]) -> List[str]:
+    """Lấy các từ kích hoạt (literal) từ các pattern dạng r'\\bword\\b'"""
+    triggers = []
+    for patterns in error_categories.values():
+        for pattern in patterns:
+            trigger = literal_trigger(pattern)
+            if trigger:
+                triggers.append(trigger)
+    return list(dict.fromkeys(triggers))
+
+
+class SuggestionTable:
+    """Bảng tra cứu word -> top-k gợi ý đã tính sẵn
+
+    Bảng chỉ đọc trong lúc phục vụ; các từ không có trong bảng được đếm
+    (``misses``) để lần làm ấm sau tính sẵn luôn các từ ngoài từ điển hay gặp.
+    """
+
+    def __init__(self, top_k: int = 5, max_misses: int = 10000):
+        self.top_k = top_k
+        self.table: Dict[str, Tuple[str, ...]] = {}
+        self.misses = BoundedCounter(max_misses)
+        self.lock = Lock()
+
+    def get(self, word: str) -> Optional[List[str]]:
+        """Tra cứu gợi ý; trả về None (và ghi nhận miss) nếu chưa tính sẵn"""
+        suggestions = self.table.get(word)
+        if suggestions is not None:
+            return list(suggestions)
+        with self.lock:
+            self.misses.update([word])
+        return None
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.table
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def warm(self, compute: Callable[[str], List[str]], words: Iterable[str]) -> int:
+        """Tính sẵn gợi ý cho các từ chưa có trong bảng, trả về số từ đã thêm"""
+        added = 0
+        for word in words:
+            if word and word not in self.table:
+                self.table[word] = tuple(compute(word)[:self.top_k])
+                added += 1
+        return added
+
+    def refresh(self, compute: Callable[[str], List[str]], word: str) -> int:
+        """
+        Tính lại các mục bị ảnh hưởng khi từ điển thêm/xóa từ hoặc đổi tần suất của word
+        
+        Gợi ý từ từ điển chỉ gồm các từ tương tự khóa, nên chỉ cần tính lại các khóa
+        tương tự word (hoặc đang gợi ý word) thay vì dựng lại cả bảng.
+        """
+        affected = [key for key, suggestions in list(self.table.items())
+                    if word in suggestions or edit_distance.is_similar(compound_key(key), word)]
+        for key in affected:
+            self.table[key] = tuple(compute(key)[:self.top_k])
+        return len(affected)
+    
+    def top_misses(self, n: int) -> List[str]:
+        """Các từ bị miss nhiều nhất"""
+        with self.lock:
+            return [word for word, _ in self.misses.counts.most_common(n)]
+
+    def promote_misses(self, compute: Callable[[str], List[str]], n: int = 1000) -> int:
+        """Tính sẵn gợi ý cho n từ bị miss nhiều nhất"""
+        words = self.top_misses(n)
+        added = self.warm(compute, words)
+        with self.lock:
+            for word in words:
+                self.misses.counts.pop(word, None)
+        return added
+
+    def save(self, path: str) -> None:
+        """Lưu bảng và thống kê miss ra file JSON"""
+        with self.lock:
+            data = {
+                'top_k': self.top_k,
+                'table': {word: list(suggestions) for word, suggestions in self.table.items()},
+                'misses': dict(self.misses.counts),
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> 'SuggestionTable':
+        """Tải bảng đã lưu bằng save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        table = cls(top_k=data.get('top_k', 5))
+        table.table = {word: tuple(suggestions) for word, suggestions in data.get('table', {}).items()}
+        table.misses.merge(data.get('misses', {}))
+        return table
+
+
+def build_suggestion_table(checker, top_k: int = 5, traffic_words: Iterable[str] = (),
+                           path: Optional[str] = None) -> SuggestionTable:
+    """
+    Tạo bảng gợi ý cho checker
+
+    Nếu path tồn tại thì tải bảng đã tính (và tính thêm các từ miss hay gặp),
+    ngược lại tính sẵn cho mọi khóa common_errors, mọi từ kích hoạt rule và traffic_words.
+    """
+    if path and os.path.exists(path):
+        table = SuggestionTable.load(path)
+        table.top_k = top_k
+        promoted = table.promote_misses(checker._compute_suggestions)
+        logging.info(f"📚 Suggestion table: tải {len(table)} từ từ {path}, thêm {promoted} từ hay bị miss")
+        return table
+
+    table = SuggestionTable(top_k=top_k)
+    words = list(checker.vietnamese_dict.common_errors)
+    words += rule_triggers(checker.error_categories)
+    words += list(traffic_words)
+    table.warm(checker._compute_suggestions, words)
+    logging.info(f"📚 Suggestion table: đã tính sẵn {len(table)} từ")
+    return table
+
+
+if __name__ == '__main__':
+    from config import Config
+    from categorized_spell_checker import categorized_spell_checker
+
+    parser = argparse.ArgumentParser(description='Precompute top-k suggestion table')
+    parser.add_argument('--output', type=str, required=True, help='File JSON đầu ra')
+    parser.add_argument('--traffic', type=str, help='File từ ngoài từ điển hay gặp (mỗi dòng một từ)')
+    parser.add_argument('--top-k', type=int, default=Config.MAX_SUGGESTIONS, help='Số gợi ý mỗi từ')
+    args = parser.parse_args()
+
+    traffic = []
+    if args.traffic:
+        with open(args.traffic, 'r', encoding='utf-8') as f:
+            traffic = [line.strip() for line in f if line.strip()]
+
+    suggestion_table = build_suggestion_table(categorized_spell_checker, top_k=args.top_k,
+                                              traffic_words=traffic)
+    suggestion_table.save(args.output)
+    print(f"✅ Đã ghi {len(suggestion_table):,} từ vào {args.output}")
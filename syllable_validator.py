@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Syllable Validator for Vietnamese Spell Checker
+Automaton hữu hạn đơn định cho âm tiết tiếng Việt (âm đầu, âm đệm, âm chính, âm cuối, thanh):
+phát hiện từ "không thể là tiếng Việt" trong thời gian tuyến tính, không cần mô hình hay I/O
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Âm đầu (chữ viết); '' là âm tiết không có âm đầu
+ONSETS = ('', 'b', 'c', 'ch', 'd', 'đ', 'g', 'gh', 'gi', 'h', 'k', 'kh', 'l', 'm', 'n', 'ng', 'ngh',
+          'nh', 'p', 'ph', 'qu', 'r', 's', 't', 'th', 'tr', 'v', 'x')
+
+# Vần (âm đệm + âm chính + âm cuối, chưa có thanh)
+RHYMES = '''
+a ac ach ai am an ang anh ao ap at au ay
+ăc ăm ăn ăng ăp ăt
+âc âm ân âng âp ât âu ây
+e ec em en eng eo ep et
+ê êch êm ên ênh êp êt êu
+i ia ich im in inh ip it iu
+iêc iêm iên iêng iêp iêt iêu
+y yêm yên yêng yêt yêu
+o oc oi om on ong op ot ooc oong
+ô ôc ôi ôm ôn ông ôp ôt
+ơ ơi ơm ơn ơp ơt
+u ua uc ui um un ung up ut
+uôc uôi uôm uôn uông uôt
+ư ưa ưc ưi ưm ưn ưng ưt ưu
+ươc ươi ươm ươn ương ươp ươt ươu
+oa oac oach oai oam oan oang oanh oao oap oat oay
+oăc oăm oăn oăng oăt
+oe oen oeo oet
+uâ uân uâng uât uây
+uê uêch uênh uêt
+uơ
+uy uya uych uyn uynh uyp uyt uyu uyên uyêt
+'''.split()
+
+# Dấu thanh (dạng tổ hợp NFD): huyền, sắc, ngã, hỏi, nặng
+TONE_MARKS = frozenset('\u0300\u0301\u0303\u0309\u0323')
+LEVEL_TONE = '0'  # Thanh ngang (không có dấu) - ký hiệu cuối cùng đưa vào automaton
+STOP_TONES = ('\u0301', '\u0323')  # Vần tắc (âm cuối p, t, c, ch) chỉ mang thanh sắc hoặc nặng
+FRONT_VOWELS = ('i', 'e', 'ê', 'y')
+
+
+@lru_cache(maxsize=1024)
+def split_tone(char: str) -> Tuple[str, Optional[str]]:
+    """Tách dấu thanh khỏi một ký tự NFC ('ộ' -> ('ô', dấu nặng), 'a' -> ('a', None))"""
+    tone = None
+    letters = []
+    for part in unicodedata.normalize('NFD', char):
+        if part in TONE_MARKS:
+            tone = part
+        else:
+            letters.append(part)
+    return unicodedata.normalize('NFC', ''.join(letters)), tone
+
+
+def _stop_rhyme(rhyme: str) -> bool:
+    return rhyme.endswith(('p', 't', 'c', 'ch'))
+
+
+def _rhymes_after(onset: str) -> List[str]:
+    """Các vần đi được sau âm đầu theo quy tắc chính tả (c/k, g/gh, ng/ngh, gi, qu)"""
+    if onset == 'k':
+        return [r for r in RHYMES if r.startswith(FRONT_VOWELS)]
+    if onset in ('gh', 'ngh'):
+        return [r for r in RHYMES if r.startswith(('i', 'e', 'ê'))]
+    if onset in ('c', 'ng'):
+        return [r for r in RHYMES if not r.startswith(FRONT_VOWELS)]
+    if onset == 'g':
+        # 'gì', 'gìn': âm đầu gi viết gộp với vần bắt đầu bằng i
+        return [r for r in RHYMES if not r.startswith(('e', 'ê', 'y'))]
+    if onset == 'gi':
+        return [r for r in RHYMES if not r.startswith(('i', 'y'))]
+    if onset == 'qu':
+        # Âm đệm đã nằm trong 'qu': 'quy', 'quyết', 'quên', 'quân', 'thuở' -> 'quơ'
+        plain = [r for r in RHYMES if not r.startswith(('o', 'u', 'ư'))]
+        return plain + [r[1:] for r in RHYMES if r.startswith(('uy', 'uê', 'uâ', 'uơ'))]
+    if onset == '':
+        return [r for r in RHYMES if not r.startswith('iê')]
+    return [r for r in RHYMES if not r.startswith('y') or r == 'y']
+
+
+class SyllableValidator:
+    """
+    Automaton hữu hạn đơn định (DFA) nhận đúng các âm tiết tiếng Việt hợp lệ
+
+    Âm tiết được tách dấu thanh (NFD) rồi đưa qua automaton từng chữ cái của
+    phần không thanh, cuối cùng là ký hiệu thanh: vần tắc (-p, -t, -c, -ch)
+    chỉ có cạnh cho thanh sắc/nặng nên 'tàp' bị loại ngay trong automaton.
+    Automaton được dựng từ mọi tổ hợp âm đầu × vần rồi tối giản (gộp các trạng
+    thái có cùng phần đuôi), nên một lần kiểm tra chỉ tốn O(độ dài từ).
+    """
+
+    def __init__(self, onsets: Iterable[str] = ONSETS):
+        syllables: Set[Tuple[str, bool]] = set()
+        for onset in onsets:
+            for rhyme in _rhymes_after(onset):
+                syllables.add((onset + rhyme, _stop_rhyme(rhyme)))
+        self._transitions, self._finals, self._start = self._build(syllables)
+
+    @staticmethod
+    def _build(syllables: Set[Tuple[str, bool]]) -> Tuple[List[Dict[str, int]], Set[int], int]:
+        """Dựng trie (chữ cái + ký hiệu thanh) rồi tối giản thành DFA nhỏ nhất"""
+        trie: List[Dict[str, int]] = [{}]
+        finals: Set[int] = set()
+        for spelling, stop in sorted(syllables):
+            state = 0
+            for symbol in spelling:
+                if symbol not in trie[state]:
+                    trie.append({})
+                    trie[state][symbol] = len(trie) - 1
+                state = trie[state][symbol]
+            for tone in STOP_TONES if stop else (LEVEL_TONE,) + tuple(TONE_MARKS):
+                if tone not in trie[state]:
+                    trie.append({})
+                    trie[state][tone] = len(trie) - 1
+                finals.add(trie[state][tone])
+
+        # Tối giản: hai trạng thái tương đương khi cùng tính kết thúc và cùng cạnh tới các lớp tương đương
+        registry: Dict[Tuple, int] = {}
+        canonical: Dict[int, int] = {}
+        transitions: List[Dict[str, int]] = []
+        minimal_finals: Set[int] = set()
+        # Trie được đánh số theo thứ tự thêm: con luôn có số lớn hơn cha, duyệt ngược là hậu thứ tự
+        for state in range(len(trie) - 1, -1, -1):
+            edges = tuple(sorted((symbol, canonical[child]) for symbol, child in trie[state].items()))
+            signature = (state in finals, edges)
+            if signature not in registry:
+                registry[signature] = len(transitions)
+                transitions.append(dict(edges))
+                if state in finals:
+                    minimal_finals.add(registry[signature])
+            canonical[state] = registry[signature]
+        return transitions, minimal_finals, canonical[0]
+
+    @property
+    def num_states(self) -> int:
+        return len(self._transitions)
+
+    def is_valid(self, syllable: str) -> bool:
+        """Kiểm tra một âm tiết (không phân biệt hoa thường, dấu thanh đặt ở đâu cũng được)"""
+        tone = None
+        state = self._start
+        transitions = self._transitions
+        # Bỏ dấu thanh, giữ dấu mũ/móc/trăng (â, ư, ă...) rồi ghép lại để đi qua automaton
+        letters = []
+        for char in unicodedata.normalize('NFD', syllable.lower()):
+            if char in TONE_MARKS:
+                if tone is not None:
+                    return False
+                tone = char
+            else:
+                letters.append(char)
+        for symbol in unicodedata.normalize('NFC', ''.join(letters)):
+            state = transitions[state].get(symbol)
+            if state is None:
+                return False
+        state = transitions[state].get(tone or LEVEL_TONE)
+        return state is not None and state in self._finals
+
+    def syllable_ends(self, text: str, start: int = 0, any_tone: bool = False) -> List[int]:
+        """
+        Các vị trí end sao cho text[start:end] là một âm tiết hợp lệ
+
+        Đi automaton một lần từ start (text là chữ thường, dạng NFC) và dừng ngay
+        khi không còn cạnh, nên chi phí bị chặn bởi độ dài âm tiết dài nhất.
+        any_tone: âm tiết không dấu hợp lệ khi thêm được một thanh nào đó ('hoc' -> 'học'),
+        dùng cho văn bản gõ không dấu.
+        """
+        ends = []
+        state = self._start
+        tone = None
+        transitions = self._transitions
+        for position in range(start, len(text)):
+            letter, mark = split_tone(text[position])
+            if mark is not None:
+                if tone is not None:
+                    break
+                tone = mark
+            state = transitions[state].get(letter)
+            if state is None:
+                break
+            tones = (tone,) if tone else (LEVEL_TONE,) + STOP_TONES if any_tone else (LEVEL_TONE,)
+            if any(transitions[state].get(t) in self._finals for t in tones):
+                ends.append(position + 1)
+        return ends
+
+    def is_impossible(self, word: str) -> bool:
+        """
+        Từ chắc chắn không phải tiếng Việt (dùng trước các fallback tốn kém như pyvi, LLM)
+
+        Từ ghép ('giáo_viên', 'giáo viên') hợp lệ khi mọi âm tiết hợp lệ. Token có
+        chữ số/ký tự không phải chữ cái và từ viết tắt viết hoa toàn bộ ('AI', 'GPU')
+        không được phân loại (trả về False) để các bước sau quyết định.
+        """
+        if word.isupper() and len(word) > 1:
+            return False
+        parts = word.replace('_', ' ').split()
+        if not parts or not all(part.isalpha() for part in parts):
+            return False
+        return not all(self.is_valid(part) for part in parts)
+
+# Tạo instance global
+syllable_validator = SyllableValidator()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from accent_restorer import AccentRestorer, restore_file
+from ngram_model import NgramLanguageModel, sentence_tokens
+
+CORPUS = [
+    'Kinh tế Việt Nam đang đứng trước nguy cơ suy thoái.',
+    'Tôi đang học ở trường.',
+    'Cô giáo đang dạy học.',
+    'Năm nay tôi học năm hai.',
+]
+
+class TestAccentRestorer(unittest.TestCase):
+
+    def setUp(self):
+        self.model = NgramLanguageModel.train(s for line in CORPUS * 3 for s in sentence_tokens(line))
+        self.restorer = AccentRestorer(self.model, beam_width=4)
+
+    def test_restore_sentence(self):
+        """Test khôi phục dấu cả câu, giữ dấu câu và kiểu viết hoa"""
+        self.assertEqual(self.restorer.restore('kinh te viet nam dang dung truoc nguy co suy thoai'),
+                         'kinh tế việt nam đang đứng trước nguy cơ suy thoái')
+        self.assertEqual(self.restorer.restore('Toi dang hoc o truong. Co giao dang day hoc!'),
+                         'Tôi đang học ở trường. Cô giáo đang dạy học!')
+
+    def test_context_disambiguation(self):
+        """Test cùng dạng không dấu được chọn theo ngữ cảnh ('nam' -> 'năm' hoặc 'nam')"""
+        self.assertEqual(self.restorer.restore('nam nay toi hoc nam hai'), 'năm nay tôi học năm hai')
+        self.assertEqual(self.restorer.restore('viet nam'), 'việt nam')
+
+    def test_keep_tokens(self):
+        """Test giữ nguyên âm tiết đã có dấu, số và từ lạ"""
+        self.assertEqual(self.restorer.restore('Tôi hoc 2 năm ở xyz'), 'Tôi học 2 năm ở xyz')
+
+    def test_restore_file(self):
+        """Test xử lý file theo lô giữ thứ tự dòng"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = os.path.join(tmpdir, 'lm.bin')
+            self.model.save(model_path)
+            input_path = os.path.join(tmpdir, 'input.txt')
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write('toi dang hoc\ncô giao day hoc\n\nnam hai\n')
+            output_path = os.path.join(tmpdir, 'output.txt')
+            self.assertEqual(restore_file(input_path, output_path, model_path, workers=2,
+                                          batch_size=2, verbose=False), 4)
+            with open(output_path, encoding='utf-8') as f:
+                self.assertEqual(f.read().split('\n')[:4], ['tôi đang học', 'cô giáo dạy học', '', 'năm hai'])
+
+if __name__ == '__main__':
+    unittest.main()
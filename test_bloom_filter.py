@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from benchmark_lexicon import generate_words
+from bloom_filter import BloomFilter
+from spell_checker import VietnameseSpellChecker
+from vietnamese_dictionary import VietnameseDictionary
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        """Test mọi từ đã thêm đều được nhận là 'có thể có'"""
+        words = generate_words(5000)
+        bloom = BloomFilter.from_words(words, 0.01)
+        for word in words:
+            self.assertIn(word, bloom)
+
+    def test_false_positive_rate(self):
+        """Test tỷ lệ dương tính giả gần với cấu hình"""
+        words = set(generate_words(20000, seed=1))
+        others = [w + 'x' for w in generate_words(20000, seed=2) if w + 'x' not in words]
+        for rate in (0.01, 0.05):
+            bloom = BloomFilter.from_words(words, rate)
+            measured = sum(1 for w in others if w in bloom) / len(others)
+            self.assertLess(measured, rate * 2)
+        self.assertLess(BloomFilter.from_words(words, 0.001).false_positive_rate(len(words)), 0.002)
+        with self.assertRaises(ValueError):
+            BloomFilter.optimal_parameters(10, 1.5)
+
+    def test_serialized_with_dictionary(self):
+        """Test Bloom filter được lưu cùng file từ điển nhị phân"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'dictionary.bin')
+            VietnameseDictionary().save(path)
+            dictionary = VietnameseDictionary.from_file(path)
+            self.assertIsNotNone(dictionary.bloom_filter)
+            for word in ['tôi', 'Học_Sinh', 'toi']:
+                self.assertTrue(dictionary.might_contain(word), word)
+            self.assertFalse(dictionary.might_contain('tôiiii'))
+            # Từ thêm lúc chạy được thêm vào bộ lọc (bản sao khỏi mmap chỉ đọc)
+            dictionary.add_word('chatbot')
+            self.assertTrue(dictionary.might_contain('chatbot'))
+
+    def test_checker_skips_fallbacks(self):
+        """Test từ chắc chắn không có trong từ điển không đi qua pyvi/LLM"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write('phần mềm\n')
+            path = f.name
+        try:
+            checker = VietnameseSpellChecker()
+            checker.vietnamese_dict = VietnameseDictionary(lexicon_path=path)
+            self.assertTrue(checker._is_correct_word('phần_mềm'))
+            self.assertFalse(checker._is_correct_word('tôii'))
+            self.assertFalse(checker._is_correct_word('toi'))
+        finally:
+            os.unlink(path)
+
+if __name__ == '__main__':
+    unittest.main()
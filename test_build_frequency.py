@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from collections import Counter
+from build_frequency import BoundedCounter, build_frequency, iter_chunk_lines, plan_chunks
+from vietnamese_dictionary import VietnameseDictionary
+
+CORPUS_LINES = [
+    "Tôi đang học ở trường đại học",
+    "tôi là sinh viên, tôi thích học",
+    "Giáo viên dạy học sinh ở trường",
+] * 50
+
+class TestBuildFrequency(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.corpus_path = os.path.join(self.tmpdir.name, 'corpus.txt')
+        with open(self.corpus_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(CORPUS_LINES) + '\n')
+        self.expected = Counter(w for line in CORPUS_LINES for w in line.lower().replace(',', ' ').split())
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_chunks_cover_every_line_once(self):
+        """Test chia đoạn theo byte không làm mất hoặc lặp dòng"""
+        lines = []
+        for path, start, end in plan_chunks([self.corpus_path], 37):
+            lines.extend(line.rstrip('\n') for line in iter_chunk_lines(path, start, end))
+        self.assertEqual(lines, CORPUS_LINES)
+
+    def test_build_exact_counts(self):
+        """Test đếm chính xác khi không vượt giới hạn bộ nhớ"""
+        output = os.path.join(self.tmpdir.name, 'freq.bin')
+        frequency = build_frequency([self.corpus_path], output, workers=2, chunk_mb=1,
+                                    min_count=1, verbose=False)
+        self.assertEqual(frequency, self.expected)
+
+        dictionary = VietnameseDictionary(frequency_path=output)
+        self.assertIsNone(dictionary._word_frequency)
+        self.assertEqual(dictionary.word_frequency['tôi'], self.expected['tôi'])
+        self.assertEqual(dictionary.word_frequency.get('không có', 0), 0)
+
+    def test_lexicon_compounds(self):
+        """Test đếm thêm từ ghép có trong lexicon"""
+        lexicon_path = os.path.join(self.tmpdir.name, 'lexicon.txt')
+        with open(lexicon_path, 'w', encoding='utf-8') as f:
+            f.write('sinh viên\ngiáo viên\nđại học\n')
+        output = os.path.join(self.tmpdir.name, 'freq.bin')
+        frequency = build_frequency([self.corpus_path], output, workers=1, lexicon_path=lexicon_path,
+                                    verbose=False)
+        self.assertEqual(frequency['sinh viên'], 50)
+        self.assertEqual(frequency['đại học'], 50)
+
+    def test_bounded_counter(self):
+        """Test giới hạn số khóa, giữ chính xác các từ phổ biến"""
+        counter = BoundedCounter(max_entries=10)
+        for i in range(100):
+            counter.update(['tôi', 'là'] + [f'hiếm{i}'])
+        self.assertLessEqual(len(counter.counts), 10)
+        self.assertEqual(counter.counts['tôi'], 100)
+        self.assertGreaterEqual(counter.error_bound, 1)
+
+    def test_bounded_counter_error_bound(self):
+        """Từ bị bỏ rồi đếm lại nhiều lần: số lần đếm thiếu không vượt error_bound"""
+        counter = BoundedCounter(max_entries=4)
+        true_count = 0
+        for i in range(200):
+            tokens = [f'nhiễu{i}-{j}' for j in range(3)]
+            if i % 3 == 0:
+                tokens.append('hiếm')
+                true_count += 1
+            counter.update(tokens)
+        self.assertLessEqual(true_count - counter.counts['hiếm'], counter.error_bound)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from context_features import ContextFeatureExtractor, KeywordAutomaton, context_extractor
+from profile_context import EagerExtractor, generate_texts, profile
+
+class TestContextFeatures(unittest.TestCase):
+
+    def test_keyword_automaton(self):
+        """Test automaton tìm mọi cụm (kể cả chồng lấn) trong một lượt"""
+        automaton = KeywordAutomaton([('kinh doanh', 1), ('doanh nghiệp', 2), ('nghiệp', 4), ('a b c', 8)])
+        state, found = 0, 0
+        for syllable in 'công ty kinh doanh nghiệp a b a b c'.split():
+            state, matched = automaton.feed(state, syllable)
+            found |= matched
+        self.assertEqual(found, 15)
+
+    def test_extract(self):
+        """Test toàn bộ context được tính trong một lượt"""
+        words = ['Tôi', 'đang', 'học', 'ở', 'trường', 'Đại_học', 'Bách_Khoa', 'Hà_Nội', 'năm', 'nay', '?']
+        context = context_extractor.extract(' '.join(words), words)
+        self.assertEqual(context['sentence_type'], 'question')
+        self.assertEqual(context['subject_verb_patterns'], [('Tôi', 'đang')])
+        self.assertEqual(context['proper_nouns'], ['Tôi', 'Đại_học', 'Bách_Khoa', 'Hà_Nội'])
+        self.assertTrue(context['academic_context'])
+        self.assertTrue(context['education_context'])
+        self.assertFalse(context['business_context'])
+        self.assertEqual(context['word_relationships']['action_words'], ['đang', 'học'])
+        self.assertEqual(context['word_relationships']['object_words'], ['trường'])
+        self.assertEqual(context['semantic_groups']['education'], ['học', 'trường'])
+        self.assertEqual(context['semantic_groups']['time'], ['năm'])
+        self.assertEqual(context['semantic_groups']['location'], ['ở'])
+
+    def test_compound_tokens_and_boundaries(self):
+        """Test cụm từ khóa khớp qua từ ghép của pyvi nhưng không qua dấu câu"""
+        context = context_extractor.extract('', ['Công_ty', 'thị', 'trường'])
+        self.assertTrue(context['business_context'])
+        self.assertTrue(context['academic_context'])
+        context = context_extractor.extract('', ['kinh', ',', 'doanh'])
+        self.assertFalse(context['business_context'])
+
+    def test_lazy_features(self):
+        """Test đặc trưng chỉ được tính khi được đọc và được ghi nhớ"""
+        words = ['Tôi', 'học', 'kinh', 'doanh']
+        context = context_extractor.extract(' '.join(words), words)
+        self.assertEqual(context._values, {})
+        self.assertEqual(context['proper_nouns'], ['Tôi'])
+        self.assertEqual(set(context._values), {'proper_nouns'})
+        self.assertTrue(context['business_context'])
+        self.assertEqual(set(context._values), {'proper_nouns', 'academic_context', 'business_context',
+                                                'education_context'})
+        self.assertIs(context['proper_nouns'], context['proper_nouns'])
+        self.assertEqual(context.get('text', ''), '')
+        self.assertEqual(len(dict(context)), len(context))
+
+    def test_profile_eager_matches_lazy(self):
+        """Test profile_context: bản eager chạy được với checker hiện tại và cho cùng lỗi với lazy"""
+        texts = generate_texts(20)
+        checker = CategorizedVietnameseSpellChecker()
+        checker.context_extractor = EagerExtractor()
+        eager_errors = profile(checker, texts, 'Eager', verbose=False)
+        checker.context_extractor = context_extractor
+        lazy_errors = profile(checker, texts, 'Lazy', verbose=False)
+        self.assertEqual(eager_errors, lazy_errors)
+        self.assertTrue(any(eager_errors))
+
+    def test_custom_tables(self):
+        """Test thêm lĩnh vực/nhóm mới chỉ cần thêm vào bảng"""
+        extractor = ContextFeatureExtractor(
+            context_keywords={'medical_context': ['bệnh viện', 'bác sĩ']},
+            semantic_groups={'medical': ['thuốc', 'bệnh_viện']})
+        context = extractor.extract('', ['Bệnh_viện', 'cấp', 'thuốc'])
+        self.assertTrue(context['medical_context'])
+        self.assertEqual(context['semantic_groups'], {'medical': ['Bệnh_viện', 'thuốc']})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from lexicon_store import OverlayLexicon
+from vietnamese_dictionary import VietnameseDictionary
+
+class TestDictionaryUpdates(unittest.TestCase):
+
+    def setUp(self):
+        """Tạo thư mục tạm cho log cập nhật"""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmpdir.name, 'dictionary.log')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_add_and_remove_word(self):
+        """Test thêm/xóa từ lúc chạy"""
+        dictionary = VietnameseDictionary(log_path=self.log_path)
+        self.assertFalse(dictionary.is_correct_word('Vinfast'))
+        self.assertTrue(dictionary.add_word('VinFast', frequency=50))
+        self.assertFalse(dictionary.add_word('vinfast'))
+        self.assertTrue(dictionary.is_correct_word('vinfast'))
+        self.assertEqual(dictionary.word_frequency['vinfast'], 50)
+        self.assertIn('vinfast', dictionary.words_with_prefix('vinf'))
+
+        self.assertTrue(dictionary.remove_word('tôi'))
+        self.assertFalse(dictionary.is_correct_word('tôi'))
+        self.assertFalse(dictionary.remove_word('tôi'))
+        self.assertIsInstance(dictionary.words, OverlayLexicon)
+
+    def test_log_replayed_on_startup(self):
+        """Test log append-only được phát lại khi khởi tạo"""
+        dictionary = VietnameseDictionary(log_path=self.log_path)
+        dictionary.add_word('Phạm Nhật Vượng')
+        dictionary.remove_word('bàn')
+        dictionary.set_frequency('ghế', 999)
+        dictionary.remove_frequency('tôi')
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "add", "wo')  # dòng ghi dở
+
+        reloaded = VietnameseDictionary(log_path=self.log_path)
+        self.assertTrue(reloaded.is_correct_word('phạm nhật vượng'))
+        self.assertFalse(reloaded.is_correct_word('bàn'))
+        self.assertEqual(reloaded.word_frequency['ghế'], 999)
+        self.assertNotIn('tôi', reloaded.word_frequency)
+        with open(self.log_path, 'r', encoding='utf-8') as f:
+            self.assertEqual(json.loads(f.readline()), {'op': 'add', 'word': 'phạm nhật vượng'})
+
+    def test_mmap_dictionary_updates(self):
+        """Test cập nhật từ điển mmap không cần dựng lại file"""
+        path = os.path.join(self.tmpdir.name, 'dictionary.bin')
+        VietnameseDictionary().save(path)
+        dictionary = VietnameseDictionary.from_file(path, log_path=self.log_path)
+        dictionary.add_word('chatbot', frequency=7)
+        dictionary.remove_word('tôi')
+        self.assertTrue(dictionary.is_correct_word('chatbot'))
+        self.assertFalse(dictionary.is_correct_word('tôi'))
+        self.assertEqual(dictionary.word_frequency['chatbot'], 7)
+        self.assertEqual(len(dictionary.words), len(VietnameseDictionary().words))
+
+    def test_suggestion_table_refreshed(self):
+        """Test bảng gợi ý tính sẵn được cập nhật theo từ điển"""
+        checker = CategorizedVietnameseSpellChecker()
+        checker.vietnamese_dict = VietnameseDictionary()
+        checker.vietnamese_dict.add_update_listener(checker._on_dictionary_update)
+        checker.suggestion_table.warm(checker._compute_suggestions, ['vinfastt', 'toi'])
+        self.assertNotIn('vinfast', checker.get_suggestions('vinfastt'))
+
+        checker.vietnamese_dict.add_word('vinfast', frequency=10000)
+        self.assertEqual(checker.get_suggestions('vinfastt')[0], 'vinfast')
+        for word in ['vinfastt', 'toi']:
+            self.assertEqual(checker.get_suggestions(word), checker._compute_suggestions(word))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import unittest
+import edit_distance
+
+class TestEditDistance(unittest.TestCase):
+
+    def test_levenshtein(self):
+        """Test khoảng cách Levenshtein thường"""
+        self.assertEqual(edit_distance.distance('tôi', 'tôi'), 0)
+        self.assertEqual(edit_distance.distance('tôii', 'tôi'), 1)
+        self.assertEqual(edit_distance.distance('', 'học'), 3)
+        self.assertEqual(edit_distance.distance('kitten', 'sitting', diacritic_cost=1), 3)
+
+    def test_transposition(self):
+        """Test đổi chỗ hai ký tự liền kề (Damerau)"""
+        self.assertEqual(edit_distance.distance('trogn', 'trong'), 1)
+        self.assertEqual(edit_distance.distance('trogn', 'trong', transpositions=False), 2)
+
+    def test_diacritic_cost(self):
+        """Test lỗi chỉ khác dấu có chi phí thấp hơn"""
+        self.assertEqual(edit_distance.distance('toi', 'tôi'), edit_distance.DIACRITIC_COST)
+        self.assertEqual(edit_distance.distance('dang', 'đang'), edit_distance.DIACRITIC_COST)
+        self.assertEqual(edit_distance.distance('toi', 'tôi', diacritic_cost=1), 1)
+        self.assertEqual(edit_distance.strip_diacritics('Việt Nam đẹp'), 'Viet Nam dep')
+
+    def test_bounded_early_exit(self):
+        """Test dừng sớm khi vượt giới hạn"""
+        self.assertEqual(edit_distance.bounded_distance('tôi', 'trường học', 2), math.inf)
+        self.assertEqual(edit_distance.bounded_distance('abcdef', 'uvwxyz', 2), math.inf)
+        self.assertEqual(edit_distance.bounded_distance('tôii', 'tôi', 1), 1)
+
+    def test_similarity(self):
+        """Test độ tương đồng và ngưỡng"""
+        self.assertEqual(edit_distance.similarity('tôi', 'tôi'), 1.0)
+        self.assertGreater(edit_distance.similarity('tôii', 'tôi'), 0.7)
+        self.assertTrue(edit_distance.is_similar('toi', 'tôi', 0.7))
+        self.assertFalse(edit_distance.is_similar('tôi', 'bạn', 0.7))
+        for word1, word2 in [('tôii', 'tôi'), ('nhàa', 'nhà'), ('abc', 'abd'), ('học', 'hoc')]:
+            self.assertEqual(edit_distance.is_similar(word1, word2, 0.7),
+                             edit_distance.similarity(word1, word2) > 0.7)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from lattice_decoder import LatticeDecoder
+from ngram_model import NgramLanguageModel
+from vietnamese_dictionary import VietnameseDictionary
+
+class TestLatticeDecoder(unittest.TestCase):
+
+    def setUp(self):
+        self.dictionary = VietnameseDictionary()
+        self.model = NgramLanguageModel.train([['tôi', 'đi', 'học']] * 5 + [['tối', 'nay', 'trời', 'mưa']] * 2)
+
+    def test_multi_syllable_rule(self):
+        """Test rule nhiều âm tiết được áp dụng cho cả đoạn, giữ dấu câu và viết hoa"""
+        decoder = LatticeDecoder(self.dictionary, rule_index={'viet nam': [(0, 'Việt Nam')], 'toi': [(1, 'tôi')]})
+        result = decoder.decode('Toi yêu viet nam!', beam_width=2)
+        self.assertEqual(result['corrected_text'], 'Tôi yêu Việt Nam!')
+        self.assertEqual([(c['word'], c['position'], c['source']) for c in result['corrections']],
+                         [('Toi', 0, 'rule'), ('viet nam', 8, 'rule')])
+
+    def test_diacritics_by_context(self):
+        """Test ứng viên cùng dạng không dấu được chọn theo mô hình ngôn ngữ"""
+        decoder = LatticeDecoder(self.dictionary, language_model=self.model)
+        self.assertEqual(decoder.decode('toi di hoc', beam_width=4)['corrected_text'], 'tôi đi học')
+        self.assertEqual(decoder.decode('Tôi đi học.', beam_width=4)['corrections'], [])
+
+    def test_beam_width_tradeoff(self):
+        """Test beam hẹp chọn tham lam, beam rộng tìm được chuỗi tốt hơn cho cả câu"""
+        decoder = LatticeDecoder(self.dictionary, language_model=self.model)
+        self.assertEqual(decoder.decode('toi nay', beam_width=1)['corrected_text'], 'tôi nay')
+        self.assertEqual(decoder.decode('toi nay', beam_width=4)['corrected_text'], 'tối nay')
+
+    def test_checker_uses_decoder(self):
+        """Test check_text dùng decoder khi có beam_width, mặc định giữ cách sửa tuần tự"""
+        checker = CategorizedVietnameseSpellChecker()
+        result = checker.check_text('Tôi đang học AI ở trun tâm AI viet nam', beam_width=4)
+        self.assertEqual(result['corrected_text'], 'Tôi đang học AI ở trung tâm AI Việt Nam')
+        self.assertEqual(result['decoder']['beam_width'], 4)
+        self.assertNotIn('decoder', checker.check_text('Tôi đang học', beam_width=0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from lexicon_store import CompactLexicon, compound_key
+from vietnamese_dictionary import VietnameseDictionary
+
+class TestCompactLexicon(unittest.TestCase):
+
+    def setUp(self):
+        """Tạo lexicon nhỏ cho test"""
+        self.words = ['tôi', 'trường', 'trường học', 'trung tâm', 'học', 'Học Sinh', 'tôi']
+        self.lexicon = CompactLexicon.from_words(self.words)
+
+    def test_membership(self):
+        """Test tra cứu từ"""
+        for word in ['tôi', 'trường', 'trường học', 'học sinh']:
+            self.assertIn(word, self.lexicon)
+        for word in ['tôii', 'trườn', 'a', '', 'zzz']:
+            self.assertNotIn(word, self.lexicon)
+
+    def test_enumeration(self):
+        """Test liệt kê theo thứ tự và loại trùng"""
+        words = list(self.lexicon)
+        self.assertEqual(len(words), len(self.lexicon))
+        self.assertEqual(len(words), 6)
+        self.assertEqual(words, sorted(words, key=lambda w: w.encode('utf-8')))
+
+    def test_prefix_query(self):
+        """Test truy vấn tiền tố"""
+        self.assertEqual(self.lexicon.words_with_prefix('trư'), ['trường', 'trường học'])
+        self.assertEqual(self.lexicon.words_with_prefix('tr', limit=1), ['trung tâm'])
+        self.assertEqual(self.lexicon.words_with_prefix('xyz'), [])
+
+    def test_dictionary_with_lexicon_file(self):
+        """Test VietnameseDictionary tải lexicon ngoài"""
+        with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False, encoding='utf-8') as f:
+            f.write('# lexicon test\nphần mềm\nnghiên cứu\n')
+            path = f.name
+        try:
+            dictionary = VietnameseDictionary(lexicon_path=path)
+            self.assertIsInstance(dictionary.words, CompactLexicon)
+            self.assertTrue(dictionary.is_correct_word('Nghiên cứu'))
+            # Từ điển cơ bản vẫn được giữ
+            self.assertTrue(dictionary.is_correct_word('tôi'))
+            self.assertIn('phần mềm', dictionary.words_with_prefix('phần'))
+        finally:
+            os.unlink(path)
+
+    def test_compound_key(self):
+        """Test khóa chuẩn chung cho từ ghép của pyvi và từ điển"""
+        self.assertEqual(compound_key('Giáo_Viên'), 'giáo viên')
+        self.assertEqual(compound_key(' trường   học '), 'trường học')
+        self.assertIn(compound_key('trường_học'), self.lexicon)
+
+    def test_dictionary_accepts_tokenizer_compounds(self):
+        """Test từ ghép dạng 'giáo_viên' của ViTokenizer có trong từ điển"""
+        dictionary = VietnameseDictionary()
+        for word in ['giáo_viên', 'Ngân_hàng', 'học_sinh']:
+            self.assertTrue(dictionary.is_correct_word(word), word)
+        self.assertFalse(dictionary.is_correct_word('giáo_viênn'))
+        self.assertTrue(dictionary.is_common_error('sinh_diên'))
+
+if __name__ == '__main__':
+    unittest.main()
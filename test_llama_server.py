@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+import requests
+from llama_server import LlamaServer, LlamaServerError
+from test_support import free_port
+
+# llama-server giả: ghi nhiều log (hơn bộ đệm của pipe), /health trả 503 trong LOAD_TIME giây
+# (đang nạp model) rồi 200; /crash làm tiến trình thoát; model tên 'missing' thì thoát ngay
+FAKE_SERVER = '''#!{python}
+import json, os, sys, time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+if args['-m'] == 'missing':
+    print('error: failed to load model', file=sys.stderr)
+    sys.exit(1)
+for i in range(2000):
+    print('llama_model_loader: tensor', i, 'x' * 100, file=sys.stderr if i % 2 else sys.stdout)
+started = time.monotonic()
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+    def do_GET(self):
+        if self.path == '/crash':
+            os._exit(3)
+        loading = time.monotonic() - started < {load_time}
+        data = json.dumps({{'status': 'loading model' if loading else 'ok', 'pid': os.getpid()}}).encode()
+        self.send_response(503 if loading else 200)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+HTTPServer(('127.0.0.1', int(args['--port'])), Handler).serve_forever()
+'''
+LOAD_TIME = 0.5
+
+
+class TestLlamaServer(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.binary = os.path.join(self.directory.name, 'llama-server')
+        with open(self.binary, 'w') as f:
+            f.write(FAKE_SERVER.format(python=sys.executable, load_time=LOAD_TIME))
+        os.chmod(self.binary, os.stat(self.binary).st_mode | stat.S_IEXEC)
+        self.log_path = os.path.join(self.directory.name, 'llama-server.log')
+        self.server_url = f'http://127.0.0.1:{free_port()}'
+        self.server = None
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.terminate()
+        self.directory.cleanup()
+
+    def make_server(self, model_path: str = 'model.gguf', **kwargs) -> LlamaServer:
+        self.server = LlamaServer(model_path, self.server_url, binary=self.binary, log_path=self.log_path,
+                                  startup_timeout=10, restart_backoff=0.1, **kwargs)
+        return self.server
+
+    def pid(self) -> int:
+        return requests.get(f'{self.server_url}/health', timeout=2).json()['pid']
+
+    def test_start_waits_for_model_load(self):
+        server = self.make_server().start()
+        # Khởi động bằng thời gian nạp model (không phải một khoảng sleep cố định)
+        self.assertGreaterEqual(server.startup_time, LOAD_TIME)
+        self.assertLess(server.startup_time, LOAD_TIME + 2)
+        self.assertIsNone(server.poll())
+        self.assertEqual(self.pid(), server.process.pid)
+
+        # Log được ghi ra file nên tiến trình con không bị chặn vì pipe đầy
+        with open(self.log_path) as f:
+            log = f.read()
+        self.assertIn('llama_model_loader: tensor 1999', log)
+
+        server.terminate()
+        self.assertIsNotNone(server.poll())
+
+    def test_restart_on_crash(self):
+        server = self.make_server().start()
+        first_pid = server.process.pid
+        with self.assertRaises(requests.ConnectionError):
+            requests.get(f'{self.server_url}/crash', timeout=2)
+
+        for _ in range(100):
+            if server.restarts and server.client.health():
+                break
+            time.sleep(0.1)
+        self.assertEqual(server.restarts, 1)
+        self.assertNotEqual(self.pid(), first_pid)
+
+    def test_start_failure(self):
+        start = time.monotonic()
+        with self.assertRaises(LlamaServerError):
+            self.make_server('missing').start()
+        self.assertLess(time.monotonic() - start, 5)
+        with open(self.log_path) as f:
+            self.assertIn('failed to load model', f.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
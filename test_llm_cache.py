@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from llm_cache import LLMCache
+
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'llm.sqlite')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_set(self):
+        cache = LLMCache(self.path)
+        cache.set('verify', 1, 'Zalo', True, context='Tôi  dùng zalo.')
+        cache.set('suggest', 1, 'trogn', ['trong', 'trông'])
+
+        # Khóa chuẩn hóa từ/ngữ cảnh; phiên bản prompt và ngữ cảnh khác là khóa khác
+        self.assertTrue(cache.get('verify', 1, 'zalo', 'tôi dùng Zalo.'))
+        self.assertIsNone(cache.get('verify', 2, 'zalo', 'tôi dùng Zalo.'))
+        self.assertIsNone(cache.get('verify', 1, 'zalo', 'Zalo rất phổ biến.'))
+        self.assertEqual(cache.get('suggest', 1, 'trogn'), ['trong', 'trông'])
+
+        # Dữ liệu nằm trên đĩa: mở lại (như sau khi khởi động lại) vẫn còn
+        self.assertEqual(LLMCache(self.path).get('suggest', 1, 'trogn'), ['trong', 'trông'])
+
+    def test_ttl_and_size_limit(self):
+        cache = LLMCache(self.path, ttl=0.2, max_entries=3)
+        for i in range(5):
+            cache.set('suggest', 1, f'w{i}', [str(i)])
+        self.assertEqual(cache.prune(), 2)
+        self.assertIsNone(cache.get('suggest', 1, 'w0'))
+        self.assertEqual(cache.get('suggest', 1, 'w4'), ['4'])
+
+        time.sleep(0.3)
+        self.assertIsNone(cache.get('suggest', 1, 'w4'))
+        cache.prune()
+        self.assertEqual(len(cache), 0)
+
+    def test_shared_between_processes(self):
+        script = ('import sys; from llm_cache import LLMCache; '
+                  'LLMCache(sys.argv[1]).set("verify", 1, "blockchain", True)')
+        subprocess.run([sys.executable, '-c', script, self.path], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertTrue(LLMCache(self.path).get('verify', 1, 'blockchain'))
+
+
+if __name__ == '__main__':
+    unittest.main()
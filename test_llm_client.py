@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import threading
+import time
+import unittest
+import requests
+from llm_client import AsyncLLMClient, LLMClient, LLMError
+from test_support import FakeServerTestCase
+
+# llama-server giả: {'key', 'fail', 'sleep'} -> trả 503 cho 'fail' lần đầu của mỗi key,
+# ngủ 'sleep' giây; GET /health trả số request đồng thời tối đa đã thấy
+FAKE_SERVER = '''
+import json, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+lock = threading.Lock()
+state = {'attempts': {}, 'inflight': 0, 'max_inflight': 0}
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    def log_message(self, *args):
+        pass
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    def do_GET(self):
+        if self.path == '/reset':
+            state.update(attempts={}, max_inflight=0)
+        self._reply(200, state)
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with lock:
+            attempt = state['attempts'][request['key']] = state['attempts'].get(request['key'], 0) + 1
+            state['inflight'] += 1
+            state['max_inflight'] = max(state['max_inflight'], state['inflight'])
+        time.sleep(request.get('sleep', 0))
+        with lock:
+            state['inflight'] -= 1
+        if attempt <= request.get('fail', 0):
+            return self._reply(503, {'error': 'loading'})
+        self._reply(200, {'content': request['key']})
+ThreadingHTTPServer(('127.0.0.1', int(sys.argv[1])), Handler).serve_forever()
+'''
+
+
+class TestLLMClient(FakeServerTestCase):
+
+    FAKE_SERVER = FAKE_SERVER
+
+    def setUp(self):
+        # Chờ các request bị bỏ dở (hết deadline) của test trước kết thúc phía server
+        for _ in range(100):
+            if requests.get(f'{self.server_url}/reset').json()['inflight'] == 0:
+                break
+            time.sleep(0.05)
+        self.client = LLMClient(self.server_url, max_concurrency=2, timeout=5, retries=2, backoff=0.01)
+
+    def tearDown(self):
+        self.client.close()
+
+    def stats(self):
+        return requests.get(f'{self.server_url}/health').json()
+
+    def test_retry_on_transient_error(self):
+        self.assertEqual(self.client.complete({'key': 'a', 'fail': 2})['content'], 'a')
+        self.assertEqual(self.stats()['attempts']['a'], 3)
+
+        # Hết lượt thử lại: lỗi được báo bằng LLMError
+        with self.assertRaises(LLMError):
+            self.client.complete({'key': 'b', 'fail': 5})
+        self.assertEqual(self.stats()['attempts']['b'], 3)
+
+    def test_deadline(self):
+        start = time.monotonic()
+        with self.assertRaises(LLMError):
+            self.client.complete({'key': 'slow', 'sleep': 2}, timeout=0.3)
+        self.assertLess(time.monotonic() - start, 1.5)
+
+        async_client = AsyncLLMClient(self.client)
+        start = time.monotonic()
+        with self.assertRaises(LLMError):
+            asyncio.run(async_client.complete({'key': 'slow-async', 'sleep': 2}, timeout=0.3))
+        self.assertLess(time.monotonic() - start, 1.5)
+        async_client.close()
+
+    def test_async_bounded_concurrency(self):
+        async_client = AsyncLLMClient(self.client)
+
+        async def run():
+            return await asyncio.gather(*(async_client.complete({'key': f'k{i}', 'sleep': 0.1, 'fail': i % 2})
+                                          for i in range(6)))
+
+        results = asyncio.run(run())
+        async_client.close()
+        self.assertEqual([r['content'] for r in results], [f'k{i}' for i in range(6)])
+        self.assertEqual(self.stats()['max_inflight'], 2)
+
+    def test_sync_and_async_share_slots(self):
+        # Caller đồng bộ và async dùng chung giới hạn của LLMClient
+        async_client = AsyncLLMClient(self.client)
+        sync_callers = [threading.Thread(target=self.client.complete, args=({'key': f's{i}', 'sleep': 0.1},))
+                        for i in range(4)]
+        for thread in sync_callers:
+            thread.start()
+
+        async def run():
+            return await asyncio.gather(*(async_client.complete({'key': f'a{i}', 'sleep': 0.1}) for i in range(4)))
+
+        asyncio.run(run())
+        for thread in sync_callers:
+            thread.join()
+        async_client.close()
+        self.assertEqual(self.stats()['max_inflight'], 2)
+
+    def test_zero_timeout(self):
+        # timeout=0 là deadline đã hết, không phải "dùng timeout mặc định"
+        with self.assertRaises(LLMError):
+            self.client.complete({'key': 'zero'}, timeout=0)
+        async_client = AsyncLLMClient(self.client)
+        with self.assertRaises(LLMError):
+            asyncio.run(async_client.complete({'key': 'zero-async'}, timeout=0))
+        async_client.close()
+        self.assertNotIn('zero', self.stats()['attempts'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import tempfile
+import unittest
+import requests
+from llm_cache import LLMCache
+from spell_checker import VietnameseSpellChecker
+from test_support import FakeServerTestCase
+
+# llama-server giả: /completion trả lời JSON theo json_schema, từ trong KNOWN là đúng;
+# câu trả lời bị cắt ở n_predict ký tự như khi server hết token
+FAKE_SERVER = '''
+import json, sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+KNOWN = {'blockchain', 'Công_nghệ', 'dùng', 'mỗi', 'mới', 'rất', 'và', 'zalo'}
+calls = []
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+    def _reply(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    def do_GET(self):
+        self._reply({'status': 'ok', 'calls': calls})
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if 'json_schema' not in request:
+            return self._reply({'content': ''})
+        words = request['json_schema']['required']
+        calls.append({'words': words, 'prompt': request['prompt']})
+        content = json.dumps({w: w in KNOWN for w in words}, ensure_ascii=False)
+        self._reply({'content': content[:request['n_predict']]})
+ThreadingHTTPServer(('127.0.0.1', int(sys.argv[1])), Handler).serve_forever()
+'''
+
+
+class LLMServerTestCase(FakeServerTestCase):
+    """Chạy FAKE_SERVER cho cả lớp test; mỗi test có một checker nối tới server đó"""
+
+    FAKE_SERVER = FAKE_SERVER
+
+    def setUp(self):
+        self.checker = VietnameseSpellChecker(server_url=self.server_url)
+        self.checker.server_process = self.server
+        self.start = len(self.calls())
+
+    def tearDown(self):
+        self.checker.server_process = None
+
+    def calls(self):
+        return requests.get(f'{self.server_url}/health').json()['calls']
+
+
+class TestLLMVerification(LLMServerTestCase):
+
+    def test_one_call_per_request(self):
+        # Mọi từ ngoài từ điển (kể cả 'zalo', 'blockchain', 'xoẻn') đi trong cùng một lần gọi
+        result = self.checker.check_text('Tôi dùng zalo. Công nghệ blockchain và xoẻn rất mới.')
+        calls = self.calls()[self.start:]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(calls[0]['words']),
+                         sorted(['Công_nghệ', 'blockchain', 'dùng', 'mới', 'rất', 'và', 'xoẻn', 'zalo']))
+        self.assertIn('Tôi dùng zalo.', calls[0]['prompt'])
+        self.assertIn('Công nghệ blockchain và xoẻn rất mới.', calls[0]['prompt'])
+        self.assertEqual([error['word'] for error in result['errors']], ['xoẻn'])
+
+    def test_foreign_words_not_rejected_by_rules(self):
+        # 'zalo', 'blockchain' không thể là âm tiết tiếng Việt nhưng tầng quy tắc không kết luận sai
+        result = self.checker.check_text('Tôi dùng zalo và blockchain xoẻn.')
+        errors = [error['word'] for error in result['errors']]
+        self.assertNotIn('zalo', errors)
+        self.assertNotIn('blockchain', errors)
+        self.assertIn('llm', result['tiers'])
+
+        # Không có server: không còn tầng nào kết luận được, từ không thể là tiếng Việt bị coi là sai
+        self.checker.server_process = None
+        result = self.checker.check_text('Tôi dùng zalo và blockchain xoẻn.')
+        self.assertEqual(sorted(error['word'] for error in result['errors']), ['blockchain', 'zalo'])
+
+    def test_cached_verdicts(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.checker.llm_cache = LLMCache(os.path.join(directory, 'llm.sqlite'))
+            text = 'Tôi dùng zalo.'
+            first = self.checker.check_text(text)
+            self.assertEqual(len(self.calls()), self.start + 1)
+
+            # Lần sau (cùng từ, cùng câu) lấy từ cache, kể cả ở checker mới mở lại file
+            self.checker.llm_cache = LLMCache(self.checker.llm_cache.path)
+            self.assertEqual(self.checker.check_text(text)['errors'], first['errors'])
+            self.assertEqual(len(self.calls()), self.start + 1)
+
+            # Câu khác là ngữ cảnh khác: hỏi lại LLM
+            self.checker.check_text('Zalo rất phổ biến.')
+            self.assertEqual(len(self.calls()), self.start + 2)
+
+    def test_budget_fits_long_compounds(self):
+        words = ['siêu_máy_tính_lượng_tử_thế_hệ_mới', 'trí_tuệ_nhân_tạo_tạo_sinh', 'zalo']
+        verdicts = self.checker._check_words_with_gpt(words)
+        self.assertEqual(verdicts, {words[0]: False, words[1]: False, 'zalo': True})
+        self.assertEqual(len(self.calls()), self.start + 1)
+
+    def test_truncated_answer(self):
+        # Câu trả lời bị cắt: giữ các cặp đã trọn vẹn, hỏi lại các từ còn thiếu
+        self.checker._verdict_budget = lambda words: 30
+        verdicts = self.checker._check_words_with_gpt(['zalo', 'blockchain', 'xoẻn'])
+        self.assertEqual(verdicts, {'zalo': True, 'blockchain': True, 'xoẻn': False})
+        calls = self.calls()[self.start:]
+        self.assertEqual([call['words'] for call in calls],
+                         [['zalo', 'blockchain', 'xoẻn'], ['blockchain', 'xoẻn'], ['xoẻn']])
+
+    def test_single_word(self):
+        self.assertTrue(self.checker._check_with_gpt('zalo'))
+        self.assertFalse(self.checker._check_with_gpt('xoẻn'))
+
+    def test_parse_verdicts(self):
+        content = 'Kết quả: {"zalo": true, "xoẻn": "SAI", "abc": 1}'
+        self.assertEqual(VietnameseSpellChecker._parse_verdicts(content, ['zalo', 'xoẻn', 'abc', 'thiếu']),
+                         {'zalo': True, 'xoẻn': False})
+        self.assertEqual(VietnameseSpellChecker._parse_verdicts('không phải JSON', ['zalo']), {})
+        self.assertEqual(VietnameseSpellChecker._parse_verdicts('{"zalo": true, "xo\\u1ebbn": false, "abc": tr',
+                                                                ['zalo', 'xoẻn', 'abc']),
+                         {'zalo': True, 'xoẻn': False})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from lexicon_store import CompactLexicon
+from vietnamese_dictionary import VietnameseDictionary, vietnamese_dict
+
+class TestMmapDictionary(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_roundtrip(self):
+        """Test file nhị phân giữ nguyên words, common_errors và word_frequency"""
+        path = os.path.join(self.tmpdir.name, 'builtin.bin')
+        vietnamese_dict.save(path)
+        dictionary = VietnameseDictionary.from_file(path)
+        self.assertIsInstance(dictionary.words, CompactLexicon)
+        self.assertEqual(set(dictionary.words), set(vietnamese_dict.words))
+        self.assertEqual(dict(dictionary.common_errors), vietnamese_dict.common_errors)
+        self.assertEqual(dict(dictionary.word_frequency), vietnamese_dict.word_frequency)
+        self.assertEqual(dictionary.get_correction('toi'), 'tôi')
+        self.assertEqual(dictionary.get_suggestions('tôii'), vietnamese_dict.get_suggestions('tôii'))
+
+    def test_invalid_file(self):
+        """Test file sai định dạng"""
+        path = os.path.join(self.tmpdir.name, 'invalid.bin')
+        with open(path, 'wb') as f:
+            f.write(b'not a dictionary file')
+        with self.assertRaises(ValueError):
+            VietnameseDictionary.from_file(path)
+
+if __name__ == '__main__':
+    unittest.main()
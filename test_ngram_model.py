@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import math
+import os
+import tempfile
+import unittest
+from ngram_model import NgramLanguageModel, sentence_tokens, syllables, train_language_model
+from smart_spell_checker import SmartVietnameseSpellChecker
+
+CORPUS = [
+    'Tôi đi học ở trường đại học.',
+    'Hôm nay tôi đi học sớm. Bạn tôi đi làm muộn.',
+    'Chúng tôi học tập và làm việc chăm chỉ.',
+    'Sinh viên học tập tại thư viện; giáo viên làm việc ở trường.',
+] * 5
+
+class TestNgramModel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = NgramLanguageModel.train(s for line in CORPUS for s in sentence_tokens(line))
+
+    def test_tokenization(self):
+        """Test tách câu và âm tiết giống nhau lúc huấn luyện và lúc tra"""
+        self.assertEqual(sentence_tokens('Tôi đi học. Năm 2024!'), [['tôi', 'đi', 'học'], ['năm', '<num>']])
+        self.assertEqual(syllables(['Đại_học', 'khó khăn,']), ['đại', 'học', 'khó', 'khăn'])
+
+    def test_rank_by_context(self):
+        """Test ứng viên hợp ngữ cảnh được xếp lên đầu"""
+        self.assertEqual(self.model.rank(['hộc', 'học', 'họp'], ['Tôi', 'đi'], ['ở', 'trường'])[0], 'học')
+        self.assertEqual(self.model.rank(['học', 'làm'], ['bạn', 'tôi', 'đi'], ['muộn'])[0], 'làm')
+        self.assertEqual(self.model.rank(['làm việc', 'học tập'], ['Chúng_tôi'], ['và'])[0], 'học tập')
+        # Không có thông tin thì giữ thứ tự cũ
+        self.assertEqual(self.model.rank(['xyz', 'abc'], [], []), ['xyz', 'abc'])
+
+    def test_quantized_logprobs(self):
+        """Test log-prob sau lượng tử hóa gần giá trị thật và backoff thấp hơn trigram"""
+        # 'tôi đi' được theo sau bởi 'học' 10 lần, 'làm' 5 lần; sai số tối đa nửa bước lượng tử
+        step = -self.model.floors[2] / 255
+        self.assertAlmostEqual(self.model.logprob('học', ['tôi', 'đi']), math.log10(2 / 3), delta=step / 2)
+        self.assertLess(self.model.logprob('học', ['giáo', 'viên']), self.model.logprob('học', ['tôi', 'đi']))
+        self.assertLess(self.model.logprob('abcxyz'), self.model.logprob('trường'))
+        usage = self.model.memory_usage()
+        self.assertEqual(usage['bigrams'], len(self.model.bigram_keys) * 9)
+
+    def test_train_save_load(self):
+        """Test huấn luyện từ file corpus, ghi file nhị phân và mở lại bằng mmap"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            corpus_path = os.path.join(tmpdir, 'corpus.txt')
+            with open(corpus_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(CORPUS))
+            model_path = os.path.join(tmpdir, 'lm.bin')
+            train_language_model([corpus_path], model_path, workers=1, min_count=1, verbose=False)
+            loaded = NgramLanguageModel.load(model_path)
+            self.assertEqual(len(loaded.trigram_keys), len(self.model.trigram_keys))
+            self.assertAlmostEqual(loaded.logprob('trường', ['ở']), self.model.logprob('trường', ['ở']))
+            self.assertEqual(loaded.rank(['hộc', 'học'], ['đi'], ['sớm']), ['học', 'hộc'])
+
+    def test_checker_ranks_suggestions(self):
+        """Test checker dùng mô hình để xếp hạng gợi ý khi được cấu hình"""
+        checker = SmartVietnameseSpellChecker()
+        words = ['Tôi', 'đi', 'học', 'ở', 'truong']
+        checker.language_model = None
+        self.assertEqual(checker._get_smart_suggestions('truong', words, 4)[0], 'trong')
+        checker.language_model = self.model
+        self.assertEqual(checker._get_smart_suggestions('truong', words, 4)[0], 'trường')
+
+if __name__ == '__main__':
+    unittest.main()
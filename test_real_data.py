@@ -8,6 +8,22 @@ Test Vietnamese Spell Checker với dữ liệu thực tế
 from spell_checker import VietnameseSpellChecker
 import time
 
+# Dữ liệu test từ user
+REAL_TEST_CASES = [
+    "côn viec kin doanh thì rất kho khan nên toi quyết dinh chuyển sang nghề khac",
+    "toi dang là sinh diên nam hai ở truong đạ hoc khoa jọc tự nhiên , trogn năm ke tiep toi sẽ chọn chuyen nganh về trí tue nana tạo",
+    "Tôi  đang học AI ở trun tam AI viet nam",
+    "Nhưng sức huỷ divt của cơn bão mitch vẫn chưa thấm vào đâu lsovớithảm hoạ tại Bangladesh ăm 1970",
+    "Lần này anh Phươngqyết xếp hàng mua bằng được 1 chiếc",
+    "một số chuyen gia tài chính ngâSn hànG của Việt Nam cũng chung quan điểmnày",
+    "Cac so liệu cho thay ngươi dân viet nam đang sống trong 1 cuôc sóng không duojc nhu mong đọi",
+    "Nefn kinh té thé giới đang đúng trươc nguyen co của mọt cuoc suy thoai",
+    "Khong phai tất ca nhưng gi chung ta thấy dideu là sụ that",
+    "chinh phủ luôn cố găng het suc để naggna cao chat luong nền giáo duc =cua nuoc nhà",
+    "nèn kinh te thé giới đang đứng trươc nguy co của mọt cuoc suy thoai",
+    "kinh tế viet nam dang dứng truoc 1 thoi ky đổi mơi chưa tung có tienf lệ trong lịch sử"
+]
+
 def test_real_data():
     """Test với dữ liệu thực tế từ user"""
     
@@ -17,21 +33,7 @@ def test_real_data():
     # Khởi tạo spell checker
     spell_checker = VietnameseSpellChecker()
     
-    # Dữ liệu test từ user
-    test_cases = [
-        "côn viec kin doanh thì rất kho khan nên toi quyết dinh chuyển sang nghề khac",
-        "toi dang là sinh diên nam hai ở truong đạ hoc khoa jọc tự nhiên , trogn năm ke tiep toi sẽ chọn chuyen nganh về trí tue nana tạo",
-        "Tôi  đang học AI ở trun tam AI viet nam",
-        "Nhưng sức huỷ divt của cơn bão mitch vẫn chưa thấm vào đâu lsovớithảm hoạ tại Bangladesh ăm 1970",
-        "Lần này anh Phươngqyết xếp hàng mua bằng được 1 chiếc",
-        "một số chuyen gia tài chính ngâSn hànG của Việt Nam cũng chung quan điểmnày",
-        "Cac so liệu cho thay ngươi dân viet nam đang sống trong 1 cuôc sóng không duojc nhu mong đọi",
-        "Nefn kinh té thé giới đang đúng trươc nguyen co của mọt cuoc suy thoai",
-        "Khong phai tất ca nhưng gi chung ta thấy dideu là sụ that",
-        "chinh phủ luôn cố găng het suc để naggna cao chat luong nền giáo duc =cua nuoc nhà",
-        "nèn kinh te thé giới đang đứng trươc nguy co của mọt cuoc suy thoai",
-        "kinh tế viet nam dang dứng truoc 1 thoi ky đổi mơi chưa tung có tienf lệ trong lịch sử"
-    ]
+    test_cases = REAL_TEST_CASES
     
     total_errors = 0
     total_words = 0
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from suggestion_table import SuggestionTable, rule_triggers
+
+class TestSuggestionTable(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.checker = CategorizedVietnameseSpellChecker()
+        cls.checker.warm_suggestion_table()
+
+    def test_rule_triggers(self):
+        """Test lấy từ kích hoạt từ pattern literal"""
+        triggers = rule_triggers({'tone_errors': {r'\btoi\b': 'tôi', r'\bkho khan\b': 'khó khăn'},
+                                  'spacing_punctuation': {r'(\w+)=(\w+)': r'\1 \2'}})
+        self.assertEqual(triggers, ['toi', 'kho khan'])
+
+    def test_warm_covers_common_errors_and_rules(self):
+        """Test bảng được làm ấm cho common_errors và các rule"""
+        for word in ['toi', 'truong', 'trogn', 'kho khan']:
+            self.assertIn(word, self.checker.suggestion_table)
+
+    def test_table_matches_computed(self):
+        """Test kết quả tra bảng giống hệt khi tính trực tiếp"""
+        for word in list(self.checker.suggestion_table.table)[:50]:
+            self.assertEqual(self.checker.get_suggestions(word), self.checker._compute_suggestions(word))
+
+    def test_misses_promoted_after_reload(self):
+        """Test từ ngoài bảng hay gặp được tính sẵn ở lần tải sau"""
+        table = self.checker.suggestion_table
+        for _ in range(3):
+            self.assertIsNone(table.get('tôii'))
+        self.assertIn('tôii', table.top_misses(10))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'suggestions.json')
+            table.save(path)
+            self.assertIsInstance(SuggestionTable.load(path), SuggestionTable)
+            checker = CategorizedVietnameseSpellChecker()
+            checker.warm_suggestion_table(path=path)
+            self.assertIn('tôii', checker.suggestion_table)
+            self.assertEqual(checker.get_suggestions('tôii'), checker._compute_suggestions('tôii'))
+
+class TestRuleIndex(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.checker = CategorizedVietnameseSpellChecker()
+
+    def _scan(self, word):
+        """Kết quả khi duyệt tuần tự mọi pattern"""
+        rule_index = self.checker.rule_index
+        self.checker.rule_index = None
+        try:
+            return self.checker._rule_suggestions(word)
+        finally:
+            self.checker.rule_index = rule_index
+
+    def test_index_matches_regex_scan(self):
+        """Test chỉ mục ngược cho kết quả giống hệt duyệt mọi pattern"""
+        words = ['toi', 'TOI', 'Truong', 'ngâSn', 'kho khan', 'toi toi', 'tôii', 'a=b', 'toi,',
+                 'côn viec kin doanh thì rất kho khan nên toi', 'AI ở', 'xyz']
+        for word in words:
+            self.assertEqual(self.checker._rule_suggestions(word), self._scan(word), word)
+
+    def test_index_lookup(self):
+        """Test tra chỉ mục theo từ kích hoạt chữ thường"""
+        self.assertIn('tôi', self.checker._rule_suggestions('Toi'))
+        self.assertIn('khó khăn', self.checker._rule_suggestions('kho khan'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Shared helpers for tests that talk to a fake HTTP server
+Công cụ dùng chung cho các test chạy llama-server giả trong tiến trình con
+"""
+
+import socket
+import subprocess
+import sys
+import time
+import unittest
+
+import requests
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class FakeServerTestCase(unittest.TestCase):
+    """Chạy script FAKE_SERVER (nhận cổng ở argv[1]) cho cả lớp test, chờ tới khi GET /health trả lời"""
+
+    FAKE_SERVER = ''
+
+    @classmethod
+    def setUpClass(cls):
+        port = free_port()
+        cls.server_url = f'http://127.0.0.1:{port}'
+        cls.server = subprocess.Popen([sys.executable, '-c', cls.FAKE_SERVER, str(port)])
+        for _ in range(100):
+            try:
+                requests.get(f'{cls.server_url}/health', timeout=1)
+                break
+            except requests.ConnectionError:
+                time.sleep(0.05)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.terminate()
+        cls.server.wait()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from unittest import mock
+from spell_checker import VietnameseSpellChecker
+from syllable_validator import SyllableValidator, syllable_validator
+from vietnamese_dictionary import VietnameseDictionary
+
+class TestSyllableValidator(unittest.TestCase):
+
+    def test_valid_syllables(self):
+        """Test các âm tiết hợp lệ (âm đệm, nguyên âm đôi, qu/gi, dấu thanh ở vị trí bất kỳ)"""
+        for syllable in ['tôi', 'Việt', 'nghiêng', 'quyết', 'quốc', 'gì', 'giường', 'khuỷu', 'thuở',
+                         'hoà', 'hòa', 'rượu', 'uyên', 'yêu', 'kìa', 'tập', 'xoong', 'ỉa']:
+            self.assertTrue(syllable_validator.is_valid(syllable), syllable)
+
+    def test_impossible_syllables(self):
+        """Test lỗi gõ không thể là âm tiết: sai cấu trúc, sai quy tắc c/k, g/gh, thanh không hợp vần tắc"""
+        for syllable in ['trogn', 'divt', 'tôii', 'nhàa', 'ce', 'ngi', 'ghu', 'quu', 'tàp', 'hõc', 'tốì']:
+            self.assertFalse(syllable_validator.is_valid(syllable), syllable)
+
+    def test_dictionary_syllables(self):
+        """Test mọi âm tiết thuần Việt trong từ điển đều được automaton chấp nhận"""
+        validator = SyllableValidator()
+        words = VietnameseDictionary().words
+        rejected = {s for w in words for s in w.split(' ') if not validator.is_valid(s)}
+        self.assertFalse(rejected & {'người', 'nghiên', 'cứu', 'trường', 'khoẻ', 'quyển', 'giữa'})
+        self.assertTrue(all(s.isascii() for s in rejected), rejected)  # Chỉ còn từ mượn ('google', 'email')
+        self.assertLess(validator.num_states, 100)
+
+    def test_is_impossible(self):
+        """Test từ ghép, từ viết tắt và token có chữ số"""
+        self.assertTrue(syllable_validator.is_impossible('trogn'))
+        self.assertTrue(syllable_validator.is_impossible('giáo_viênn'))
+        self.assertFalse(syllable_validator.is_impossible('giáo_viên'))
+        self.assertFalse(syllable_validator.is_impossible('GPU'))
+        self.assertFalse(syllable_validator.is_impossible('2024'))
+
+    def test_checker_skips_pyvi(self):
+        """Test từ không thể là tiếng Việt không đi qua pyvi, bị coi là sai khi không có LLM"""
+        checker = VietnameseSpellChecker()
+        with mock.patch('pyvi.ViPosTagger.postagging') as postagging:
+            self.assertFalse(checker._is_correct_word('trogn'))
+            self.assertFalse(checker._is_correct_word('divt'))
+            postagging.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+import unittest
+from cache_manager import CacheManager
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from vietnamese_dictionary import LayeredDictionary, VietnameseDictionary, load_tenant_dictionaries
+from vocabulary import WORD
+
+class TestTenantDictionary(unittest.TestCase):
+
+    def setUp(self):
+        """Tạo từ điển gốc và hai tenant"""
+        self.base = VietnameseDictionary()
+        self.medical = LayeredDictionary(self.base, 'medical', ['paracetamol', 'Nội_soi', 'tôi'])
+        self.brand = LayeredDictionary(self.base, 'brand', ['VinFast'])
+
+    def test_overlay_consulted_before_base(self):
+        """Test tra lớp tenant trước rồi tới từ điển gốc"""
+        self.assertTrue(self.medical.is_correct_word('Paracetamol'))
+        self.assertTrue(self.medical.is_correct_word('nội soi'))
+        self.assertTrue(self.medical.is_correct_word('tôi'))
+        self.assertFalse(self.medical.is_correct_word('vinfast'))
+        self.assertFalse(self.base.is_correct_word('paracetamol'))
+        self.assertTrue(self.brand.is_correct_word('vinfast'))
+
+    def test_no_copy_of_base(self):
+        """Test lớp tenant chỉ chứa từ riêng, từ điển gốc dùng chung"""
+        self.assertEqual(set(self.medical.overlay_words), {'paracetamol', 'nội soi'})
+        self.assertIs(self.medical.words.layers[1], self.base.words)
+        self.assertEqual(len(self.medical.words), len(self.base.words) + 2)
+        self.assertEqual(len(list(self.medical.words)), len(self.medical.words))
+
+    def test_layered_words_len(self):
+        """Test len() của tập từ nhiều lớp không đếm trùng từ có ở cả hai lớp, view được dùng lại"""
+        words = self.medical.words
+        self.assertIs(self.medical.words, words)
+        self.base.add_word('paracetamol')
+        self.assertIs(self.medical.words.layers[1], self.base.words)
+        self.assertEqual(len(self.medical.words), len(set(self.medical.words)))
+        self.assertEqual(len(self.medical.words), len(self.base.words) + 1)
+
+    def test_base_updates_visible_to_tenants(self):
+        """Test cập nhật từ điển gốc áp dụng cho mọi tenant, cập nhật tenant thì không lan ra"""
+        self.base.add_word('chatbot')
+        self.assertTrue(self.medical.is_correct_word('chatbot'))
+        self.medical.add_word('siêu âm', frequency=30)
+        self.assertTrue(self.medical.is_correct_word('siêu âm'))
+        self.assertFalse(self.brand.is_correct_word('siêu âm'))
+        self.assertEqual(self.medical.word_frequency['siêu âm'], 30)
+        self.assertEqual(self.medical.word_frequency['tôi'], self.base.word_frequency['tôi'])
+        self.assertNotIn('siêu âm', self.base.word_frequency)
+        # Tenant không xóa được từ của từ điển gốc
+        self.assertFalse(self.medical.remove_word('tôi'))
+        self.assertTrue(self.base.is_correct_word('tôi'))
+
+    def test_base_updates_refresh_tenant_checker(self):
+        """Test cập nhật từ điển gốc làm mới từ vựng ID và cache decoder của checker tenant"""
+        checker = CategorizedVietnameseSpellChecker().for_dictionary(self.brand)
+        table, ids = checker.vocabulary.encode(['chatbot'])
+        self.assertFalse(table.flags[ids[0]] & WORD)
+        self.assertNotIn('chatbot', checker.decoder._known_syllables())
+
+        self.base.add_word('chatbot')
+        table, ids = checker.vocabulary.encode(['chatbot'])
+        self.assertTrue(table.flags[ids[0]] & WORD)
+        self.assertIn('chatbot', checker.decoder._known_syllables())
+
+    def test_load_tenant_directory(self):
+        """Test tải từ điển tenant từ thư mục <tenant>.txt"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with open(os.path.join(tmpdir, 'acme.txt'), 'w', encoding='utf-8') as f:
+                f.write('# allowlist\nAcmeCloud\n')
+            tenants = load_tenant_dictionaries(self.base, tmpdir)
+            self.assertEqual(list(tenants), ['acme'])
+            self.assertTrue(tenants['acme'].is_correct_word('acmecloud'))
+            tenants['acme'].add_word('acmepay')
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, 'acme.log')))
+            reloaded = load_tenant_dictionaries(self.base, tmpdir)
+            self.assertTrue(reloaded['acme'].is_correct_word('acmepay'))
+
+    def test_tenant_checker_and_cache_keys(self):
+        """Test checker theo tenant và khóa cache không lẫn giữa các tenant"""
+        checker = CategorizedVietnameseSpellChecker().for_dictionary(self.brand)
+        self.assertIs(checker.vietnamese_dict, self.brand)
+        self.assertIn('vinfast', checker.get_suggestions('vinfastt'))
+
+        cache = CacheManager()
+        cache.set('vinfast', {'error_count': 0}, 'check_spelling', self.brand.cache_namespace)
+        self.assertIsNone(cache.get('vinfast', 'check_spelling', self.medical.cache_namespace))
+        self.assertIsNone(cache.get('vinfast', 'check_spelling', self.base.cache_namespace))
+        self.assertEqual(cache.get('vinfast', 'check_spelling', self.brand.cache_namespace), {'error_count': 0})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import time
+import unittest
+from ngram_model import NgramLanguageModel, sentence_tokens
+from spell_checker import LatencyBudget
+from test_llm_verification import LLMServerTestCase
+
+TEXT = 'Tôi dùng zalo mỗi ngày.'
+
+
+class TestTieredPipeline(LLMServerTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.checker.language_model = None
+
+    def test_tiers_reported(self):
+        result = self.checker.check_text(TEXT, latency_budget_ms=0)
+        self.assertEqual(result['tiers'], ['rules', 'dictionary', 'llm'])
+        self.assertEqual(result['skipped_tiers'], [])
+        self.assertEqual(result['errors'], [])
+        # Tầng quy tắc/từ điển thật không kết luận được các từ ngoài từ điển: chỉ LLM quyết định
+        calls = self.calls()[self.start:]
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(sorted(calls[0]['words']), ['dùng', 'mỗi', 'zalo'])
+
+    def test_ngram_resolves_before_llm(self):
+        sentences = [s for line in ['Tôi dùng zalo mỗi ngày.', 'Bạn có dùng zalo không?'] * 5
+                     for s in sentence_tokens(line)]
+        self.checker.language_model = NgramLanguageModel.train(sentences)
+        result = self.checker.check_text(TEXT)
+        self.assertEqual(result['tiers'], ['rules', 'dictionary', 'ngram'])
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(len(self.calls()), self.start)
+
+    def test_budget_skips_slow_tier(self):
+        # Tầng LLM ước lượng 5 giây không vừa ngân sách 200ms: bị bỏ qua, từ còn mơ hồ coi là sai
+        self.checker.tier_latency['llm'] = 5.0
+        result = self.checker.check_text(TEXT, latency_budget_ms=200)
+        self.assertEqual(result['tiers'], ['rules', 'dictionary'])
+        self.assertEqual(result['skipped_tiers'], ['llm'])
+        self.assertEqual([error['word'] for error in result['errors']], ['zalo'])
+        self.assertEqual(len(self.calls()), self.start)
+        # Ước lượng giảm dần sau mỗi lần bị bỏ qua để tầng được thử lại
+        self.assertLess(self.checker.tier_latency['llm'], 5.0)
+
+    def test_latency_budget(self):
+        budget = LatencyBudget(0, {'llm': 100.0})
+        self.assertIsNone(budget.remaining())
+        self.assertTrue(budget.allows('llm'))
+
+        estimates = {}
+        budget = LatencyBudget(1000, estimates)
+        self.assertTrue(budget.allows('ngram'))
+        with budget.run('ngram'):
+            time.sleep(0.01)
+        self.assertEqual(budget.ran, ['ngram'])
+        self.assertGreaterEqual(estimates['ngram'], 0.01)
+        self.assertLess(budget.remaining(), 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
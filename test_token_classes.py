@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from categorized_spell_checker import categorized_spell_checker
+from pyvi import ViTokenizer
+from token_classes import ACRONYM, FOREIGN, NUMBER, PROPER_NOUN, URL_EMAIL, TokenClassifier
+
+class TestTokenClasses(unittest.TestCase):
+
+    def setUp(self):
+        self.classifier = TokenClassifier()
+
+    def test_token_class(self):
+        self.assertEqual(self.classifier.token_class('https://toi-dang.vn/trang'), URL_EMAIL)
+        self.assertEqual(self.classifier.token_class('toi@gmail.com'), URL_EMAIL)
+        self.assertEqual(self.classifier.token_class('3.500'), NUMBER)
+        self.assertEqual(self.classifier.token_class('GPU'), PROPER_NOUN | ACRONYM)
+        self.assertEqual(self.classifier.token_class('Bangladesh'), PROPER_NOUN | FOREIGN)
+        self.assertEqual(self.classifier.token_class('software'), FOREIGN)
+        self.assertEqual(self.classifier.token_class('nam'), PROPER_NOUN)
+        # Lỗi gõ và văn bản không dấu không phải từ nước ngoài
+        for word in ['trogn', 'dideu', 'naggna', 'toidihoc', 'kinhtevietnam']:
+            self.assertEqual(self.classifier.token_class(word), 0, word)
+
+    def test_classify(self):
+        text = 'Liên hệ toi@gmail.com về GPU, toi dang hoc'
+        classes = self.classifier.classify(text, ViTokenizer.tokenize(text).split())
+        start = text.index('toi@')
+        self.assertTrue(classes.skips(start + 1, start + 3))
+        self.assertFalse(classes.skips(text.rindex('toi'), len(text)))
+        self.assertTrue(classes.of('GPU') & ACRONYM)
+        # Văn bản viết hoa toàn bộ: không có từ viết tắt
+        text = 'TOI DANG HOC'
+        self.assertEqual(list(self.classifier.classify(text, text.split()).classes), [PROPER_NOUN] * 3)
+
+    def test_check_text_skips_protected_tokens(self):
+        result = categorized_spell_checker.check_text('Liên hệ toi@gmail.com hoặc https://toi-dang.vn, toi dang hoc')
+        self.assertTrue(result['corrected_text'].startswith('Liên hệ toi@gmail.com hoặc https://toi-dang.vn,'))
+        self.assertFalse(any('gmail' in error['word'] for error in result['errors']))
+        self.assertIn(('toi', 'tôi'), [(error['word'], error['corrected']) for error in result['errors']])
+
+
+if __name__ == '__main__':
+    unittest.main()
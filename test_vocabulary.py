@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from context_features import context_extractor
+from vietnamese_dictionary import VietnameseDictionary
+from vocabulary import COMMON_ERROR, WORD, Vocabulary
+
+class TestVocabulary(unittest.TestCase):
+
+    def setUp(self):
+        self.dictionary = VietnameseDictionary()
+        self.vocabulary = Vocabulary(self.dictionary, context_extractor)
+
+    def test_encode(self):
+        """Test token gốc và khóa chuẩn dùng chung ID; cờ và bitmask đọc theo ID"""
+        words = ['Giáo_viên', 'giáo viên', 'học', 'toi', 'xyz', 'học']
+        table, ids = self.vocabulary.encode(words)
+        self.assertEqual(ids[0], ids[1])
+        self.assertEqual(ids[2], ids[5])
+        self.assertEqual(len(table), 4)
+        self.assertEqual(table.keys[ids[0]], 'giáo viên')
+        self.assertEqual([bool(table.flags[i] & WORD) for i in ids],
+                         [self.dictionary.is_correct_word(w) for w in words])
+        self.assertTrue(table.flags[ids[3]] & COMMON_ERROR)
+        # Token của pyvi không có dấu cách: bitmask giống hệt cách tra chuỗi
+        pyvi_words = [w for w in words if ' ' not in w]
+        self.assertEqual([table.masks[i] for i in self.vocabulary.encode(pyvi_words)[1]],
+                         context_extractor.token_masks_for(pyvi_words))
+
+    def test_capacity(self):
+        """Test vượt capacity thì dùng bảng mới, bảng cũ của request trước vẫn hợp lệ"""
+        vocabulary = Vocabulary(self.dictionary, capacity=3)
+        old_table, old_ids = vocabulary.encode(['tôi', 'học'])
+        table, ids = vocabulary.encode(['trường', 'lớp'])
+        self.assertIsNot(table, old_table)
+        self.assertEqual([old_table.keys[i] for i in old_ids], ['tôi', 'học'])
+        self.assertEqual([table.keys[i] for i in ids], ['trường', 'lớp'])
+
+    def test_dictionary_update(self):
+        """Test checker làm mới từ vựng khi từ điển thay đổi lúc chạy"""
+        checker = CategorizedVietnameseSpellChecker().for_dictionary(VietnameseDictionary())
+        table, ids = checker.vocabulary.encode(['chatbot'])
+        self.assertFalse(table.flags[ids[0]] & WORD)
+        checker.vietnamese_dict.add_word('chatbot')
+        table, ids = checker.vocabulary.encode(['chatbot'])
+        self.assertTrue(table.flags[ids[0]] & WORD)
+
+if __name__ == '__main__':
+    unittest.main()
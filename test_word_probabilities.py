@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Test vectorized word probabilities
+"""
+
+import unittest
+
+from categorized_spell_checker import categorized_spell_checker
+
+
+class TestWordProbabilities(unittest.TestCase):
+    def setUp(self):
+        self.checker = categorized_spell_checker
+        self.context = {
+            'academic_context': True,
+            'business_context': True,
+            'proper_nouns': ['Hai'],
+            'word_relationships': {'subject_words': ['toi', 'Hai']},
+        }
+
+    def test_with_context(self):
+        words = ['toi', 'học', 'Hai', 'kinh', 'học', 'xyzq', 'TOI']
+        errors = [{'word': 'Toi', 'category': 'tone_error'},
+                  {'word': 'hai', 'category': 'typo_error'},
+                  {'word': 'kinh', 'category': 'la_category'}]
+        probabilities = self.checker._calculate_word_probabilities_with_context('', words, errors, self.context)
+        # Cùng thứ tự nhân như tính từng từ: kết quả phải trùng từng bit
+        self.assertEqual(list(probabilities), ['toi', 'học', 'Hai', 'kinh', 'xyzq', 'TOI'])
+        self.assertEqual(probabilities['toi'], min(1.0, 0.95 * 0.8))
+        self.assertEqual(probabilities['TOI'], 0.95)
+        self.assertEqual(probabilities['Hai'], min(1.0, 0.90 * 1.2 * 0.5 * 0.8))
+        self.assertEqual(probabilities['kinh'], min(1.0, 0.50 * 1.1))
+        self.assertEqual(probabilities['học'], 0.05)
+        self.assertEqual(probabilities['xyzq'], 0.30)
+
+    def test_without_context(self):
+        words = ['to', 'nghiêngg', 'học', 'xyzq']
+        errors = [{'word': 'to', 'category': 'capitalization'}, {'word': 'nghiêngg', 'category': 'tone_error'}]
+        probabilities = self.checker._calculate_word_probabilities('', words, errors)
+        self.assertEqual(probabilities, {'to': 0.80 * 0.8, 'nghiêngg': 1.0, 'học': 0.05, 'xyzq': 0.30})
+
+    def test_empty(self):
+        self.assertEqual(self.checker._calculate_word_probabilities_with_context('', [], [], self.context), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import unittest
+from categorized_spell_checker import CategorizedVietnameseSpellChecker
+from vietnamese_dictionary import VietnameseDictionary
+from word_splitter import WordSplitter
+
+class TestWordSplitter(unittest.TestCase):
+
+    def setUp(self):
+        self.splitter = WordSplitter(VietnameseDictionary())
+
+    def test_split_glued_tokens(self):
+        """Test tách token dính chữ thành âm tiết, ưu tiên ít mảnh và từ ghép có trong từ điển"""
+        self.assertEqual(self.splitter.split('điểmnày'), ['điểm', 'này'])
+        self.assertEqual(self.splitter.split('ngườiViệtNam'), ['người', 'Việt', 'Nam'])
+        self.assertEqual(self.splitter.split('giáoviên'), ['giáo viên'])
+        self.assertEqual(self.splitter.split('tôiđihọcởtrường'), ['tôi', 'đi', 'học', 'ở', 'trường'])
+
+    def test_stray_leading_character(self):
+        """Test bỏ một ký tự thừa ở đầu token"""
+        self.assertEqual(self.splitter.split('lsovới'), ['so', 'với'])
+
+    def test_no_split(self):
+        """Test không tách từ đúng, từ không dấu và token không tách được thành âm tiết hợp lệ"""
+        for token in ['Việt', 'học_sinh', 'youtube', 'Phươngqyết', 'GIÁOVIÊN', 'xtôi', 'Ðiện', 'ðiệnthoại']:
+            self.assertIsNone(self.splitter.split(token), token)
+
+    def test_checker_splits_sticky_tokens(self):
+        """Test checker tách token dính chữ không cần rule literal"""
+        checker = CategorizedVietnameseSpellChecker()
+        result = checker.check_text('chung quan điểmnày của người dân')
+        self.assertEqual(result['corrected_text'], 'chung quan điểm này của người dân')
+        self.assertIn(('điểmnày', 'điểm này', 'sticky_typing'),
+                      [(e['word'], e['corrected'], e['category']) for e in result['errors']])
+        result = checker.check_text('ngườiViệtNam đang sống', beam_width=2)
+        self.assertEqual(result['corrected_text'], 'người Việt Nam đang sống')
+        self.assertEqual(result['decoder']['corrections'][0]['source'], 'split')
+
+if __name__ == '__main__':
+    unittest.main()
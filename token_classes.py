@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Token Classifier for Vietnamese Spell Checker
+Gán nhãn lớp cho mỗi token một lần (tên riêng, viết tắt, số, URL/email, từ nước ngoài) thành
+bitmask để mọi bước kiểm tra đọc trong O(1) và bỏ qua token không bao giờ sửa trước khi khớp quy tắc
+"""
+
+import re
+from array import array
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from context_features import PROPER_NOUN_HINTS
+from syllable_validator import syllable_validator
+
+# Lớp của token (bitmask)
+PROPER_NOUN = 1   # Viết hoa chữ đầu hoặc là một phần tên riêng thường gặp ('việt', 'nam')
+ACRONYM = 2       # Viết hoa toàn bộ ('AI', 'GPU')
+NUMBER = 4        # Số ('1970', '3.500', '10,5')
+URL_EMAIL = 8     # 'https://...', 'www...', 'ten@mien.vn'
+FOREIGN = 16      # Từ nước ngoài ('software', 'Bangladesh')
+
+# Token thuộc các lớp này không bao giờ bị sửa: bỏ qua trước khi khớp quy tắc
+SKIP_CLASSES = ACRONYM | NUMBER | URL_EMAIL | FOREIGN
+
+URL_EMAIL_PATTERN = re.compile(r'(?:[a-z][a-z0-9+.-]*://|www\.)\S+|[\w.+-]+@[\w-]+(?:\.[\w-]+)+', re.IGNORECASE)
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,:/-]\d+)*')
+VOWEL_GROUPS = re.compile(r'[aeiouy]+')
+MIN_FOREIGN_VOWEL_GROUPS = 3
+
+
+class TokenClasses:
+    """
+    Nhãn lớp token của một request
+
+    classes là mảng bitmask song song với danh sách token; of() tra theo chuỗi
+    token và skips() cho biết một đoạn của văn bản có chạm vào token thuộc
+    SKIP_CLASSES không (bytearray lưu nhãn theo từng ký tự, không quét lại token).
+    """
+
+    def __init__(self, words: List[str], classes: array, char_classes: Optional[bytearray] = None):
+        self.words = words
+        self.classes = classes
+        self._by_token: Dict[str, int] = dict(zip(words, classes))
+        self._char_classes = char_classes
+
+    def of(self, token: str) -> int:
+        """Nhãn của một token trong request (0 nếu không phải token của request)"""
+        return self._by_token.get(token, 0)
+
+    def skips(self, start: int, end: int, classes: int = SKIP_CLASSES) -> bool:
+        """Đoạn text[start:end] chạm vào token thuộc một trong các lớp classes"""
+        if self._char_classes is None:
+            return False
+        return any(c & classes for c in self._char_classes[start:end])
+
+
+class TokenClassifier:
+    """
+    Phân lớp token theo chính tả, một lượt cho cả request
+
+    Nhãn của một token chỉ phụ thuộc vào chính nó nên được cache theo chuỗi;
+    classify() còn gióng token (dạng của ViTokenizer) vào văn bản để các quy
+    tắc khớp trên văn bản bỏ qua được số, từ viết tắt, URL/email và từ nước
+    ngoài mà không phải suy lại các quy tắc viết hoa/chữ số ở từng bước.
+    """
+
+    def __init__(self, proper_noun_hints: List[str] = PROPER_NOUN_HINTS, validator=syllable_validator):
+        self.proper_noun_hints = frozenset(proper_noun_hints)
+        self.validator = validator
+        self.token_class = lru_cache(maxsize=1 << 16)(self._token_class)
+
+    def classify(self, text: str, words: List[str]) -> TokenClasses:
+        """
+        Gán nhãn cho các token của văn bản
+
+        Văn bản không có chữ thường (viết hoa toàn bộ) thì không token nào được
+        coi là từ viết tắt.
+        """
+        token_class = self.token_class
+        classes = array('B', [token_class(word) for word in words])
+        if text == text.upper():
+            classes = array('B', [c & ~ACRONYM for c in classes])
+
+        # Gióng token vào văn bản; chỉ token thuộc SKIP_CLASSES được đánh dấu theo ký tự
+        char_classes = None
+        cursor = 0
+        for word, c in zip(words, classes):
+            position = text.find(word.replace('_', ' '), cursor)
+            if position < 0:
+                continue
+            cursor = position + len(word)
+            if c & SKIP_CLASSES:
+                if char_classes is None:
+                    char_classes = bytearray(len(text))
+                char_classes[position:cursor] = bytes([c]) * len(word)
+        return TokenClasses(words, classes, char_classes)
+
+    def _token_class(self, token: str) -> int:
+        if not token:
+            return 0
+        if URL_EMAIL_PATTERN.fullmatch(token):
+            return URL_EMAIL
+        if NUMBER_PATTERN.fullmatch(token):
+            return NUMBER
+        token_class = 0
+        if (token[0].isupper() and len(token) > 1) or token.lower() in self.proper_noun_hints:
+            token_class |= PROPER_NOUN
+        if len(token) > 1 and token.isupper() and token.isalnum():
+            token_class |= ACRONYM
+        elif self._is_foreign(token.lower()):
+            token_class |= FOREIGN
+        return token_class
+
+    def _is_foreign(self, word: str) -> bool:
+        """
+        Từ chữ Latin không dấu, nhiều nhóm nguyên âm và không tách được thành các
+        âm tiết hợp lệ ('software', 'internet'); lỗi gõ như 'trogn', 'dideu' có ít
+        nhóm nguyên âm nên không bị coi là từ nước ngoài
+        """
+        if not (word.isascii() and word.isalpha()) or len(VOWEL_GROUPS.findall(word)) < MIN_FOREIGN_VOWEL_GROUPS:
+            return False
+        reachable = {0}
+        for start in range(len(word)):
+            if start in reachable:
+                reachable.update(self.validator.syllable_ends(word, start, any_tone=True))
+        return len(word) not in reachable
+
+
+# Tạo instance global
+token_classifier = TokenClassifier()
@@ -6,17 +6,219 @@ Vietnamese Dictionary for Spell Checker
 Từ điển tiếng Việt mở rộng cho spell checker
 """
 
+import glob
 import json
+import logging
 import os
-from typing import Set, Dict, List
+from collections import ChainMap
+from threading import Lock
+from typing import Callable, Iterable, Set, Dict, List, Optional
+import edit_distance
+from bloom_filter import BloomFilter
+from config import Config
+from lexicon_store import (CompactLexicon, LayeredLexicon, OverlayLexicon, OverlayMapping, compound_key,
+                           iter_word_file, open_dictionary_file, open_frequency_file, write_dictionary_file)
 
 class VietnameseDictionary:
     """Từ điển tiếng Việt với các từ phổ biến"""
     
-    def __init__(self):
-        self.words = self._load_dictionary()
+    def __init__(self, lexicon_path: Optional[str] = None, frequency_path: Optional[str] = None,
+                 log_path: Optional[str] = None):
+        """
+        Khởi tạo từ điển
+        
+        Args:
+            lexicon_path: File lexicon ngoài (mỗi dòng một từ). Nếu có, từ điển
+                được lưu dạng CompactLexicon thay vì set, kèm Bloom filter
+            frequency_path: File tần suất nhị phân (tạo bằng build_frequency.py),
+                chỉ được mở khi word_frequency được truy cập lần đầu
+            log_path: Log cập nhật lúc chạy (append-only), được phát lại khi khởi tạo
+        """
         self.common_errors = self._load_common_errors()
-        self.word_frequency = self._load_frequency()
+        if lexicon_path:
+            self.words = CompactLexicon.load(lexicon_path, extra_words=self._load_dictionary())
+            self.bloom_filter = BloomFilter.from_words(list(self.words) + list(self.common_errors),
+                                                       Config.BLOOM_FALSE_POSITIVE_RATE)
+        else:
+            # Từ điển cơ bản là set: tra set nhanh hơn Bloom filter viết bằng Python
+            self.words = self._load_dictionary()
+            self.bloom_filter = None
+        self._frequency_path = frequency_path
+        self._word_frequency = None
+        self._mmap = None
+        self._frequency_mmap = None
+        self._init_updates(log_path)
+    
+    @classmethod
+    def from_file(cls, path: str, frequency_path: Optional[str] = None,
+                  log_path: Optional[str] = None) -> 'VietnameseDictionary':
+        """
+        Mở từ điển từ file nhị phân (tạo bằng save()) qua mmap
+        
+        Các worker cùng mở một file dùng chung page cache, không cần parse khi khởi động.
+        Nếu có frequency_path, bảng tần suất trong file được thay bằng bảng từ corpus.
+        """
+        dictionary = cls.__new__(cls)
+        (dictionary._mmap, dictionary.words, dictionary.common_errors, dictionary._word_frequency,
+         dictionary.bloom_filter) = open_dictionary_file(path)
+        dictionary._frequency_path = frequency_path
+        dictionary._frequency_mmap = None
+        if frequency_path:
+            dictionary._word_frequency = None
+        dictionary._init_updates(log_path)
+        return dictionary
+    
+    def _init_updates(self, log_path: Optional[str]) -> None:
+        """Khởi tạo phần cập nhật lúc chạy và phát lại log nếu đã có"""
+        self._log_path = log_path
+        self._skeletons = None
+        self._update_lock = Lock()
+        self._update_listeners = []
+        # Cập nhật tần suất chờ tới khi bảng tần suất được tải (giữ tải lười)
+        self._pending_frequency = []
+        if log_path and os.path.exists(log_path):
+            applied = self.replay_log(log_path)
+            logging.info(f"📚 Dictionary: phát lại {applied} cập nhật từ {log_path}")
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Phần thêm vào khóa cache để kết quả của các từ điển khác nhau không lẫn nhau"""
+        return ''
+    
+    @property
+    def word_frequency(self) -> Dict[str, int]:
+        """Bảng tần suất từ, tải lười (lazy) ở lần truy cập đầu tiên"""
+        if self._word_frequency is None:
+            if self._frequency_path:
+                self._frequency_mmap, self._word_frequency = open_frequency_file(self._frequency_path)
+            else:
+                self._word_frequency = self._load_frequency()
+            pending, self._pending_frequency = self._pending_frequency, []
+            for entry in pending:
+                self._apply_update(entry)
+        return self._word_frequency
+    
+    @word_frequency.setter
+    def word_frequency(self, value: Dict[str, int]) -> None:
+        self._word_frequency = value
+    
+    def add_update_listener(self, callback: Callable[[str], None]) -> None:
+        """Đăng ký hàm được gọi (với khóa của từ) mỗi khi từ điển thay đổi lúc chạy"""
+        self._update_listeners.append(callback)
+    
+    def add_word(self, word: str, frequency: Optional[int] = None) -> bool:
+        """Thêm từ (và tần suất nếu có) lúc chạy, trả về False nếu không có gì thay đổi"""
+        entry = {'op': 'add', 'word': word}
+        if frequency is not None:
+            entry['frequency'] = int(frequency)
+        return self._update(entry)
+    
+    def remove_word(self, word: str) -> bool:
+        """Xóa từ khỏi từ điển lúc chạy, trả về False nếu từ không có"""
+        return self._update({'op': 'remove', 'word': word})
+    
+    def set_frequency(self, word: str, frequency: int) -> bool:
+        """Đặt tần suất của từ lúc chạy"""
+        return self._update({'op': 'frequency', 'word': word, 'frequency': int(frequency)})
+    
+    def remove_frequency(self, word: str) -> bool:
+        """Xóa tần suất của từ lúc chạy"""
+        return self._update({'op': 'remove_frequency', 'word': word})
+    
+    def replay_log(self, path: str) -> int:
+        """
+        Phát lại log cập nhật, trả về số cập nhật đã áp dụng
+        
+        Dòng hỏng (ví dụ dòng cuối ghi dở khi tiến trình bị tắt đột ngột) được bỏ qua.
+        """
+        applied = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._apply_update(json.loads(line))
+                except (ValueError, KeyError, TypeError) as e:
+                    logging.warning(f"⚠️ Bỏ qua dòng {line_number} của {path}: {e}")
+                    continue
+                applied += 1
+        return applied
+    
+    def _update(self, entry: Dict) -> bool:
+        """Áp dụng một cập nhật, ghi vào log và báo cho các listener"""
+        key = compound_key(entry['word'])
+        if not key:
+            raise ValueError('Từ không hợp lệ')
+        entry['word'] = key
+        with self._update_lock:
+            changed = self._apply_update(entry)
+            if changed and self._log_path:
+                with open(self._log_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+        if changed:
+            for callback in self._update_listeners:
+                callback(key)
+        return changed
+    
+    def _apply_update(self, entry: Dict) -> bool:
+        """Áp dụng một cập nhật vào tập từ/bảng tần suất, trả về True nếu có thay đổi"""
+        op, key = entry['op'], compound_key(entry['word'])
+        if op in ('frequency', 'remove_frequency') and self._word_frequency is None:
+            self._pending_frequency.append(entry)
+            return True
+        
+        if op == 'add':
+            changed = key not in self.words
+            if changed:
+                self._mutable_words().add(key)
+                if self.bloom_filter is not None:
+                    self.bloom_filter.add(key)
+                if self._skeletons is not None:
+                    self._skeletons.setdefault(edit_distance.strip_diacritics(key), []).append(key)
+            if 'frequency' in entry:
+                changed = self._apply_update({'op': 'frequency', 'word': key,
+                                              'frequency': entry['frequency']}) or changed
+            return changed
+        if op == 'remove':
+            if key not in self.words:
+                return False
+            self._mutable_words().discard(key)
+            if self._skeletons is not None:
+                skeleton = edit_distance.strip_diacritics(key)
+                self._skeletons[skeleton] = [w for w in self._skeletons.get(skeleton, ()) if w != key]
+            return True
+        if op == 'frequency':
+            frequency = int(entry['frequency'])
+            if self._word_frequency.get(key) == frequency:
+                return False
+            self._mutable_frequency()[key] = frequency
+            return True
+        if op == 'remove_frequency':
+            if key not in self._word_frequency:
+                return False
+            del self._mutable_frequency()[key]
+            return True
+        raise ValueError(f"Thao tác không hợp lệ: {op}")
+    
+    def _mutable_words(self) -> OverlayLexicon:
+        """Tập từ có thể sửa: phủ OverlayLexicon lên tập gốc thay vì sửa/dựng lại nó"""
+        if not isinstance(self.words, OverlayLexicon):
+            self.words = OverlayLexicon(self.words)
+        return self.words
+    
+    def _mutable_frequency(self) -> OverlayMapping:
+        """Bảng tần suất có thể sửa: phủ OverlayMapping lên bảng gốc"""
+        if not isinstance(self._word_frequency, OverlayMapping):
+            self._word_frequency = OverlayMapping(self._word_frequency)
+        return self._word_frequency
+    
+    def save(self, path: str) -> None:
+        """Ghi từ điển hiện tại ra file nhị phân để mở lại bằng from_file()"""
+        write_dictionary_file(path, self.words, dict(self.common_errors), dict(self.word_frequency),
+                              false_positive_rate=Config.BLOOM_FALSE_POSITIVE_RATE)
     
     def _load_dictionary(self) -> Set[str]:
         """Tải từ điển cơ bản"""
@@ -214,9 +416,46 @@ class VietnameseDictionary:
             'vở': 10, 'bút': 8, 'mực': 5, 'giấy': 3,
         }
     
+    def might_contain(self, word: str) -> bool:
+        """
+        Kiểm tra nhanh qua Bloom filter (từ điển + khóa common_errors)
+        
+        False nghĩa là từ chắc chắn không có trong từ điển lẫn common_errors;
+        True nghĩa là cần tra tiếp (luôn True khi không có Bloom filter).
+        """
+        return self.bloom_filter is None or compound_key(word) in self.bloom_filter
+    
     def is_correct_word(self, word: str) -> bool:
-        """Kiểm tra từ có đúng chính tả không"""
-        return word.lower() in self.words
+        """Kiểm tra từ có đúng chính tả không (chấp nhận từ ghép dạng 'giáo_viên' của pyvi)"""
+        return compound_key(word) in self.words
+    
+    def is_common_error(self, word: str) -> bool:
+        """Kiểm tra từ có nằm trong danh sách lỗi phổ biến không"""
+        return compound_key(word) in self.common_errors
+    
+    def words_with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[str]:
+        """Lấy các từ trong từ điển bắt đầu bằng prefix"""
+        prefix = compound_key(prefix)
+        if hasattr(self.words, 'words_with_prefix'):
+            return self.words.words_with_prefix(prefix, limit)
+        matches = sorted(w for w in self.words if w.startswith(prefix))
+        return matches[:limit] if limit is not None else matches
+    
+    def words_with_skeleton(self, word: str) -> List[str]:
+        """Các từ trong từ điển có cùng dạng không dấu với word ('toi' -> ['tôi', 'tối', ...])"""
+        return list(self._skeleton_index().get(edit_distance.strip_diacritics(compound_key(word)), ()))
+    
+    def _skeleton_index(self) -> Dict[str, List[str]]:
+        """Chỉ mục dạng không dấu -> các từ, dựng lười ở lần dùng đầu tiên"""
+        if self._skeletons is None:
+            skeletons = {}
+            for word in self._skeleton_words():
+                skeletons.setdefault(edit_distance.strip_diacritics(word), []).append(word)
+            self._skeletons = skeletons
+        return self._skeletons
+    
+    def _skeleton_words(self) -> Iterable[str]:
+        return self.words
     
     def get_correction(self, word: str) -> str:
         """Lấy từ sửa lỗi"""
@@ -230,9 +469,10 @@ class VietnameseDictionary:
         if word.lower() in self.common_errors:
             suggestions.append(self.common_errors[word.lower()])
         
-        # Tìm từ tương tự trong từ điển
+        # Tìm từ tương tự trong từ điển (dừng sớm khi vượt ngưỡng khoảng cách)
+        word_lower = compound_key(word)
         for dict_word in self.words:
-            if self._similarity(word.lower(), dict_word) > 0.7:
+            if edit_distance.is_similar(word_lower, dict_word, 0.7):
                 suggestions.append(dict_word)
         
         # Sắp xếp theo tần suất sử dụng
@@ -242,30 +482,101 @@ class VietnameseDictionary:
     
     def _similarity(self, word1: str, word2: str) -> float:
         """Tính độ tương đồng giữa hai từ"""
-        if word1 == word2:
-            return 1.0
-        
-        # Tính Levenshtein distance
-        len1, len2 = len(word1), len(word2)
-        matrix = [[0] * (len2 + 1) for _ in range(len1 + 1)]
-        
-        for i in range(len1 + 1):
-            matrix[i][0] = i
-        for j in range(len2 + 1):
-            matrix[0][j] = j
-        
-        for i in range(1, len1 + 1):
-            for j in range(1, len2 + 1):
-                cost = 0 if word1[i-1] == word2[j-1] else 1
-                matrix[i][j] = min(
-                    matrix[i-1][j] + 1,      # deletion
-                    matrix[i][j-1] + 1,      # insertion
-                    matrix[i-1][j-1] + cost  # substitution
-                )
-        
-        distance = matrix[len1][len2]
-        max_len = max(len1, len2)
-        return 1 - (distance / max_len) if max_len > 0 else 0
+        return edit_distance.similarity(word1, word2)
+
+class LayeredDictionary(VietnameseDictionary):
+    """
+    Từ điển nhiều lớp: lớp phủ nhỏ của một tenant được tra trước, sau đó tới từ điển gốc
+    
+    Từ điển gốc được dùng chung, không bị sao chép hay sửa đổi; add_word/remove_word/
+    set_frequency chỉ tác động lên lớp phủ của tenant. Thay đổi của từ điển gốc
+    cũng được báo cho các listener của tenant (từ của gốc hiện ra qua tenant).
+    """
+    
+    def __init__(self, base: VietnameseDictionary, name: str, words: Iterable[str] = (),
+                 common_errors: Optional[Dict[str, str]] = None, log_path: Optional[str] = None):
+        self.base = base
+        self.name = name
+        self.overlay_words = OverlayLexicon(frozenset())
+        self.overlay_words.update(key for key in map(compound_key, words) if key and key not in base.words)
+        self._words = LayeredLexicon(self.overlay_words, base.words)
+        self.common_errors = ChainMap({compound_key(k): v for k, v in (common_errors or {}).items()},
+                                      base.common_errors)
+        self.bloom_filter = None
+        self._frequency_path = None
+        self._word_frequency = OverlayMapping({})
+        self._mmap = None
+        self._frequency_mmap = None
+        self._init_updates(log_path)
+        base.add_update_listener(self._on_base_update)
+    
+    def _on_base_update(self, key: str) -> None:
+        """Báo lại cập nhật của từ điển gốc cho các listener của tenant"""
+        for callback in self._update_listeners:
+            callback(key)
+    
+    @property
+    def cache_namespace(self) -> str:
+        return f"tenant:{self.name}"
+    
+    @property
+    def words(self) -> LayeredLexicon:
+        # Chỉ dựng lại khi từ điển gốc thay tập từ (lần sửa đầu tiên phủ OverlayLexicon lên tập gốc)
+        if self._words.layers[-1] is not self.base.words:
+            self._words = LayeredLexicon(self.overlay_words, self.base.words)
+        return self._words
+    
+    @property
+    def word_frequency(self) -> Dict[str, int]:
+        return ChainMap(self._word_frequency, self.base.word_frequency)
+    
+    def might_contain(self, word: str) -> bool:
+        key = compound_key(word)
+        return key in self.overlay_words or key in self.common_errors.maps[0] or self.base.might_contain(key)
+    
+    def is_correct_word(self, word: str) -> bool:
+        """Kiểm tra từ trong lớp tenant rồi tới từ điển gốc (mỗi lớp một lần tra O(1))"""
+        key = compound_key(word)
+        return key in self.overlay_words or key in self.base.words
+    
+    def words_with_skeleton(self, word: str) -> List[str]:
+        return super().words_with_skeleton(word) + self.base.words_with_skeleton(word)
+    
+    def _skeleton_words(self) -> Iterable[str]:
+        # Chỉ mục của tenant chỉ chứa lớp phủ, phần gốc dùng chỉ mục của từ điển gốc
+        return self.overlay_words
+    
+    def _mutable_words(self) -> OverlayLexicon:
+        return self.overlay_words
+    
+    def _apply_update(self, entry: Dict) -> bool:
+        """Chỉ xóa được từ nằm trong lớp phủ của tenant"""
+        if entry['op'] == 'remove' and compound_key(entry['word']) not in self.overlay_words:
+            return False
+        return super()._apply_update(entry)
+
+
+def load_tenant_dictionaries(base: VietnameseDictionary, directory: str) -> Dict[str, LayeredDictionary]:
+    """
+    Tải từ điển riêng của các tenant từ thư mục
+    
+    Mỗi file <tenant>.txt là danh sách từ cho phép của tenant (mỗi dòng một từ);
+    cập nhật lúc chạy của tenant được ghi vào <tenant>.log cùng thư mục.
+    """
+    tenants = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.txt'))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        log_path = os.path.join(directory, f"{name}.log")
+        tenants[name] = LayeredDictionary(base, name, iter_word_file(path), log_path=log_path)
+        logging.info(f"📚 Tenant '{name}': {len(tenants[name].overlay_words)} từ riêng")
+    return tenants
 
 # Tạo instance global
-vietnamese_dict = VietnameseDictionary() 
\ No newline at end of file
+if Config.DICTIONARY_PATH:
+    vietnamese_dict = VietnameseDictionary.from_file(Config.DICTIONARY_PATH,
+                                                     frequency_path=Config.FREQUENCY_PATH or None,
+                                                     log_path=Config.DICTIONARY_LOG_PATH or None)
+else:
+    vietnamese_dict = VietnameseDictionary(lexicon_path=Config.LEXICON_PATH or None,
+                                           frequency_path=Config.FREQUENCY_PATH or None,
+                                           log_path=Config.DICTIONARY_LOG_PATH or None) 
\ No newline at end of file
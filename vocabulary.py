@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Token Vocabulary for Vietnamese Spell Checker
+Intern mỗi token đã chuẩn hóa thành một ID số nguyên; cờ từ điển và bitmask ngữ cảnh lưu
+thành mảng theo ID để các bước sau của một request chỉ làm việc trên số nguyên
+"""
+
+import threading
+from array import array
+from typing import Dict, List, Sequence, Tuple
+
+from lexicon_store import compound_key
+
+# Cờ của một token
+WORD = 1            # Có trong từ điển
+COMMON_ERROR = 2    # Là khóa của common_errors
+
+DEFAULT_CAPACITY = 1 << 16
+
+
+class TokenTable:
+    """
+    Các thuộc tính theo ID của một lần intern (snapshot của Vocabulary)
+
+    ids ánh xạ cả token gốc ('Giáo_viên') lẫn khóa chuẩn ('giáo viên') về cùng
+    một ID, nên token gặp lại chỉ tốn một lần tra dict, không chuẩn hóa lại.
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.flags = array('B')
+        self.masks: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class Vocabulary:
+    """
+    Từ vựng intern lười, dùng chung cho các bước kiểm tra của một checker
+
+    Token được intern ở lần đầu gặp: chuẩn hóa một lần (compound_key), tra từ
+    điển/common_errors và bitmask ngữ cảnh một lần, rồi lưu vào các mảng theo ID.
+    Khi vượt capacity (hoặc từ điển thay đổi) bảng được thay bằng bảng mới; các
+    request đang chạy vẫn giữ bảng cũ nên ID của chúng luôn hợp lệ.
+    """
+
+    def __init__(self, dictionary, context_extractor=None, capacity: int = DEFAULT_CAPACITY):
+        self.dictionary = dictionary
+        self.context_extractor = context_extractor
+        self.capacity = capacity
+        self._table = TokenTable()
+        self._lock = threading.Lock()
+
+    def encode(self, words: Sequence[str]) -> Tuple[TokenTable, array]:
+        """Tokenize thành mảng ID một lần cho cả request; trả về (bảng, mảng ID)"""
+        with self._lock:
+            table = self._table
+            if len(table) + len(words) > self.capacity:
+                table = self._table = TokenTable()
+            ids = table.ids
+            return table, array('i', [ids[word] if word in ids else self._intern(table, word) for word in words])
+
+    def clear(self) -> None:
+        """Bỏ bảng hiện tại (gọi khi từ điển thay đổi)"""
+        with self._lock:
+            self._table = TokenTable()
+
+    def _intern(self, table: TokenTable, word: str) -> int:
+        key = compound_key(word)
+        token_id = table.ids.get(key)
+        if token_id is None:
+            token_id = len(table.keys)
+            table.keys.append(key)
+            flags = 0
+            if self.dictionary.is_correct_word(key):
+                flags |= WORD
+            if self.dictionary.is_common_error(key):
+                flags |= COMMON_ERROR
+            table.flags.append(flags)
+            mask = 0
+            if self.context_extractor is not None:
+                mask = self.context_extractor.token_masks.get(key.replace(' ', '_'), 0)
+            table.masks.append(mask)
+            table.ids[key] = token_id
+        table.ids[word] = token_id
+        return token_id
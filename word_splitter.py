@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Word Splitter for Vietnamese Spell Checker
+Tách token bị dính chữ ('điểmnày', 'lsovới') thành các âm tiết/từ hợp lệ bằng quy hoạch động
+trên automaton âm tiết, chấm điểm theo từ điển và tần suất
+"""
+
+import math
+import unicodedata
+from typing import List, Optional, Tuple
+
+from syllable_validator import SyllableValidator, syllable_validator
+
+MAX_TOKEN_LENGTH = 48      # Token dài hơn không được tách (chặn thời gian mỗi token)
+MAX_WORD_SYLLABLES = 4     # Số âm tiết tối đa của một từ ghép trong từ điển
+PIECE_COST = 1.0           # Mỗi mảnh tách ra bị trừ điểm: ưu tiên cách tách ít mảnh nhất
+WORD_BONUS = 0.5           # Cộng cho mỗi âm tiết thuộc một từ có trong từ điển (nhỏ hơn PIECE_COST)
+FREQUENCY_WEIGHT = 0.1     # Trọng số log10(1 + tần suất) để phân định các cách tách còn lại
+DROP_COST = 2.0            # Bỏ một ký tự thừa ở đầu token ('lsovới' -> 'so với'), chỉ với chữ cái ASCII
+
+
+class WordSplitter:
+    """
+    Tách token dính chữ bằng quy hoạch động
+
+    best[i] là điểm tốt nhất của cách tách token[:i]. Từ mỗi vị trí, automaton
+    âm tiết cho các điểm kết thúc âm tiết hợp lệ (tối đa vài điểm, dừng khi hết
+    cạnh); các chuỗi tối đa MAX_WORD_SYLLABLES âm tiết liên tiếp được thử như
+    một từ ghép của từ điển. Mỗi vị trí chỉ tốn hằng số bước nên chi phí tuyến
+    tính theo độ dài token.
+    """
+
+    def __init__(self, dictionary, validator: SyllableValidator = syllable_validator):
+        self.dictionary = dictionary
+        self.validator = validator
+
+    def should_split(self, token: str) -> bool:
+        """
+        Token có phải ứng viên dính chữ không
+
+        Chỉ xét token chữ cái có dấu tiếng Việt (token không dấu như 'youtube' quá
+        dễ tách nhầm), không viết hoa toàn bộ, không có trong từ điển và bản thân
+        không phải một âm tiết hợp lệ.
+        """
+        return (2 < len(token) <= MAX_TOKEN_LENGTH and token.isalpha() and not token.isascii()
+                and not token.isupper() and not self.dictionary.is_correct_word(token)
+                and not self.validator.is_valid(token))
+
+    def split(self, token: str) -> Optional[List[str]]:
+        """
+        Tách token thành các từ (giữ nguyên chữ hoa/thường của token)
+
+        Returns:
+            Danh sách các từ (từ ghép nối bằng dấu cách), hoặc None nếu token không
+            cần tách hoặc không có cách tách nào thành toàn âm tiết hợp lệ
+        """
+        token = unicodedata.normalize('NFC', token)
+        if not self.should_split(token):
+            return None
+        text = token.lower()
+        if len(text) != len(token):
+            return None
+
+        n = len(text)
+        ends = [self.validator.syllable_ends(text, i) for i in range(n)]
+        # best[i] = (điểm, vị trí đầu mảnh cuối, các điểm kết thúc âm tiết của mảnh); () = ký tự bị bỏ
+        best: List[Optional[Tuple[float, int, Tuple[int, ...]]]] = [None] * (n + 1)
+        best[0] = (0.0, -1, ())
+        # Chỉ phím gõ thừa (chữ cái ASCII như 'l'/'I') mới được bỏ; chữ cái automaton không
+        # mô hình hóa ('Ðiện' với U+00D0 thay cho Đ) không được bỏ để tách thành mảnh vô nghĩa
+        if text[0].isascii():
+            best[1] = (-DROP_COST, 0, ())
+        for start in range(n):
+            if best[start] is None:
+                continue
+            for end, boundaries in self._chains(ends, start):
+                score = best[start][0] + self._unit_score(text, start, boundaries)
+                if best[end] is None or score > best[end][0]:
+                    best[end] = (score, start, boundaries)
+        if best[n] is None or best[n][0] == -math.inf:
+            return None
+
+        units = []
+        position = n
+        while position > 0:
+            _, start, boundaries = best[position]
+            if boundaries:
+                units.append(self._unit(token, start, boundaries))
+            position = start
+        units.reverse()
+        if sum(len(unit.split(' ')) for unit in units) < 2:
+            return None
+        # Mọi mảnh đều chỉ một chữ cái: không phải cách tách đáng tin
+        if all(len(unit) == 1 for unit in units):
+            return None
+        return units
+
+    @staticmethod
+    def _chains(ends: List[List[int]], start: int):
+        """Các chuỗi 1..MAX_WORD_SYLLABLES âm tiết liên tiếp bắt đầu tại start: (end, các điểm kết thúc)"""
+        stack = [(start, ())]
+        while stack:
+            position, boundaries = stack.pop()
+            if position >= len(ends) or len(boundaries) == MAX_WORD_SYLLABLES:
+                continue
+            for end in ends[position]:
+                chain = boundaries + (end,)
+                yield end, chain
+                stack.append((end, chain))
+
+    @staticmethod
+    def _unit(text: str, start: int, boundaries: Tuple[int, ...]) -> str:
+        parts = []
+        for end in boundaries:
+            parts.append(text[start:end])
+            start = end
+        return ' '.join(parts)
+
+    def _unit_score(self, text: str, start: int, boundaries: Tuple[int, ...]) -> float:
+        """Điểm một mảnh: từ nhiều âm tiết chỉ hợp lệ khi có trong từ điển"""
+        unit = self._unit(text, start, boundaries)
+        known = self.dictionary.is_correct_word(unit)
+        if len(boundaries) > 1 and not known:
+            return -math.inf
+        frequency = self.dictionary.word_frequency.get(unit, 0)
+        return (-PIECE_COST + (WORD_BONUS * len(boundaries) if known else 0.0)
+                + FREQUENCY_WEIGHT * math.log10(1 + frequency))